@@ -0,0 +1,178 @@
+"""
+Authentification JWT avec résolution des utilisateurs en cache.
+
+JWTAuthentication relit la ligne accounts.User à chaque requête. Ici,
+l'utilisateur est conservé dans un cache borné, local au processus et de
+courte durée de vie (USER_CACHE_TTL), indexé par son id.
+
+Chaque entrée porte la version de l'utilisateur dans le cache partagé
+(espace user:<id> de core.caching.tiered_cache) : les signaux de User
+(accounts/signals.py) l'incrémentent dès qu'un utilisateur est modifié
+(UserViewSet, désactivation, promotion admin dans login_view) ou supprimé.
+Le worker qui traite l'écriture ignore l'entrée aussitôt ; les autres relisent
+la version au plus toutes les TIERED_CACHE_LOCAL_TTL secondes. Entre deux
+relectures, une requête authentifiée ne fait aucune requête SQL.
+"""
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+from core.caching import tiered_cache
+
+
+def user_namespace(user_id):
+    """Espace de version partagé d'un utilisateur (tiered_cache.bump l'invalide partout)."""
+    return f'user:{user_id}'
+
+
+class UserCache:
+    """
+    Cache LRU borné d'utilisateurs, avec durée de vie.
+    
+    Chaque lecture retourne une copie : une vue qui modifie request.user ne
+    modifie pas l'instance partagée entre les threads du worker.
+    
+    Les clés sont des chaînes : la revendication user_id du JWT en est une,
+    la clé primaire passée par les signaux est un entier.
+    
+    Une entrée n'est retournée que si sa version est la version partagée
+    courante de l'utilisateur (voir user_namespace).
+    """
+    
+    def __init__(self, maxsize, ttl):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        # Incrémenté à chaque invalidation : un chargement commencé avant
+        # n'est pas mis en cache (il pourrait être périmé)
+        self.generation = 0
+    
+    def get(self, user_id, version):
+        user_id = str(user_id)
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            expires_at, entry_version, user = entry
+            if time.monotonic() > expires_at or entry_version != version:
+                del self._entries[user_id]
+                return None
+            self._entries.move_to_end(user_id)
+        return copy.copy(user)
+    
+    def set(self, user_id, user, generation, version):
+        """
+        Met l'utilisateur en cache avec sa version partagée (lue avant le
+        chargement), sauf si une invalidation locale a eu lieu depuis `generation`.
+        """
+        if self.maxsize <= 0:
+            return
+        user_id = str(user_id)
+        with self._lock:
+            if generation != self.generation:
+                return
+            self._entries[user_id] = (time.monotonic() + self.ttl, version, copy.copy(user))
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+    
+    def invalidate(self, user_id):
+        with self._lock:
+            self.generation += 1
+            self._entries.pop(str(user_id), None)
+    
+    def clear(self):
+        with self._lock:
+            self.generation += 1
+            self._entries.clear()
+
+
+user_cache = UserCache(
+    getattr(settings, 'USER_CACHE_SIZE', 1024),
+    getattr(settings, 'USER_CACHE_TTL', 30),
+)
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication dont get_user() lit d'abord le cache d'utilisateurs.
+    
+    aauthenticate() / aget_user() en sont les variantes asynchrones, pour les
+    vues ASGI qui ne passent pas par DRF (bookings/async_views.py, bookings/events.py).
+    """
+    
+    def _user_id(self, validated_token):
+        try:
+            return validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError as e:
+            raise InvalidToken(_("Token contained no recognizable user identification")) from e
+    
+    def _check_user(self, user, validated_token):
+        """Mêmes contrôles que JWTAuthentication.get_user sur une instance déjà chargée."""
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        
+        if api_settings.CHECK_REVOKE_TOKEN:
+            if validated_token.get(api_settings.REVOKE_TOKEN_CLAIM) != get_md5_hash_password(user.password):
+                raise AuthenticationFailed(_("The user's password has been changed."), code="password_changed")
+    
+    def get_user(self, validated_token):
+        user_id = self._user_id(validated_token)
+        
+        version = tiered_cache.version(user_namespace(user_id))
+        user = user_cache.get(user_id, version)
+        if user is None:
+            generation = user_cache.generation
+            # Lecture en base et contrôles de JWTAuthentication
+            user = super().get_user(validated_token)
+            user_cache.set(user_id, user, generation, version)
+            return user
+        
+        self._check_user(user, validated_token)
+        return user
+    
+    async def aget_user(self, validated_token):
+        user_id = self._user_id(validated_token)
+        
+        version = await sync_to_async(tiered_cache.version)(user_namespace(user_id))
+        user = user_cache.get(user_id, version)
+        if user is None:
+            generation = user_cache.generation
+            try:
+                user = await self.user_model.objects.aget(**{api_settings.USER_ID_FIELD: user_id})
+            except self.user_model.DoesNotExist as e:
+                raise AuthenticationFailed(_("User not found"), code="user_not_found") from e
+            self._check_user(user, validated_token)
+            user_cache.set(user_id, user, generation, version)
+            return user
+        
+        self._check_user(user, validated_token)
+        return user
+    
+    async def aauthenticate(self, request):
+        """
+        Variante asynchrone d'authenticate().
+        
+        Returns:
+            tuple (user, token) ou None si la requête ne porte pas de JWT
+        """
+        header = self.get_header(request)
+        if header is None:
+            return None
+        
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+        
+        validated_token = self.get_validated_token(raw_token)
+        return await self.aget_user(validated_token), validated_token
@@ -0,0 +1,31 @@
+"""
+Hachage des mots de passe à coût réglable par les settings.
+
+Mêmes algorithmes (et mêmes préfixes en base) que les hashers de Django :
+seul le coût change. Lorsqu'un mot de passe stocké n'utilise pas le hasher
+ou le coût courant, Django le re-hache à la connexion réussie suivante
+(User.check_password, appelé par EmailBackend) ; changer la politique ne
+demande donc aucune migration.
+
+Choix et calibrage : PASSWORD_HASHER, PASSWORD_PBKDF2_ITERATIONS,
+PASSWORD_SCRYPT_WORK_FACTOR (voir config/settings.py) et
+manage.py bench_logins.
+"""
+from django.conf import settings
+from django.contrib.auth import hashers
+
+
+class PBKDF2PasswordHasher(hashers.PBKDF2PasswordHasher):
+    """PBKDF2-SHA256 avec PASSWORD_PBKDF2_ITERATIONS itérations (défaut Django sinon)."""
+
+    @property
+    def iterations(self):
+        return getattr(settings, 'PASSWORD_PBKDF2_ITERATIONS', None) or hashers.PBKDF2PasswordHasher.iterations
+
+
+class ScryptPasswordHasher(hashers.ScryptPasswordHasher):
+    """scrypt avec un facteur de coût PASSWORD_SCRYPT_WORK_FACTOR (défaut Django sinon)."""
+
+    @property
+    def work_factor(self):
+        return getattr(settings, 'PASSWORD_SCRYPT_WORK_FACTOR', None) or hashers.ScryptPasswordHasher.work_factor
@@ -0,0 +1,82 @@
+import time
+
+from django.conf import settings
+from django.contrib.auth.hashers import get_hasher, make_password
+from django.core.management.base import BaseCommand
+from django.test.utils import override_settings
+
+from accounts.models import User
+from accounts.serializers import LoginSerializer
+
+
+class Command(BaseCommand):
+    help = (
+        "Mesure le débit de connexions (LoginSerializer -> EmailBackend) par worker "
+        "pour chaque hasher configuré, puis vérifie le re-hachage à la connexion."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--logins', type=int, default=20, help="Connexions mesurées par hasher")
+        parser.add_argument('--workers', type=int, default=3, help="Workers gunicorn pour l'estimation globale")
+        parser.add_argument(
+            '--hashers', nargs='*', choices=list(settings.PASSWORD_HASHER_CHOICES),
+            help="Hashers à mesurer (défaut : tous ceux de PASSWORD_HASHER_CHOICES)",
+        )
+
+    def handle(self, *args, **options):
+        names = options['hashers'] or list(settings.PASSWORD_HASHER_CHOICES)
+        password = 'bench-password-2026'
+        user, _ = User.objects.get_or_create(email='bench-logins@booking.local')
+
+        self.stdout.write(
+            f"Politique actuelle : {settings.PASSWORD_HASHER} "
+            f"({settings.PASSWORD_HASHERS[0]}), {options['workers']} workers"
+        )
+        try:
+            for name in names:
+                path = settings.PASSWORD_HASHER_CHOICES[name]
+                # Le hasher mesuré devient le préféré : pas de re-hachage pendant la mesure
+                hashers = [path] + [other for other in settings.PASSWORD_HASHERS if other != path]
+                with override_settings(PASSWORD_HASHERS=hashers):
+                    try:
+                        algorithm = get_hasher('default').algorithm
+                        User.objects.filter(pk=user.pk).update(password=make_password(password))
+                    except ValueError as e:
+                        # Bibliothèque optionnelle absente (argon2-cffi, bcrypt)
+                        self.stdout.write(f"{name:7} : ignoré ({e})")
+                        continue
+                    elapsed = self._measure(user.email, password, options['logins'])
+
+                per_worker = options['logins'] / elapsed
+                self.stdout.write(
+                    f"{name:7} ({algorithm}) : {elapsed / options['logins'] * 1000:8.1f} ms/connexion, "
+                    f"{per_worker:7.1f} connexions/s/worker, "
+                    f"~{per_worker * options['workers']:7.1f} connexions/s pour {options['workers']} workers"
+                )
+
+            self._check_rehash(user, password)
+        finally:
+            user.delete()
+
+    def _measure(self, email, password, count):
+        start = time.perf_counter()
+        for _ in range(count):
+            serializer = LoginSerializer(data={'email': email, 'password': password})
+            if not serializer.is_valid():
+                raise RuntimeError(f"Connexion refusée : {serializer.errors}")
+        return time.perf_counter() - start
+
+    def _check_rehash(self, user, password):
+        """Un hash d'un autre hasher est remplacé par celui de la politique à la connexion."""
+        legacy = settings.PASSWORD_HASHERS[-1]
+        with override_settings(PASSWORD_HASHERS=[legacy]):
+            User.objects.filter(pk=user.pk).update(password=make_password(password))
+        before = User.objects.get(pk=user.pk).password.split('$', 1)[0]
+
+        self._measure(user.email, password, 1)
+        after = User.objects.get(pk=user.pk).password.split('$', 1)[0]
+
+        if after == get_hasher('default').algorithm:
+            self.stdout.write(self.style.SUCCESS(f"Re-hachage à la connexion : {before} -> {after}"))
+        else:
+            self.stdout.write(self.style.ERROR(f"Pas de re-hachage : {before} -> {after}"))
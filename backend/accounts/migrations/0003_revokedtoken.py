@@ -0,0 +1,27 @@
+# Generated by Django 6.0 on 2026-02-09 10:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0002_allowedemail_allowed_email_lookup_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RevokedToken',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('jti', models.CharField(max_length=255, unique=True, verbose_name='Identifiant du jeton')),
+                ('expires_at', models.DateTimeField(verbose_name="Date d'expiration")),
+                ('revoked_at', models.DateTimeField(auto_now_add=True, verbose_name='Date de révocation')),
+            ],
+            options={
+                'verbose_name': 'Jeton révoqué',
+                'verbose_name_plural': 'Jetons révoqués',
+                'indexes': [models.Index(fields=['expires_at'], name='revoked_token_expiry_idx')],
+            },
+        ),
+    ]
@@ -111,3 +111,25 @@ class LoginToken(models.Model):
     def is_valid(self):
         """Vérifie si le token est valide (non utilisé et non expiré)."""
         return not self.used and timezone.now() < self.expires_at
+
+
+class RevokedToken(models.Model):
+    """
+    Jeton de rafraîchissement révoqué (déconnexion ou rotation).
+    
+    Table durable derrière le filtre de Bloom de accounts/revocation.py ;
+    les lignes sont supprimées une fois le jeton expiré.
+    """
+    jti = models.CharField(max_length=255, unique=True, verbose_name="Identifiant du jeton")
+    expires_at = models.DateTimeField(verbose_name="Date d'expiration")
+    revoked_at = models.DateTimeField(auto_now_add=True, verbose_name="Date de révocation")
+    
+    class Meta:
+        verbose_name = "Jeton révoqué"
+        verbose_name_plural = "Jetons révoqués"
+        indexes = [
+            models.Index(fields=['expires_at'], name='revoked_token_expiry_idx'),
+        ]
+    
+    def __str__(self):
+        return self.jti
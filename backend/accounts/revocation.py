@@ -0,0 +1,201 @@
+"""
+Révocation des jetons de rafraîchissement (déconnexion et rotation).
+
+Les JTI révoqués sont conservés dans la table RevokedToken et, dans chaque
+worker, dans un filtre de Bloom en mémoire :
+- un JTI absent du filtre n'est pas révoqué (cas de tous les jetons valides),
+  réponse sans requête ni E/S ;
+- un JTI présent est confirmé (faux positifs ~ REVOCATION_BLOOM_ERROR_RATE).
+
+Les révocations dues à la rotation sont écrites par lots : dès REVOCATION_BATCH_SIZE
+jetons, sinon par un minuteur d'arrière-plan au plus REVOCATION_FLUSH_INTERVAL
+secondes après la première révocation du lot, même si le worker ne reçoit plus
+de requête ; celles de la déconnexion sont écrites immédiatement. Les
+révocations des autres workers sont relues toutes les REVOCATION_SYNC_INTERVAL
+secondes ; les lignes expirées sont supprimées et le filtre reconstruit toutes
+les REVOCATION_PRUNE_INTERVAL secondes.
+"""
+import atexit
+import math
+import threading
+import time
+from datetime import datetime, timezone as dt_timezone
+
+from django.conf import settings
+from django.db import DatabaseError, connection
+from django.utils import timezone
+
+from .models import RevokedToken
+
+
+class BloomFilter:
+    """
+    Filtre de Bloom sur des chaînes, local au processus.
+
+    Les positions sont dérivées de hash() (double hachage) : la valeur est
+    mise en cache par la chaîne et n'a pas à être stable d'un processus à
+    l'autre, le filtre n'étant jamais partagé.
+    """
+    __slots__ = ('size', 'hashes', 'bits')
+
+    def __init__(self, capacity, error_rate):
+        capacity = max(capacity, 1)
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, key):
+        value = hash(key) & 0xFFFFFFFFFFFFFFFF
+        first, second = value & 0xFFFFFFFF, (value >> 32) | 1
+        size = self.size
+        for i in range(self.hashes):
+            yield (first + i * second) % size
+
+    def add(self, key):
+        bits = self.bits
+        for position in self._positions(key):
+            bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, key):
+        # Positions calculées à la volée : un JTI absent sort dès le premier bit nul
+        value = hash(key) & 0xFFFFFFFFFFFFFFFF
+        first, second = value & 0xFFFFFFFF, (value >> 32) | 1
+        bits, size = self.bits, self.size
+        for i in range(self.hashes):
+            position = (first + i * second) % size
+            if not bits[position >> 3] & (1 << (position & 7)):
+                return False
+        return True
+
+
+def _expiry(exp):
+    """Horodatage exp du JWT -> datetime aware."""
+    return datetime.fromtimestamp(exp, tz=dt_timezone.utc)
+
+
+class RevocationRegistry:
+    """Registre des révocations du processus (filtre de Bloom + table durable)."""
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._filter = None
+        self._last_id = 0
+        self._sync_deadline = 0.0
+        self._pruned_at = 0.0
+        # JTI révoqués par rotation, pas encore écrits : {jti: expiration}
+        self._pending = {}
+        self._pending_since = None
+        self._timer = None
+
+    @staticmethod
+    def _setting(name, default):
+        return getattr(settings, name, default)
+
+    def _new_filter(self):
+        return BloomFilter(
+            self._setting('REVOCATION_BLOOM_CAPACITY', 100_000),
+            self._setting('REVOCATION_BLOOM_ERROR_RATE', 0.01),
+        )
+
+    def is_revoked(self, jti):
+        """Retourne True si le jeton a été révoqué."""
+        if time.monotonic() >= self._sync_deadline:
+            self._sync()
+        if jti not in self._filter:
+            return False
+        # Présent dans le filtre : révocation réelle ou faux positif
+        with self._lock:
+            if jti in self._pending:
+                return True
+        return RevokedToken.objects.filter(jti=jti).exists()
+
+    def revoke(self, jti, exp, batch=False):
+        """
+        Révoque un jeton jusqu'à son expiration.
+
+        Args:
+            jti: Identifiant du jeton
+            exp: Expiration du jeton (horodatage Unix)
+            batch: True pour une écriture différée par lot (rotation)
+        """
+        if self._filter is None:
+            self._sync()
+        with self._lock:
+            self._filter.add(jti)
+            if not batch:
+                RevokedToken.objects.bulk_create(
+                    [RevokedToken(jti=jti, expires_at=_expiry(exp))], ignore_conflicts=True
+                )
+                return
+            self._pending[jti] = exp
+            if self._pending_since is None:
+                self._pending_since = time.monotonic()
+                self._schedule_flush()
+            due = len(self._pending) >= self._setting('REVOCATION_BATCH_SIZE', 100)
+        if due:
+            self.flush()
+
+    def _schedule_flush(self):
+        """Programme l'écriture du lot en attente (appelée sous le verrou)."""
+        if self._timer is not None:
+            return
+        self._timer = threading.Timer(self._setting('REVOCATION_FLUSH_INTERVAL', 1), self._timed_flush)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _timed_flush(self):
+        """Écriture du lot depuis le minuteur, sur la connexion propre à son thread."""
+        with self._lock:
+            self._timer = None
+        try:
+            self.flush()
+        finally:
+            connection.close()
+
+    def flush(self):
+        """
+        Écrit les révocations en attente en une seule requête.
+
+        En cas d'erreur de base, le lot est conservé pour la tentative suivante
+        (le filtre local reste à jour entre-temps).
+        """
+        with self._lock:
+            pending, self._pending, self._pending_since = self._pending, {}, None
+            if not pending:
+                return
+            try:
+                RevokedToken.objects.bulk_create(
+                    [RevokedToken(jti=jti, expires_at=_expiry(exp)) for jti, exp in pending.items()],
+                    ignore_conflicts=True,
+                )
+            except DatabaseError:
+                pending.update(self._pending)
+                self._pending = pending
+                self._pending_since = time.monotonic()
+                self._schedule_flush()
+
+    def _sync(self):
+        """Relit les révocations des autres workers ; purge périodique."""
+        with self._lock:
+            now = time.monotonic()
+            if self._pending and now - self._pending_since >= self._setting('REVOCATION_FLUSH_INTERVAL', 1):
+                self.flush()
+
+            if self._filter is None or now - self._pruned_at > self._setting('REVOCATION_PRUNE_INTERVAL', 3600):
+                RevokedToken.objects.filter(expires_at__lte=timezone.now()).delete()
+                # Un filtre de Bloom ne supprime pas : reconstruction sur les lignes restantes
+                self._filter = self._new_filter()
+                self._last_id = 0
+                self._pruned_at = now
+                for jti in self._pending:
+                    self._filter.add(jti)
+
+            rows = RevokedToken.objects.filter(id__gt=self._last_id).values_list('id', 'jti').order_by('id')
+            for row_id, jti in rows.iterator():
+                self._filter.add(jti)
+                self._last_id = row_id
+            self._sync_deadline = now + self._setting('REVOCATION_SYNC_INTERVAL', 2)
+
+
+revocations = RevocationRegistry()
+atexit.register(revocations.flush)
@@ -1,6 +1,8 @@
 from rest_framework import serializers
+from rest_framework_simplejwt.serializers import TokenRefreshSerializer
 from django.contrib.auth import authenticate, get_user_model
 from .models import User
+from .tokens import RevocableRefreshToken
 
 User = get_user_model()
 
@@ -77,3 +79,8 @@ class UserCreateSerializer(serializers.ModelSerializer):
             
         return user
 
+
+
+class RevocableTokenRefreshSerializer(TokenRefreshSerializer):
+    """Rafraîchissement refusé pour un jeton révoqué ; l'ancien jeton est révoqué après rotation."""
+    token_class = RevocableRefreshToken
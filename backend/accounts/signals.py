@@ -0,0 +1,27 @@
+"""
+Signaux de User : invalident le cache d'utilisateurs de l'authentification JWT
+et la liste des utilisateurs en cache.
+"""
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from bookings.models import UserRegionCount
+from core.caching import tiered_cache
+from .authentication import user_cache, user_namespace
+from .models import User
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def user_changed(sender, instance, **kwargs):
+    """Modification, désactivation, promotion admin ou suppression d'un utilisateur."""
+    user_cache.invalidate(instance.pk)
+    
+    def apply():
+        # Après le commit : un autre worker ne peut plus recharger l'ancienne ligne
+        # sous la nouvelle version
+        tiered_cache.bump(user_namespace(instance.pk))
+        tiered_cache.bump('users')
+        UserRegionCount.forget_coverage(instance.pk)
+    transaction.on_commit(apply)
@@ -1,3 +1,118 @@
-from django.test import TestCase
+import time
 
-# Create your tests here.
+from django.test import RequestFactory, TestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
+
+from core.caching import tiered_cache
+from .authentication import CachedJWTAuthentication, user_cache, user_namespace
+from .models import RevokedToken, User
+from .revocation import RevocationRegistry
+
+
+class CachedJWTAuthenticationTests(TestCase):
+    def setUp(self):
+        tiered_cache.clear_local()
+        user_cache.clear()
+        self.user = User.objects.create_user('dg@example.com', 'password123')
+        self.request = RequestFactory().get(
+            '/api/regions/', HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(self.user)}'
+        )
+
+    def authenticate(self):
+        return CachedJWTAuthentication().authenticate(self.request)
+
+    def test_cached_user_needs_no_query(self):
+        self.authenticate()
+        with self.assertNumQueries(0):
+            user, _ = self.authenticate()
+        self.assertEqual(user.pk, self.user.pk)
+
+    def test_cached_user_is_a_copy(self):
+        first, _ = self.authenticate()
+        first.email = 'changed@example.com'
+        second, _ = self.authenticate()
+        self.assertEqual(second.email, 'dg@example.com')
+
+    def test_user_change_invalidates_entry(self):
+        self.authenticate()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.is_active = False
+            self.user.save()
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate()
+
+    def test_version_bump_from_another_worker_invalidates_entry(self):
+        self.authenticate()
+        # Écriture sans signal local, puis incrément de version (fait par l'autre worker)
+        User.objects.filter(pk=self.user.pk).update(is_active=False)
+        tiered_cache.bump(user_namespace(self.user.pk))
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate()
+
+
+class RevocationRegistryTests(TransactionTestCase):
+    def setUp(self):
+        self.registry = RevocationRegistry()
+
+    def tearDown(self):
+        if self.registry._timer is not None:
+            self.registry._timer.cancel()
+
+    def test_immediate_revocation_is_written(self):
+        self.registry.revoke('logout-jti', time.time() + 3600)
+        self.assertTrue(RevokedToken.objects.filter(jti='logout-jti').exists())
+        self.assertTrue(self.registry.is_revoked('logout-jti'))
+        self.assertFalse(self.registry.is_revoked('other-jti'))
+
+    @override_settings(REVOCATION_FLUSH_INTERVAL=0.05, REVOCATION_BATCH_SIZE=100)
+    def test_batch_is_flushed_by_timer_without_further_calls(self):
+        self.registry.revoke('rotated-jti', time.time() + 3600, batch=True)
+        # Rejeté aussitôt par ce worker, avant l'écriture du lot
+        self.assertTrue(self.registry.is_revoked('rotated-jti'))
+        deadline = time.monotonic() + 5
+        while not RevokedToken.objects.filter(jti='rotated-jti').exists():
+            self.assertLess(time.monotonic(), deadline, "le lot n'a pas été écrit")
+            time.sleep(0.02)
+        self.assertEqual(self.registry._pending, {})
+
+    @override_settings(REVOCATION_BATCH_SIZE=2, REVOCATION_FLUSH_INTERVAL=60)
+    def test_full_batch_is_flushed_at_once(self):
+        self.registry.revoke('a', time.time() + 3600, batch=True)
+        self.assertFalse(RevokedToken.objects.exists())
+        self.registry.revoke('b', time.time() + 3600, batch=True)
+        self.assertEqual(set(RevokedToken.objects.values_list('jti', flat=True)), {'a', 'b'})
+
+    def test_other_worker_revocations_are_synced(self):
+        other = RevocationRegistry()
+        self.registry.is_revoked('warm-up')
+        other.revoke('elsewhere', time.time() + 3600)
+        self.registry._sync_deadline = 0
+        self.assertTrue(self.registry.is_revoked('elsewhere'))
+
+
+class RefreshRotationTests(TestCase):
+    def setUp(self):
+        tiered_cache.clear_local()
+        self.user = User.objects.create_user('dg@example.com', 'password123')
+
+    def test_rotated_refresh_token_cannot_be_reused(self):
+        refresh = str(RefreshToken.for_user(self.user))
+        url = reverse('token_refresh')
+        response = self.client.post(url, {'refresh': refresh}, content_type='application/json', secure=True)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response.json()['refresh'], refresh)
+        response = self.client.post(url, {'refresh': refresh}, content_type='application/json', secure=True)
+        self.assertEqual(response.status_code, 401)
+
+    def test_logout_revokes_refresh_token(self):
+        refresh = RefreshToken.for_user(self.user)
+        response = self.client.post(
+            reverse('accounts:logout'), {'refresh': str(refresh)}, content_type='application/json', secure=True,
+            HTTP_AUTHORIZATION=f'Bearer {refresh.access_token}',
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(RevokedToken.objects.filter(jti=refresh['jti']).exists())
+        response = self.client.post(reverse('token_refresh'), {'refresh': str(refresh)}, content_type='application/json', secure=True)
+        self.assertEqual(response.status_code, 401)
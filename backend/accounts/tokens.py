@@ -0,0 +1,30 @@
+"""
+Jeton de rafraîchissement révocable sans l'application token_blacklist.
+"""
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from .revocation import revocations
+
+
+class RevocableRefreshToken(RefreshToken):
+    """
+    RefreshToken vérifié contre le registre des révocations (accounts/revocation.py).
+    """
+
+    def verify(self):
+        super().verify()
+        if revocations.is_revoked(self.payload[api_settings.JTI_CLAIM]):
+            raise TokenError("Le jeton a été révoqué.")
+
+    def revoke(self, batch=False):
+        """Révoque ce jeton jusqu'à son expiration (immédiatement, ou par lot si batch)."""
+        revocations.revoke(self.payload[api_settings.JTI_CLAIM], self.payload['exp'], batch=batch)
+
+    def blacklist(self):
+        """
+        Appelée par TokenRefreshSerializer après rotation (BLACKLIST_AFTER_ROTATION) :
+        l'ancien jeton est révoqué par lot.
+        """
+        self.revoke(batch=True)
@@ -1,14 +1,18 @@
 from rest_framework import status, viewsets
-from rest_framework.decorators import api_view, permission_classes, action
+from rest_framework.decorators import api_view, permission_classes, throttle_classes, action
 from rest_framework.response import Response
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from .serializers import LoginSerializer, UserSerializer, UserCreateSerializer
 from rest_framework_simplejwt.tokens import RefreshToken
+from .tokens import RevocableRefreshToken
 from .models import User
+from core.caching import tiered_cache
 from core.permissions import IsAdmin
+from core.throttles import BurstRateThrottle, LoginRateThrottle
 
 @api_view(['POST'])
 @permission_classes([AllowAny])
+@throttle_classes([LoginRateThrottle, BurstRateThrottle])
 def login_view(request):
     """
     Endpoint de connexion standard (Email + Mot de passe).
@@ -64,15 +68,15 @@ def login_view(request):
 @api_view(['POST'])
 def logout(request):
     """
-    Endpoint pour se déconnecter (blacklist du refresh token).
+    Endpoint pour se déconnecter (révocation du refresh token).
     POST /api/auth/logout/
     Body: {"refresh": "refresh-token"}
     """
     try:
         refresh_token = request.data.get('refresh')
         if refresh_token:
-            token = RefreshToken(refresh_token)
-            token.blacklist()
+            token = RevocableRefreshToken(refresh_token)
+            token.revoke()
         
         return Response({
             'message': 'Déconnexion réussie.'
@@ -91,6 +95,14 @@ class UserViewSet(viewsets.ModelViewSet):
     queryset = User.objects.all().order_by('-date_joined')
     permission_classes = [IsAdmin]  # Seul l'admin peut gérer les users
     
+    def list(self, request, *args, **kwargs):
+        """Liste en cache (espace 'users', invalidé par les signaux de User)."""
+        data = tiered_cache.get_or_set(
+            'users', request.get_full_path(),
+            lambda: super(UserViewSet, self).list(request, *args, **kwargs).data,
+        )
+        return Response(data)
+    
     def get_serializer_class(self):
         if self.action in ['create', 'update', 'partial_update']:
             return UserCreateSerializer
@@ -57,7 +57,7 @@ class BookingAdmin(admin.ModelAdmin):
         qs = super().get_queryset(request)
         return qs.select_related('user', 'region')
     
-    actions = ['export_to_csv']
+    actions = ['export_to_csv', 'export_to_ics']
     
     def export_to_csv(self, request, queryset):
         """Action pour exporter les réservations en CSV."""
@@ -81,3 +81,14 @@ class BookingAdmin(admin.ModelAdmin):
         
         return response
     export_to_csv.short_description = "Exporter les réservations sélectionnées en CSV"
+    
+    def export_to_ics(self, request, queryset):
+        """Action pour exporter les réservations sélectionnées dans un seul calendrier."""
+        from django.http import HttpResponse
+        from core.utils import generate_ics_calendar
+        
+        content = generate_ics_calendar(queryset.order_by('year', 'week'), name='Réservations')
+        response = HttpResponse(content, content_type='text/calendar')
+        response['Content-Disposition'] = 'attachment; filename="reservations.ics"'
+        return response
+    export_to_ics.short_description = "Exporter les réservations sélectionnées en calendrier (.ics)"
@@ -0,0 +1,148 @@
+"""
+Agrégats d'occupation des créneaux (axe × semaine) pour les tableaux de bord.
+
+Un créneau d'une année ne peut être réservé qu'une fois (contrainte
+unique_region_year_week) : l'occupation d'une année est un bitmap de 53 bits
+par région, lu en une seule requête sur l'index (year, week), et les
+réservations par DG viennent des compteurs de couverture. Chaque année est
+mise en cache (core.caching.tiered_cache, espace 'occupancy') sous une clé
+portant sa version (core.versioning) : toute écriture de réservation change
+la clé, sans invalidation explicite.
+
+Le cumul de plusieurs années se fait colonne par colonne sur des array.array
+(numpy n'est pas une dépendance du projet).
+"""
+from array import array
+
+from django.conf import settings
+
+from core.availability import WEEK_BITS
+from core.caching import tiered_cache
+from core.iso_calendar import weeks_in_year
+from core.versioning import bookings_year_scope, get_versions
+from .models import Booking, UserRegionCount
+
+
+CACHE_NAMESPACE = 'occupancy'
+
+
+def _empty_row():
+    return array('I', bytes(4 * WEEK_BITS))
+
+
+def _aggregate_years(years):
+    """
+    Agrège les années demandées en deux requêtes.
+
+    Returns:
+        dict: {année: {'booked', 'cells', 'dg_counts'}} où cells associe à
+        chaque region_id le bitmap de ses semaines réservées (bit n-1 =
+        semaine n) et dg_counts associe à chaque region_id {email: réservations}.
+    """
+    stats = {year: {'booked': 0, 'cells': {}, 'dg_counts': {}} for year in years}
+
+    slots = Booking.objects.filter(year__in=years).values_list('year', 'region_id', 'week').order_by()
+    for year, region_id, week in slots.iterator():
+        entry = stats[year]
+        entry['booked'] += 1
+        entry['cells'][region_id] = entry['cells'].get(region_id, 0) | (1 << (week - 1))
+
+    per_dg = (
+        UserRegionCount.objects.filter(year__in=years)
+        .values_list('year', 'region_id', 'user__email', 'count')
+    )
+    for year, region_id, email, count in per_dg:
+        stats[year]['dg_counts'].setdefault(region_id, {})[email] = count
+
+    return stats
+
+
+def year_stats(years):
+    """
+    Retourne les agrégats de chaque année, depuis le cache si possible.
+
+    Les années absentes du cache sont agrégées ensemble puis mises en cache
+    (OCCUPANCY_CACHE_TTL).
+    """
+    versions = get_versions(*(bookings_year_scope(year) for year in years))
+    keys = {year: f'{year}:v{versions[bookings_year_scope(year)]}' for year in years}
+    stats = {}
+    for year, key in keys.items():
+        entry = tiered_cache.get(CACHE_NAMESPACE, key)
+        if entry is not None:
+            stats[year] = entry
+
+    missing = [year for year in years if year not in stats]
+    if missing:
+        fresh = _aggregate_years(missing)
+        ttl = getattr(settings, 'OCCUPANCY_CACHE_TTL', 3600)
+        for year in missing:
+            tiered_cache.set(CACHE_NAMESPACE, keys[year], fresh[year], ttl)
+        stats.update(fresh)
+    return stats
+
+
+def occupancy_report(regions, years, top=3):
+    """
+    Construit le rapport d'occupation sur une période.
+
+    Args:
+        regions: Liste de Region (ordre des lignes de la matrice)
+        years: Années de la période
+        top: Nombre de DG retenus par région
+
+    Returns:
+        dict: matrice région × semaine (nombre d'années où le créneau est
+        réservé), totaux par région et par semaine, occupation par année et
+        meilleurs DG par région.
+    """
+    stats = year_stats(years)
+    region_ids = [region.id for region in regions]
+
+    matrix = {region_id: _empty_row() for region_id in region_ids}
+    dg_counts = {region_id: {} for region_id in region_ids}
+    occupancy = []
+    for year in years:
+        entry = stats[year]
+        for region_id, bitmap in entry['cells'].items():
+            row = matrix.get(region_id)
+            if row is None:
+                continue
+            while bitmap:
+                low_bit = bitmap & -bitmap
+                row[low_bit.bit_length() - 1] += 1
+                bitmap ^= low_bit
+        for region_id, counts in entry['dg_counts'].items():
+            if region_id in dg_counts:
+                totals = dg_counts[region_id]
+                for email, count in counts.items():
+                    totals[email] = totals.get(email, 0) + count
+
+        capacity = len(region_ids) * weeks_in_year(year)
+        occupancy.append({
+            'year': year,
+            'booked': entry['booked'],
+            'capacity': capacity,
+            'occupancy_rate': round(entry['booked'] / capacity * 100, 2) if capacity else 0.0,
+        })
+
+    rows = [matrix[region_id] for region_id in region_ids]
+    week_totals = list(map(sum, zip(*rows))) if rows else [0] * WEEK_BITS
+
+    return {
+        'year_from': years[0],
+        'year_to': years[-1],
+        'weeks': list(range(1, WEEK_BITS + 1)),
+        'regions': [{'id': region.id, 'name': region.name} for region in regions],
+        'matrix': [row.tolist() for row in rows],
+        'region_totals': [sum(row) for row in rows],
+        'week_totals': week_totals,
+        'occupancy': occupancy,
+        'top_dgs': {
+            str(region_id): [
+                {'user_email': email, 'bookings': count}
+                for email, count in sorted(counts.items(), key=lambda item: (-item[1], item[0]))[:top]
+            ]
+            for region_id, counts in dg_counts.items()
+        },
+    }
@@ -0,0 +1,175 @@
+"""
+Vues de lecture asynchrones (disponibilité, couverture) servies sous ASGI.
+
+Mêmes réponses que les vues DRF de bookings/views.py (corps JSON, ETag,
+erreurs, authentification JWT, throttling par défaut), sans occuper un
+worker par requête : versions des données, catalogue des axes, index de
+disponibilité et compteurs de couverture sont lus par l'ORM asynchrone,
+et le plus souvent depuis la mémoire du processus.
+
+Routées à la place des vues synchrones quand ASYNC_READ_VIEWS est actif
+(profil ASGI, voir config/asgi.py et gunicorn.conf.py).
+"""
+import functools
+
+from asgiref.sync import sync_to_async
+from django.http import HttpResponse
+from rest_framework import exceptions, status
+from rest_framework.renderers import JSONRenderer
+from rest_framework.settings import api_settings
+
+from accounts.authentication import CachedJWTAuthentication
+from core import ratelimit
+from core.availability import availability_index
+from core.caching import tiered_cache
+from core.etag import compute_etag, etag_matches, with_etag
+from core.regions import region_catalog
+from core.versioning import REGIONS_SCOPE, aget_versions, bookings_year_scope
+from .models import UserRegionCount
+from .views import _coverage_payload, _slots_payload, _slots_year, _weeks_params, _weeks_payload
+
+
+ALLOWED_METHODS = ('GET', 'HEAD')
+
+
+def _json_response(data, status_code=status.HTTP_200_OK):
+    """Réponse JSON rendue comme par DRF (JSONRenderer)."""
+    return HttpResponse(JSONRenderer().render(data), content_type='application/json', status=status_code)
+
+
+def _exception_response(exc, authentication):
+    """Réponse d'erreur identique à celle du gestionnaire d'exceptions de DRF."""
+    data = exc.detail if isinstance(exc.detail, (list, dict)) else {'detail': exc.detail}
+    response = _json_response(data, exc.status_code)
+    if isinstance(exc, (exceptions.NotAuthenticated, exceptions.AuthenticationFailed)):
+        response['WWW-Authenticate'] = authentication.authenticate_header(None)
+    if isinstance(exc, exceptions.Throttled) and exc.wait is not None:
+        response['Retry-After'] = '%d' % exc.wait
+    return response
+
+
+async def _check_throttles(request):
+    """Applique DEFAULT_THROTTLE_CLASSES comme APIView.check_throttles."""
+    durations = []
+    for throttle_class in api_settings.DEFAULT_THROTTLE_CLASSES:
+        throttle = throttle_class()
+        if ratelimit.available():
+            # Seaux partagés en mémoire : pas d'entrée/sortie bloquante
+            allowed = throttle.allow_request(request, None)
+        else:
+            allowed = await sync_to_async(throttle.allow_request)(request, None)
+        if not allowed:
+            durations.append(throttle.wait())
+
+    if durations:
+        raise exceptions.Throttled(max((d for d in durations if d is not None), default=None))
+
+
+def async_api_view(view):
+    """
+    Équivalent asynchrone de @api_view(['GET']) + IsAuthenticated : contrôle
+    de la méthode, authentification JWT (request.user, request.auth) et
+    throttling, avant d'appeler la vue.
+    """
+    @functools.wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        authentication = CachedJWTAuthentication()
+        try:
+            if request.method not in ALLOWED_METHODS:
+                raise exceptions.MethodNotAllowed(request.method)
+            result = await authentication.aauthenticate(request)
+            if result is None:
+                raise exceptions.NotAuthenticated()
+            request.user, request.auth = result
+            await _check_throttles(request)
+        except exceptions.APIException as exc:
+            response = _exception_response(exc, authentication)
+        else:
+            response = await view(request, *args, **kwargs)
+        response['Allow'] = ', '.join(ALLOWED_METHODS + ('OPTIONS',))
+        return response
+
+    # Authentification par en-tête uniquement, comme les vues DRF
+    wrapper.csrf_exempt = True
+    return wrapper
+
+
+def _not_modified(etag):
+    return with_etag(HttpResponse(status=status.HTTP_304_NOT_MODIFIED), etag)
+
+
+@async_api_view
+async def my_coverage(request):
+    """
+    Taux de couverture de l'utilisateur connecté (variante asynchrone).
+    GET /api/coverage/my/
+    """
+    user = request.user
+
+    if user.is_admin:
+        return _json_response(
+            {'error': 'Les administrateurs ne peuvent pas utiliser cet endpoint.'},
+            status.HTTP_403_FORBIDDEN
+        )
+
+    async def compute():
+        distinct_regions_count = await UserRegionCount.aregions_count(user.pk)
+        total_regions = (await region_catalog.asnapshot()).count
+        return _coverage_payload(user, distinct_regions_count, total_regions)
+
+    # Même entrée de cache que la vue synchrone
+    key = await sync_to_async(UserRegionCount.coverage_cache_key)(user.pk)
+    return _json_response(await tiered_cache.aget_or_set('coverage', key, compute))
+
+
+@async_api_view
+async def weeks_availability(request):
+    """
+    Semaines disponibles d'une région pour une année (variante asynchrone).
+    GET /api/weeks/availability/?region_id=1&year=2024
+
+    Supporte If-None-Match, comme la vue synchrone.
+    """
+    region_id, year, error = _weeks_params(request.GET)
+    if error:
+        return _json_response({'error': error}, status.HTTP_400_BAD_REQUEST)
+
+    # Requête conditionnelle : 304 avant toute lecture des régions et réservations
+    versions = await aget_versions(bookings_year_scope(year), REGIONS_SCOPE)
+    etag = compute_etag(request, versions)
+    if etag_matches(request, etag):
+        return _not_modified(etag)
+
+    region = (await region_catalog.asnapshot(versions[REGIONS_SCOPE])).get(region_id)
+    if region is None:
+        return _json_response({'error': 'Paramètres invalides.'}, status.HTTP_400_BAD_REQUEST)
+
+    year_availability = await availability_index.ayear(year, versions[bookings_year_scope(year)])
+
+    return with_etag(_json_response(_weeks_payload(region, year, year_availability, request.user.is_admin)), etag)
+
+
+@async_api_view
+async def all_slots_availability(request):
+    """
+    Tous les créneaux (régions × semaines) d'une année (variante asynchrone).
+    GET /api/bookings/all-slots/?year=2024[&layout=matrix]
+
+    Supporte If-None-Match, comme la vue synchrone.
+    """
+    year, error = _slots_year(request.GET)
+    if error:
+        return _json_response({'error': error}, status.HTTP_400_BAD_REQUEST)
+
+    # Requête conditionnelle : 304 avant toute lecture des régions et réservations
+    versions = await aget_versions(bookings_year_scope(year), REGIONS_SCOPE)
+    etag = compute_etag(request, versions)
+    if etag_matches(request, etag):
+        return _not_modified(etag)
+
+    regions = await region_catalog.asnapshot(versions[REGIONS_SCOPE])
+    year_availability = await availability_index.ayear(year, versions[bookings_year_scope(year)])
+
+    return with_etag(_json_response(_slots_payload(
+        year, regions, year_availability, request.user.is_admin, request.GET.get('layout')
+    )), etag)
@@ -0,0 +1,130 @@
+"""
+Flux d'événements de réservation en temps réel (Server-Sent Events).
+
+Vue Django asynchrone servie par l'application ASGI (config/asgi.py) :
+chaque client garde une connexion ouverte au lieu d'interroger
+périodiquement les endpoints de disponibilité. Routée uniquement avec
+SERVER_PROFILE=asgi : sous WSGI, chaque connexion bloquerait un worker.
+
+EventSource ne permet pas d'envoyer d'en-têtes : le client demande d'abord
+un ticket de flux (POST /api/bookings/events/ticket/, JWT en en-tête) et le
+passe dans l'URL. Le ticket n'ouvre que le flux et expire après
+EVENTS_TICKET_MAX_AGE secondes : le JWT n'apparaît jamais dans les logs d'accès.
+
+Le hub d'événements est local au processus (core/events.py) : le profil asgi
+tourne avec un seul worker (gunicorn.conf.py), sans quoi un client ne verrait
+que les écritures traitées par son propre worker.
+"""
+import asyncio
+import json
+
+from django.core import signing
+from django.http import JsonResponse, StreamingHttpResponse
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+
+from accounts.authentication import CachedJWTAuthentication
+from accounts.models import User
+from core.events import event_hub
+
+
+# Intervalle (secondes) des commentaires keepalive envoyés aux clients inactifs
+HEARTBEAT_INTERVAL = 15
+
+EVENTS_TICKET_SALT = 'bookings.events-ticket'
+
+# Durée de validité (secondes) d'un ticket de flux : le temps d'ouvrir l'EventSource
+EVENTS_TICKET_MAX_AGE = 60
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def events_ticket(request):
+    """
+    Ticket d'ouverture du flux SSE pour l'utilisateur connecté.
+    POST /api/bookings/events/ticket/
+    """
+    return Response({
+        'ticket': signing.dumps(request.user.pk, salt=EVENTS_TICKET_SALT),
+        'expires_in': EVENTS_TICKET_MAX_AGE,
+    })
+
+
+async def _authenticate(request):
+    """
+    Authentifie le client par JWT (en-tête Authorization) ou par ticket de flux
+    (paramètre ticket, pour EventSource).
+    
+    Returns:
+        User ou None
+    """
+    authentication = CachedJWTAuthentication()
+    header = authentication.get_header(request)
+    raw_token = authentication.get_raw_token(header) if header else None
+    if raw_token is not None:
+        try:
+            validated_token = authentication.get_validated_token(raw_token)
+            user = await authentication.aget_user(validated_token)
+        except (InvalidToken, AuthenticationFailed):
+            return None
+        return user if user.is_active else None
+    
+    ticket = request.GET.get('ticket')
+    if not ticket:
+        return None
+    try:
+        user_id = signing.loads(ticket, salt=EVENTS_TICKET_SALT, max_age=EVENTS_TICKET_MAX_AGE)
+    except signing.BadSignature:
+        # SignatureExpired en hérite
+        return None
+    return await User.objects.filter(pk=user_id, is_active=True).afirst()
+
+
+async def _event_stream(year, is_admin):
+    """
+    Génère le flux SSE d'une année jusqu'à la déconnexion du client.
+    
+    L'abonnement est pris dans le générateur : un client déconnecté avant le
+    début de la réponse ne laisse aucun abonnement derrière lui.
+    """
+    subscription = event_hub.subscribe(year, is_admin)
+    try:
+        yield 'retry: 5000\n\n'
+        while True:
+            try:
+                payload = await asyncio.wait_for(subscription.queue.get(), timeout=HEARTBEAT_INTERVAL)
+            except asyncio.TimeoutError:
+                yield ': keepalive\n\n'
+                continue
+            yield f"event: {payload['type']}\ndata: {json.dumps(payload)}\n\n"
+    finally:
+        event_hub.unsubscribe(subscription)
+
+
+async def booking_events(request):
+    """
+    Flux SSE des créations, modifications et suppressions de réservations d'une année.
+    GET /api/bookings/events/?year=2026&ticket=<ticket de flux>
+    
+    Événements : booking.created, booking.updated, booking.deleted et resync
+    (le client doit recharger la grille). booked_by est toujours null pour les DG.
+    """
+    if request.method != 'GET':
+        return JsonResponse({'error': 'Méthode non autorisée.'}, status=405)
+    
+    user = await _authenticate(request)
+    if user is None:
+        return JsonResponse({'error': 'Authentification requise.'}, status=401)
+    
+    try:
+        year = int(request.GET.get('year', ''))
+    except ValueError:
+        return JsonResponse({'error': 'Le paramètre year est requis.'}, status=400)
+    
+    response = StreamingHttpResponse(_event_stream(year, user.is_admin), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    # Désactive la mise en tampon des proxys (Nginx)
+    response['X-Accel-Buffering'] = 'no'
+    return response
@@ -0,0 +1,176 @@
+"""
+Flux de calendrier (ICS) auxquels s'abonner : un par DG (ses réservations)
+et un par axe (toutes les réservations de la région).
+
+Les clients de calendrier ne savent pas envoyer de JWT : chaque flux est
+identifié par un jeton signé inclus dans l'URL. Le jeton porte l'utilisateur
+qui l'a émis et la version de ses flux : il cesse de fonctionner quand cet
+utilisateur est désactivé, perd le rôle admin (flux avec emails), ou régénère
+ses URL (POST /api/calendar/feeds/rotate/). Le rendu est mis en cache par
+processus et invalidé par les compteurs de version des réservations.
+"""
+import hashlib
+import threading
+from collections import OrderedDict
+
+from django.core import signing
+from django.http import HttpResponse
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.decorators import api_view, authentication_classes, permission_classes
+from rest_framework.permissions import AllowAny, IsAuthenticated
+from rest_framework.response import Response
+
+from accounts.models import User
+from core.etag import etag_matches, with_etag
+from core.regions import region_catalog
+from core.utils import generate_ics_calendar
+from core.versioning import REGIONS_SCOPE, bookings_version, bump_versions, get_versions
+from .models import Booking
+
+
+FEED_SALT = 'bookings.calendar-feed'
+
+# Nombre maximal de flux rendus conservés en mémoire par processus
+FEED_CACHE_SIZE = 256
+
+_feed_cache = OrderedDict()
+_feed_cache_lock = threading.Lock()
+
+
+def feeds_scope(user_id):
+    """Retourne le périmètre de version des URL de flux émises par un utilisateur."""
+    return f'calendar-feeds:{user_id}'
+
+
+def make_feed_token(kind, object_id, issuer, version):
+    """
+    Signe l'identité d'un flux ('user' ou 'region'), l'utilisateur qui l'émet,
+    son rôle et la version de ses flux.
+    """
+    return signing.dumps(
+        {'k': kind, 'id': object_id, 'u': issuer.pk, 'a': bool(issuer.is_admin), 'v': version},
+        salt=FEED_SALT
+    )
+
+
+def _feeds_payload(request):
+    user = request.user
+    version = get_versions(feeds_scope(user.pk))[feeds_scope(user.pk)]
+    
+    def feed_url(kind, object_id):
+        token = make_feed_token(kind, object_id, user, version)
+        return request.build_absolute_uri(reverse('bookings:calendar-feed', args=[token]))
+    
+    return {
+        'my': None if user.is_admin else feed_url('user', user.id),
+        'regions': [
+            {'region_id': region_id, 'region_name': name, 'url': feed_url('region', region_id)}
+            for region_id, name in region_catalog.snapshot()
+        ],
+    }
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def calendar_feeds(request):
+    """
+    Liste des URL d'abonnement de l'utilisateur connecté.
+    GET /api/calendar/feeds/
+    
+    - my: réservations du DG connecté (null pour un admin)
+    - regions: un flux par axe (emails des DG visibles uniquement par les admins)
+    """
+    return Response(_feeds_payload(request))
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def rotate_calendar_feeds(request):
+    """
+    Régénère les URL d'abonnement de l'utilisateur connecté : les précédentes
+    cessent de fonctionner.
+    POST /api/calendar/feeds/rotate/
+    """
+    bump_versions(feeds_scope(request.user.pk))
+    return Response(_feeds_payload(request))
+
+
+def _feed_not_found():
+    return Response({'error': 'Flux de calendrier introuvable.'}, status=status.HTTP_404_NOT_FOUND)
+
+
+@api_view(['GET'])
+@authentication_classes([])
+@permission_classes([AllowAny])
+def calendar_feed(request, token):
+    """
+    Flux ICS d'abonnement (jeton signé dans l'URL).
+    GET /api/calendar/<token>.ics
+    
+    Supporte If-None-Match : 304 tant qu'aucune réservation ni aucun axe n'a changé.
+    """
+    try:
+        feed = signing.loads(token, salt=FEED_SALT)
+        kind, object_id, issuer_id = feed['k'], int(feed['id']), int(feed['u'])
+        issued_as_admin, feed_version = bool(feed['a']), int(feed['v'])
+    except (signing.BadSignature, KeyError, TypeError, ValueError):
+        return _feed_not_found()
+    
+    # L'émetteur doit toujours être actif (et admin pour un flux avec emails) ;
+    # un flux DG ne porte que les réservations de son émetteur
+    issuer_is_admin = User.objects.filter(pk=issuer_id, is_active=True).values_list('is_admin', flat=True).first()
+    if issuer_is_admin is None or (issued_as_admin and not issuer_is_admin) or (kind == 'user' and object_id != issuer_id):
+        return _feed_not_found()
+    # Emails des DG (ORGANIZER) seulement pour un flux émis et toujours détenu par un admin
+    is_admin = issued_as_admin and issuer_is_admin
+    
+    versions = get_versions(REGIONS_SCOPE, feeds_scope(issuer_id))
+    if versions[feeds_scope(issuer_id)] != feed_version:
+        # URL régénérée depuis l'émission du jeton
+        return _feed_not_found()
+    
+    key = (kind, object_id, is_admin)
+    fingerprint = f'{kind}:{object_id}:{is_admin}:{bookings_version()}:{versions[REGIONS_SCOPE]}'
+    etag = '"%s"' % hashlib.sha256(fingerprint.encode()).hexdigest()[:32]
+    
+    if etag_matches(request, etag):
+        return with_etag(HttpResponse(status=status.HTTP_304_NOT_MODIFIED), etag)
+    
+    with _feed_cache_lock:
+        cached = _feed_cache.get(key)
+        if cached and cached[0] == etag:
+            _feed_cache.move_to_end(key)
+    
+    if cached and cached[0] == etag:
+        content = cached[1]
+    else:
+        content = _render_feed(kind, object_id, is_admin, versions[REGIONS_SCOPE])
+        if content is None:
+            return _feed_not_found()
+        with _feed_cache_lock:
+            _feed_cache[key] = (etag, content)
+            _feed_cache.move_to_end(key)
+            while len(_feed_cache) > FEED_CACHE_SIZE:
+                _feed_cache.popitem(last=False)
+    
+    response = HttpResponse(content, content_type='text/calendar; charset=utf-8')
+    response['Content-Disposition'] = 'inline; filename="reservations.ics"'
+    return with_etag(response, etag)
+
+
+def _render_feed(kind, object_id, is_admin, regions_version=None):
+    """Rend un flux en une seule requête ; None si l'axe n'existe plus."""
+    bookings = Booking.objects.select_related('user', 'region').order_by('year', 'week')
+    
+    if kind == 'user':
+        return generate_ics_calendar(bookings.filter(user_id=object_id), 'Mes réservations')
+    
+    region = region_catalog.snapshot(regions_version).get(object_id)
+    if region is None:
+        return None
+    return generate_ics_calendar(
+        bookings.filter(region_id=object_id),
+        f'Réservations - {region.name}',
+        include_organizer=is_admin
+    )
@@ -0,0 +1,81 @@
+import json
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from accounts.models import User
+from bookings.models import Region, Booking
+from bookings.serializers import BookingListSerializer, booking_list_data, booking_list_values
+
+
+class Command(BaseCommand):
+    help = (
+        "Mesure le débit de sérialisation des listes de réservations (lignes/s) : "
+        "BookingListSerializer sur des instances, puis lignes values() (BOOKING_FAST_LISTS), "
+        "et vérifie que le JSON produit est identique."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=100_000, help="Nombre de réservations générées")
+        parser.add_argument('--repeat', type=int, default=3, help="Mesures par chemin (meilleure retenue)")
+        parser.add_argument('--first-year', type=int, default=3000, help="Première année utilisée (hors des années réelles)")
+
+    def handle(self, *args, **options):
+        region_ids = list(Region.objects.values_list('id', flat=True))
+        if not region_ids:
+            self.stdout.write(self.style.ERROR("Aucun axe en base."))
+            return
+
+        user, _ = User.objects.get_or_create(email='bench-lists@booking.local', defaults={'is_active': False})
+        try:
+            self._populate(user, region_ids, options)
+            bookings = Booking.objects.filter(user=user).order_by('-created_at', '-id')
+
+            paths = {
+                'serializer': lambda: BookingListSerializer(
+                    bookings.select_related('user', 'region').only(
+                        'id', 'year', 'week', 'created_at', 'user__email', 'region__name'
+                    ),
+                    many=True,
+                ).data,
+                'values()': lambda: booking_list_data(booking_list_values(bookings)),
+            }
+            outputs = {}
+            for label, produce in paths.items():
+                best = None
+                for _ in range(options['repeat']):
+                    start = time.perf_counter()
+                    outputs[label] = produce()
+                    elapsed = time.perf_counter() - start
+                    best = elapsed if best is None else min(best, elapsed)
+                self.stdout.write(
+                    f"{label:10} : {options['rows'] / best:10.0f} lignes/s ({best:.2f}s pour {options['rows']} lignes)"
+                )
+
+            serializer_json, values_json = (json.dumps(output) for output in outputs.values())
+            if serializer_json == values_json:
+                self.stdout.write(self.style.SUCCESS("JSON identique pour les deux chemins."))
+            else:
+                self.stdout.write(self.style.ERROR("JSON différent entre les deux chemins."))
+        finally:
+            # DELETE direct : pas de signaux par réservation (compteurs, index) pour les lignes de test
+            with connection.cursor() as cursor:
+                cursor.execute(f'DELETE FROM {Booking._meta.db_table} WHERE user_id = %s', [user.pk])
+            user.delete()
+
+    def _populate(self, user, region_ids, options):
+        """Crée les réservations de test en masse (bulk_create, sans signaux)."""
+        slots_per_year = len(region_ids) * 53
+        Booking.objects.bulk_create(
+            (
+                Booking(
+                    user=user,
+                    region_id=region_ids[index % len(region_ids)],
+                    year=options['first_year'] + index // slots_per_year,
+                    week=index % slots_per_year // len(region_ids) + 1,
+                )
+                for index in range(options['rows'])
+            ),
+            batch_size=5000,
+        )
@@ -0,0 +1,91 @@
+import random
+import threading
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import IntegrityError, OperationalError, connection
+from django.test.utils import override_settings
+from rest_framework import serializers
+
+from accounts.models import User
+from bookings.models import Region, Booking
+from bookings.serializers import BookingSerializer
+
+
+class Command(BaseCommand):
+    help = (
+        "Mesure le débit de création de réservations sous contention, "
+        "en mode classique (SELECT préalables) puis en écriture rapide (contrainte unique). "
+        "À lancer sur une base PostgreSQL de développement (SQLite sérialise les écritures)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--threads', type=int, default=4, help="Nombre de clients concurrents")
+        parser.add_argument('--attempts', type=int, default=100, help="Tentatives par client")
+        parser.add_argument('--year', type=int, default=2099, help="Année utilisée pour les créneaux de test")
+
+    def handle(self, *args, **options):
+        region_ids = list(Region.objects.values_list('id', flat=True))
+        if not region_ids:
+            self.stdout.write(self.style.ERROR("Aucun axe en base."))
+            return
+
+        user, _ = User.objects.get_or_create(email='bench-writes@booking.local', defaults={'is_active': False})
+        # Pool de créneaux volontairement restreint pour provoquer des conflits
+        slots = [(region_id, week) for region_id in region_ids for week in range(1, 54)]
+
+        try:
+            for fast in (False, True):
+                Booking.objects.filter(user=user).delete()
+                with override_settings(BOOKING_FAST_WRITES=fast):
+                    stats, elapsed = self._run(user, slots, options)
+                label = 'rapide' if fast else 'classique'
+                total = sum(stats.values())
+                self.stdout.write(
+                    f"Mode {label:9} : {total / elapsed:8.1f} tentatives/s, "
+                    f"{stats['created'] / elapsed:8.1f} créations/s "
+                    f"(créées={stats['created']}, conflits={stats['conflict']}, "
+                    f"erreurs non gérées={stats['error']}, {elapsed:.2f}s)"
+                )
+        finally:
+            Booking.objects.filter(user=user).delete()
+            user.delete()
+
+    def _run(self, user, slots, options):
+        stats = {'created': 0, 'conflict': 0, 'error': 0}
+        lock = threading.Lock()
+        barrier = threading.Barrier(options['threads'])
+
+        def client(seed):
+            rng = random.Random(seed)
+            local = {'created': 0, 'conflict': 0, 'error': 0}
+            barrier.wait()
+            try:
+                for _ in range(options['attempts']):
+                    region_id, week = rng.choice(slots)
+                    serializer = BookingSerializer(data={'region': region_id, 'year': options['year'], 'week': week})
+                    try:
+                        if serializer.is_valid():
+                            serializer.save(user=user)
+                            local['created'] += 1
+                        else:
+                            local['conflict'] += 1
+                    except serializers.ValidationError:
+                        local['conflict'] += 1
+                    except (IntegrityError, OperationalError):
+                        # Course entre la vérification et l'INSERT (HTTP 500 en production),
+                        # ou verrou d'écriture SQLite
+                        local['error'] += 1
+            finally:
+                connection.close()
+            with lock:
+                for key, value in local.items():
+                    stats[key] += value
+
+        threads = [threading.Thread(target=client, args=(seed,)) for seed in range(options['threads'])]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return stats, time.perf_counter() - start
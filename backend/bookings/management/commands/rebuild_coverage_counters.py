@@ -0,0 +1,99 @@
+from collections import Counter
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count
+from bookings.models import Booking, UserRegionCount, UserRegionTotal
+
+
+class Command(BaseCommand):
+    help = (
+        'Reconstruit (ou vérifie avec --verify) les compteurs de couverture, annuels et '
+        'toutes années, à partir des réservations.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--verify',
+            action='store_true',
+            help="Compare les compteurs aux réservations sans rien modifier (code de sortie 1 si écart).",
+        )
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            expected = self._expected_counts()
+            expected_totals = self._totals(expected)
+            if options['verify']:
+                self._verify(expected, expected_totals)
+                return
+            
+            UserRegionCount.objects.all().delete()
+            UserRegionCount.objects.bulk_create(
+                [
+                    UserRegionCount(user_id=user_id, region_id=region_id, year=year, count=count)
+                    for (user_id, region_id, year), count in expected.items()
+                ],
+                batch_size=1000,
+            )
+            UserRegionTotal.objects.all().delete()
+            UserRegionTotal.objects.bulk_create(
+                [
+                    UserRegionTotal(user_id=user_id, region_id=region_id, count=count)
+                    for (user_id, region_id), count in expected_totals.items()
+                ],
+                batch_size=1000,
+            )
+        
+        self.stdout.write(self.style.SUCCESS(
+            f"{len(expected)} compteurs annuels et {len(expected_totals)} totaux reconstruits."
+        ))
+
+    def _expected_counts(self):
+        """Compteurs attendus, agrégés en une seule requête sur les réservations."""
+        rows = Booking.objects.values('user_id', 'region_id', 'year').annotate(n=Count('id')).order_by()
+        return {(row['user_id'], row['region_id'], row['year']): row['n'] for row in rows}
+
+    @staticmethod
+    def _totals(counts):
+        """Totaux toutes années (utilisateur, axe) à partir des compteurs annuels."""
+        totals = Counter()
+        for (user_id, region_id, _), count in counts.items():
+            totals[(user_id, region_id)] += count
+        return dict(totals)
+
+    def _verify(self, expected, expected_totals):
+        actual = {
+            (user_id, region_id, year): count
+            for user_id, region_id, year, count in UserRegionCount.objects.values_list(
+                'user_id', 'region_id', 'year', 'count'
+            )
+        }
+        actual_totals = {
+            (user_id, region_id): count
+            for user_id, region_id, count in UserRegionTotal.objects.values_list('user_id', 'region_id', 'count')
+        }
+        mismatches = self._mismatches(expected, actual) + self._mismatches(
+            {key + ('toutes années',): count for key, count in expected_totals.items()},
+            {key + ('toutes années',): count for key, count in actual_totals.items()},
+        )
+        
+        if not mismatches:
+            self.stdout.write(self.style.SUCCESS(
+                f"{len(actual)} compteurs annuels et {len(actual_totals)} totaux vérifiés, aucun écart."
+            ))
+            return
+        
+        for (user_id, region_id, year), wanted, found in mismatches:
+            self.stdout.write(
+                f"- utilisateur {user_id}, axe {region_id}, {year} : attendu {wanted}, trouvé {found}"
+            )
+        self.stderr.write(self.style.ERROR(f"{len(mismatches)} écart(s). Lancez la commande sans --verify pour reconstruire."))
+        raise SystemExit(1)
+
+    @staticmethod
+    def _mismatches(expected, actual):
+        return sorted(
+            (key, expected.get(key, 0), actual.get(key, 0))
+            for key in expected.keys() | actual.keys()
+            if expected.get(key, 0) != actual.get(key, 0)
+        )
@@ -0,0 +1,45 @@
+# Generated by Django 6.0 on 2026-02-02 09:12
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def fill_counters(apps, schema_editor):
+    """Initialise les compteurs à partir des réservations existantes."""
+    Booking = apps.get_model('bookings', 'Booking')
+    UserRegionCount = apps.get_model('bookings', 'UserRegionCount')
+    
+    rows = Booking.objects.values('user_id', 'region_id', 'year').annotate(n=models.Count('id'))
+    UserRegionCount.objects.bulk_create([
+        UserRegionCount(user_id=row['user_id'], region_id=row['region_id'], year=row['year'], count=row['n'])
+        for row in rows
+    ])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookings', '0003_rename_bookings_bo_region__1f8e52_idx_booking_region_year_week_idx_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserRegionCount',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('year', models.IntegerField(verbose_name='Année')),
+                ('count', models.PositiveIntegerField(default=0, verbose_name='Nombre de réservations')),
+                ('region', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='user_counts', to='bookings.region', verbose_name='Région')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='region_counts', to=settings.AUTH_USER_MODEL, verbose_name='Utilisateur')),
+            ],
+            options={
+                'verbose_name': 'Compteur de couverture',
+                'verbose_name_plural': 'Compteurs de couverture',
+                'indexes': [models.Index(fields=['year', 'user'], name='count_year_user_idx')],
+                'constraints': [models.UniqueConstraint(fields=('user', 'region', 'year'), name='unique_user_region_year_count')],
+            },
+        ),
+        migrations.RunPython(fill_counters, migrations.RunPython.noop),
+    ]
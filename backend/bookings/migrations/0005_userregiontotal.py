@@ -0,0 +1,43 @@
+# Generated by Django 6.0 on 2026-10-18 11:03
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def fill_totals(apps, schema_editor):
+    """Initialise les totaux toutes années à partir des compteurs annuels."""
+    UserRegionCount = apps.get_model('bookings', 'UserRegionCount')
+    UserRegionTotal = apps.get_model('bookings', 'UserRegionTotal')
+    
+    rows = UserRegionCount.objects.values('user_id', 'region_id').annotate(n=models.Sum('count')).order_by()
+    UserRegionTotal.objects.bulk_create(
+        [UserRegionTotal(user_id=row['user_id'], region_id=row['region_id'], count=row['n']) for row in rows],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookings', '0004_userregioncount'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserRegionTotal',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('count', models.PositiveIntegerField(default=0, verbose_name='Nombre de réservations')),
+                ('region', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='user_totals', to='bookings.region', verbose_name='Région')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='region_totals', to=settings.AUTH_USER_MODEL, verbose_name='Utilisateur')),
+            ],
+            options={
+                'verbose_name': 'Total de couverture',
+                'verbose_name_plural': 'Totaux de couverture',
+                'constraints': [models.UniqueConstraint(fields=('user', 'region'), name='unique_user_region_total')],
+            },
+        ),
+        migrations.RunPython(fill_totals, migrations.RunPython.noop),
+    ]
@@ -1,6 +1,15 @@
-from django.db import models
+from django.db import IntegrityError, models, transaction
+from django.db.models import F
+from django.conf import settings
 from django.core.exceptions import ValidationError
 from accounts.models import User
+from core.caching import tiered_cache
+from core.iso_calendar import is_supported_year, weeks_in_year
+
+
+def week_range_message(year):
+    """Message d'erreur pour une semaine ISO inexistante dans l'année."""
+    return f"La semaine ISO doit être entre 1 et {weeks_in_year(year)} pour l'année {year}."
 
 
 class Region(models.Model):
@@ -65,17 +74,179 @@ class Booking(models.Model):
     def __str__(self):
         return f"{self.user.email} - {self.region.name} - {self.year}-W{self.week:02d}"
     
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Mémorise les valeurs chargées pour détecter les déplacements de créneau."""
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_values = dict(zip(field_names, values))
+        return instance
+    
+    @property
+    def previous_slot(self):
+        """Créneau (region_id, year, week) tel que chargé depuis la base, ou None."""
+        loaded = getattr(self, '_loaded_values', None)
+        if not loaded or not all(name in loaded for name in ('region_id', 'year', 'week')):
+            return None
+        return loaded['region_id'], loaded['year'], loaded['week']
+    
+    @property
+    def previous_user_id(self):
+        """Utilisateur tel que chargé depuis la base, ou None."""
+        return getattr(self, '_loaded_values', None) and self._loaded_values.get('user_id')
+    
     def clean(self):
         """Validation métier."""
-        # Vérification que la semaine ISO est valide (1-53)
-        if self.week < 1 or self.week > 53:
-            raise ValidationError({'week': 'La semaine ISO doit être entre 1 et 53.'})
-        
         # Vérification que l'année est valide
-        if self.year < 2000 or self.year > 2100:
+        if not is_supported_year(self.year):
             raise ValidationError({'year': 'L\'année doit être entre 2000 et 2100.'})
+        
+        # Vérification que la semaine ISO existe dans l'année (52 ou 53 semaines)
+        if self.week < 1 or self.week > weeks_in_year(self.year):
+            raise ValidationError({'week': week_range_message(self.year)})
     
     def save(self, *args, **kwargs):
         """Surcharge pour valider avant sauvegarde."""
-        self.full_clean()
-        super().save(*args, **kwargs)
+        if getattr(settings, 'BOOKING_FAST_WRITES', False):
+            # Écriture rapide : bornes vérifiées en Python, unicité et clés étrangères
+            # garanties par la base (IntegrityError traduite par BookingSerializer)
+            self.full_clean(exclude=['user', 'region'], validate_unique=False, validate_constraints=False)
+        else:
+            self.full_clean()
+        # Les signaux post_save (compteurs, versions) s'exécutent dans la même transaction
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
+
+def _adjust_counter(model, delta, **key):
+    """
+    Ajoute delta au compteur `count` de la ligne `key` du modèle, en la créant
+    ou en la supprimant (compteur nul) au besoin.
+    """
+    counters = model.objects.filter(**key)
+    if delta > 0:
+        if counters.update(count=F('count') + delta):
+            return
+        try:
+            with transaction.atomic():
+                model.objects.create(count=delta, **key)
+        except IntegrityError:
+            # Ligne créée entre-temps par une écriture concurrente
+            counters.update(count=F('count') + delta)
+    else:
+        counters.update(count=F('count') + delta)
+        counters.filter(count__lte=0).delete()
+
+
+class UserRegionCount(models.Model):
+    """
+    Nombre de réservations d'un utilisateur par région et par année.
+    
+    Tenu à jour dans la transaction de chaque création, déplacement ou
+    suppression de réservation (bookings/signals.py) ; une ligne n'existe que
+    si son compteur est positif. Les totaux toutes années sont dans
+    UserRegionTotal. Reconstruction : manage.py rebuild_coverage_counters.
+    """
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='region_counts',
+        verbose_name="Utilisateur"
+    )
+    region = models.ForeignKey(
+        Region,
+        on_delete=models.CASCADE,
+        related_name='user_counts',
+        verbose_name="Région"
+    )
+    year = models.IntegerField(verbose_name="Année")
+    count = models.PositiveIntegerField(default=0, verbose_name="Nombre de réservations")
+    
+    class Meta:
+        verbose_name = "Compteur de couverture"
+        verbose_name_plural = "Compteurs de couverture"
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'region', 'year'], name='unique_user_region_year_count'),
+        ]
+        indexes = [
+            models.Index(fields=['year', 'user'], name='count_year_user_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.user_id} - {self.region_id} - {self.year} : {self.count}"
+    
+    @classmethod
+    def regions_count(cls, user_id, year=None):
+        """
+        Nombre de régions distinctes réservées par l'utilisateur : une ligne
+        par région, lue sur l'index unique (sans DISTINCT ni parcours des années).
+        """
+        if year is None:
+            return UserRegionTotal.objects.filter(user_id=user_id).count()
+        return cls.objects.filter(user_id=user_id, year=year).count()
+    
+    @classmethod
+    async def aregions_count(cls, user_id):
+        """Variante asynchrone de regions_count (toutes années)."""
+        return await UserRegionTotal.objects.filter(user_id=user_id).acount()
+    
+    @staticmethod
+    def coverage_cache_key(user_id):
+        """
+        Clé du taux de couverture en cache (espace 'coverage') : porte la
+        version de l'utilisateur, calculée avant le calcul du taux.
+        """
+        return f"{user_id}:v{tiered_cache.version(f'coverage:{user_id}')}"
+    
+    @staticmethod
+    def forget_coverage(*user_ids):
+        """
+        Invalide le taux de couverture en cache des utilisateurs (après validation).
+        
+        Incrémente leur version plutôt que de supprimer l'entrée : un calcul
+        commencé avant l'écriture stocke sous l'ancienne clé, jamais relue.
+        """
+        for user_id in set(user_ids):
+            tiered_cache.bump(f'coverage:{user_id}')
+    
+    @classmethod
+    def adjust(cls, user_id, region_id, year, delta):
+        """
+        Ajoute delta (+1/-1) au compteur de l'année et au total toutes années,
+        en créant ou supprimant les lignes au besoin.
+        À appeler dans la transaction de l'écriture de la réservation.
+        """
+        _adjust_counter(cls, delta, user_id=user_id, region_id=region_id, year=year)
+        _adjust_counter(UserRegionTotal, delta, user_id=user_id, region_id=region_id)
+
+
+class UserRegionTotal(models.Model):
+    """
+    Nombre de réservations d'un utilisateur par région, toutes années.
+    
+    Tenu à jour avec UserRegionCount (UserRegionCount.adjust) ; une ligne
+    n'existe que si son compteur est positif : le nombre de lignes d'un
+    utilisateur est son nombre de régions couvertes.
+    """
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='region_totals',
+        verbose_name="Utilisateur"
+    )
+    region = models.ForeignKey(
+        Region,
+        on_delete=models.CASCADE,
+        related_name='user_totals',
+        verbose_name="Région"
+    )
+    count = models.PositiveIntegerField(default=0, verbose_name="Nombre de réservations")
+    
+    class Meta:
+        verbose_name = "Total de couverture"
+        verbose_name_plural = "Totaux de couverture"
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'region'], name='unique_user_region_total'),
+        ]
+    
+    def __str__(self):
+        return f"{self.user_id} - {self.region_id} : {self.count}"
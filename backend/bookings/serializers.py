@@ -1,10 +1,45 @@
-from rest_framework import serializers
-from .models import Region, Booking
+from rest_framework import ISO_8601, serializers
+from rest_framework.settings import api_settings
+from .models import Region, Booking, week_range_message
+from core.iso_calendar import weeks_in_year
 from accounts.serializers import UserSerializer
-from django.db import transaction
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils import timezone
 from django.core.exceptions import ValidationError
 
 
+def booking_conflict_message(region, year, week):
+    """Message d'erreur lorsqu'un créneau est déjà réservé."""
+    return f"L'axe ({region.name}) est déjà réservé pour la semaine existante ISO {week} de l'année {year}."
+
+
+class BookingSlotValidationMixin:
+    """
+    Validation des champs year et week d'un créneau, commune à la création
+    unitaire (BookingSerializer) et à la création groupée (BookingBulkItemSerializer).
+    """
+    
+    def validate_week(self, value):
+        """Validation de la semaine ISO."""
+        if value < 1 or value > 53:
+            raise serializers.ValidationError("La semaine ISO doit être entre 1 et 53.")
+        return value
+    
+    def validate_year(self, value):
+        """Validation de l'année."""
+        if value < 2000 or value > 2100:
+            raise serializers.ValidationError("L'année doit être entre 2000 et 2100.")
+        return value
+    
+    @staticmethod
+    def check_week_in_year(year, week):
+        """La semaine doit exister dans l'année (52 ou 53 semaines selon l'année)."""
+        if week > weeks_in_year(year):
+            raise serializers.ValidationError({'week': [week_range_message(year)]})
+
+
 class RegionSerializer(serializers.ModelSerializer):
     """Serializer pour Region."""
     
@@ -14,7 +49,7 @@ class RegionSerializer(serializers.ModelSerializer):
         read_only_fields = ['id']
 
 
-class BookingSerializer(serializers.ModelSerializer):
+class BookingSerializer(BookingSlotValidationMixin, serializers.ModelSerializer):
     """Serializer pour Booking."""
     region_name = serializers.CharField(source='region.name', read_only=True)
     user_email = serializers.EmailField(source='user.email', read_only=True)
@@ -24,23 +59,29 @@ class BookingSerializer(serializers.ModelSerializer):
         fields = ['id', 'user', 'user_email', 'region', 'region_name', 'year', 'week', 'created_at']
         read_only_fields = ['id', 'user', 'user_email', 'created_at']
     
-    def validate_week(self, value):
-        """Validation de la semaine ISO."""
-        if value < 1 or value > 53:
-            raise serializers.ValidationError("La semaine ISO doit être entre 1 et 53.")
-        return value
-    
-    def validate_year(self, value):
-        """Validation de l'année."""
-        if value < 2000 or value > 2100:
-            raise serializers.ValidationError("L'année doit être entre 2000 et 2100.")
-        return value
+    def get_validators(self):
+        """
+        En écriture rapide, pas de validateur d'unicité DRF (requête SELECT) :
+        la contrainte unique_region_year_week de la base fait foi.
+        """
+        if getattr(settings, 'BOOKING_FAST_WRITES', False):
+            return []
+        return super().get_validators()
     
     def validate(self, attrs):
         """
         Validation globale pour vérifier la disponibilité.
         S'applique à la création et à la mise à jour.
         """
+        year = attrs.get('year', self.instance.year if self.instance else None)
+        week = attrs.get('week', self.instance.week if self.instance else None)
+        if year is not None and week is not None:
+            self.check_week_in_year(year, week)
+        
+        if getattr(settings, 'BOOKING_FAST_WRITES', False):
+            # Le conflit est détecté par l'INSERT/UPDATE lui-même (voir _save_slot)
+            return attrs
+        
         region = attrs.get('region')
         year = attrs.get('year')
         week = attrs.get('week')
@@ -66,12 +107,66 @@ class BookingSerializer(serializers.ModelSerializer):
             
         if queryset.exists():
             raise serializers.ValidationError({
-                'non_field_errors': [
-                    f"L'axe ({region.name}) est déjà réservé pour la semaine existante ISO {week} de l'année {year}."
-                ]
+                'non_field_errors': [booking_conflict_message(region, year, week)]
             })
             
         return attrs
+    
+    def create(self, validated_data):
+        return self._save_slot(lambda: super(BookingSerializer, self).create(validated_data), validated_data)
+    
+    def update(self, instance, validated_data):
+        return self._save_slot(lambda: super(BookingSerializer, self).update(instance, validated_data), validated_data)
+    
+    def _save_slot(self, save, validated_data):
+        """
+        Exécute l'écriture dans un savepoint et traduit la violation de
+        unique_region_year_week (y compris deux POST concurrents) en erreur 400.
+        """
+        try:
+            with transaction.atomic():
+                return save()
+        except IntegrityError:
+            region = validated_data.get('region') or self.instance.region
+            year = validated_data.get('year') or self.instance.year
+            week = validated_data.get('week') or self.instance.week
+            
+            conflicts = Booking.objects.filter(region=region, year=year, week=week)
+            if self.instance:
+                conflicts = conflicts.exclude(pk=self.instance.pk)
+            if not conflicts.exists():
+                raise
+            
+            raise serializers.ValidationError({
+                'non_field_errors': [booking_conflict_message(region, year, week)]
+            })
+
+
+class BookingBulkItemSerializer(BookingSlotValidationMixin, serializers.Serializer):
+    """Créneau demandé dans une création groupée."""
+    region = serializers.IntegerField()
+    year = serializers.IntegerField()
+    week = serializers.IntegerField()
+    
+    def validate(self, attrs):
+        self.check_week_in_year(attrs['year'], attrs['week'])
+        return attrs
+
+
+class BookingBulkCreateSerializer(serializers.Serializer):
+    """
+    Requête de création groupée.
+    
+    - all_or_nothing : aucune réservation créée si un créneau est invalide ou pris
+    - best_effort : les créneaux libres sont réservés, les autres signalés
+    """
+    ALL_OR_NOTHING = 'all_or_nothing'
+    BEST_EFFORT = 'best_effort'
+    MAX_ITEMS = 200
+    
+    mode = serializers.ChoiceField(choices=[ALL_OR_NOTHING, BEST_EFFORT], default=ALL_OR_NOTHING)
+    # Chaque créneau est validé séparément pour produire un résultat par élément
+    bookings = serializers.ListField(child=serializers.DictField(), min_length=1, max_length=MAX_ITEMS)
 
 
 class BookingListSerializer(serializers.ModelSerializer):
@@ -84,6 +179,64 @@ class BookingListSerializer(serializers.ModelSerializer):
         fields = ['id', 'user_email', 'region_name', 'year', 'week', 'created_at']
 
 
+BOOKING_LIST_FIELDS = ('id', 'user_email', 'region_name', 'year', 'week', 'created_at')
+
+
+def booking_list_values(queryset):
+    """
+    Lignes de BookingListSerializer en dicts (values()), email et nom de la
+    région joints en SQL : aucune instance de modèle n'est construite.
+    """
+    return queryset.annotate(
+        user_email=F('user__email'),
+        region_name=F('region__name'),
+    ).values(*BOOKING_LIST_FIELDS)
+
+
+def _datetime_representation():
+    """
+    DateTimeField.to_representation, fuseau résolu une seule fois par liste
+    pour le format ISO 8601 (défaut de DRF).
+    """
+    field = serializers.DateTimeField()
+    output_format = api_settings.DATETIME_FORMAT
+    if not isinstance(output_format, str) or output_format.lower() != ISO_8601:
+        return field.to_representation
+    
+    field_timezone = field.default_timezone()
+    
+    def to_representation(value):
+        if value is None:
+            return None
+        if field_timezone is not None and timezone.is_aware(value):
+            value = value.astimezone(field_timezone)
+        value = value.isoformat()
+        if value.endswith('+00:00'):
+            value = value[:-6] + 'Z'
+        return value
+    
+    return to_representation
+
+
+def booking_list_data(rows):
+    """
+    Sortie identique à BookingListSerializer(many=True).data pour des lignes
+    de booking_list_values(), sans passer par les champs du serializer.
+    """
+    created_at = _datetime_representation()
+    return [
+        {
+            'id': row['id'],
+            'user_email': row['user_email'],
+            'region_name': row['region_name'],
+            'year': row['year'],
+            'week': row['week'],
+            'created_at': created_at(row['created_at']),
+        }
+        for row in rows
+    ]
+
+
 class CoverageSerializer(serializers.Serializer):
     """Serializer pour le taux de couverture."""
     user_email = serializers.EmailField()
@@ -0,0 +1,115 @@
+"""
+Signaux de Booking et Region : tiennent à jour l'index de disponibilité en
+mémoire, les compteurs de couverture, les compteurs de version (ETag) et le
+cache de rendu ICS, et diffusent les événements de réservation aux clients
+connectés (SSE).
+"""
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from core.availability import availability_index
+from core.events import event_hub
+from core.caching import tiered_cache
+from core.regions import region_catalog
+from core.utils import ics_cache
+from core.versioning import REGIONS_SCOPE, bump_booking_versions, bump_versions
+from .models import Region, Booking, UserRegionCount
+
+
+def _slot_payload(slot):
+    region_id, year, week = slot
+    return {'region_id': region_id, 'year': year, 'week': week}
+
+
+@receiver(post_save, sender=Booking)
+def booking_saved(sender, instance, created, **kwargs):
+    """Met à jour l'index après création ou modification d'une réservation."""
+    previous_slot = None if created else instance.previous_slot
+    previous_user_id = None if created else instance.previous_user_id
+    slot = (instance.region_id, instance.year, instance.week)
+    email = instance.user.email
+    
+    years = {instance.year}
+    if previous_slot:
+        years.add(previous_slot[1])
+    
+    event = {
+        'type': 'booking.created' if created else 'booking.updated',
+        'booking': dict(_slot_payload(slot), id=instance.pk, booked_by=email),
+        'previous': _slot_payload(previous_slot) if previous_slot and previous_slot != slot else None,
+        'years': sorted(years),
+    }
+
+    def apply():
+        if previous_slot and previous_slot != slot:
+            availability_index.remove(*previous_slot)
+        availability_index.add(*slot, email)
+        event_hub.publish(event)
+
+    transaction.on_commit(apply)
+    _update_counters(instance, created, previous_slot, previous_user_id)
+    ics_cache.invalidate(instance.pk)
+    transaction.on_commit(lambda: bump_booking_versions(*years))
+    # Le créneau courant devient la référence pour la prochaine sauvegarde
+    instance._loaded_values = {
+        'user_id': instance.user_id,
+        'region_id': instance.region_id, 'year': instance.year, 'week': instance.week,
+    }
+
+
+def _update_counters(instance, created, previous_slot, previous_user_id):
+    """Reporte la création ou le déplacement sur les compteurs de couverture."""
+    key = (instance.user_id, instance.region_id, instance.year)
+    if created:
+        UserRegionCount.adjust(*key, 1)
+        _forget_coverage(instance.user_id)
+        return
+    if previous_slot is None:
+        # Instance non chargée depuis la base : ancien créneau inconnu
+        return
+    previous_key = (previous_user_id or instance.user_id, previous_slot[0], previous_slot[1])
+    if previous_key != key:
+        UserRegionCount.adjust(*previous_key, -1)
+        UserRegionCount.adjust(*key, 1)
+        _forget_coverage(previous_key[0], instance.user_id)
+
+
+def _forget_coverage(*user_ids):
+    """Oublie le taux de couverture en cache des utilisateurs (après validation)."""
+    transaction.on_commit(lambda: UserRegionCount.forget_coverage(*user_ids))
+
+
+@receiver(post_delete, sender=Booking)
+def booking_deleted(sender, instance, **kwargs):
+    """Libère le créneau dans l'index après suppression d'une réservation."""
+    slot = instance.previous_slot or (instance.region_id, instance.year, instance.week)
+    user_id = instance.previous_user_id or instance.user_id
+    event = {
+        'type': 'booking.deleted',
+        'booking': dict(_slot_payload(slot), id=instance.pk, booked_by=instance.user.email),
+        'previous': None,
+        'years': [slot[1]],
+    }
+
+    def apply():
+        availability_index.remove(*slot)
+        event_hub.publish(event)
+
+    transaction.on_commit(apply)
+    UserRegionCount.adjust(user_id, slot[0], slot[1], -1)
+    _forget_coverage(user_id)
+    ics_cache.invalidate(instance.pk)
+    transaction.on_commit(lambda: bump_booking_versions(slot[1]))
+
+
+@receiver(post_save, sender=Region)
+@receiver(post_delete, sender=Region)
+def region_changed(sender, **kwargs):
+    """
+    Invalide les ETag et le catalogue des axes ; le nombre d'axes change les
+    taux de couverture en cache.
+    """
+    bump_versions(REGIONS_SCOPE)
+    transaction.on_commit(region_catalog.invalidate)
+    transaction.on_commit(lambda: tiered_cache.bump('coverage'))
@@ -1,3 +1,442 @@
-from django.test import TestCase
+import asyncio
+import time
+from io import StringIO
+from unittest import mock
 
-# Create your tests here.
+from asgiref.sync import sync_to_async
+from django.core.management import call_command
+from django.db import connection
+from django.test import AsyncRequestFactory, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient, APIRequestFactory, force_authenticate
+from rest_framework_simplejwt.tokens import AccessToken
+
+from accounts.models import User
+from core.availability import availability_index
+from core.caching import tiered_cache
+from core.events import event_hub
+from core.ratelimit import shared_buckets
+from core.versioning import bookings_year_scope, bump_booking_versions, get_versions
+from .events import booking_events, events_ticket
+from .models import Booking, Region, UserRegionCount, UserRegionTotal
+
+
+class BookingAPITestCase(TestCase):
+    """Base des tests d'API : caches du processus remis à zéro, un DG et un axe."""
+
+    def setUp(self):
+        tiered_cache.clear_local()
+        availability_index.invalidate()
+        shared_buckets().reset()
+        self.dg = User.objects.create_user('dg@example.com', 'password123')
+        self.region = Region.objects.create(name='Axe de test')
+        self.client = APIClient()
+        self.client.force_authenticate(self.dg)
+
+    def get(self, name, params=None, **extra):
+        return self.client.get(reverse(f'bookings:{name}'), params, secure=True, **extra)
+
+    def post(self, name, data, **extra):
+        return self.client.post(reverse(f'bookings:{name}'), data, format='json', secure=True, **extra)
+
+    def book(self, week, year=2026, user=None, region=None):
+        with self.captureOnCommitCallbacks(execute=True):
+            return Booking.objects.create(
+                user=user or self.dg, region=region or self.region, year=year, week=week
+            )
+
+
+class AvailabilityTests(BookingAPITestCase):
+    def test_booking_is_visible_to_the_next_read(self):
+        params = {'region_id': self.region.pk, 'year': 2026}
+        weeks = self.get('weeks-availability', params).json()['weeks']
+        self.assertTrue(weeks[9]['is_available'])
+        self.book(10)
+        weeks = self.get('weeks-availability', params).json()['weeks']
+        self.assertFalse(weeks[9]['is_available'])
+        self.assertIsNone(weeks[9]['booked_by'])
+
+    def test_write_from_another_worker_is_seen_through_the_year_version(self):
+        self.get('weeks-availability', {'region_id': self.region.pk, 'year': 2026})
+        # Écriture traitée ailleurs : seul l'incrément de version parvient à ce worker
+        Booking.objects.bulk_create([Booking(user=self.dg, region=self.region, year=2026, week=11)])
+        bump_booking_versions(2026)
+        tiered_cache.clear_local()
+        weeks = self.get('weeks-availability', {'region_id': self.region.pk, 'year': 2026}).json()['weeks']
+        self.assertFalse(weeks[10]['is_available'])
+
+
+class IsoWeekRulesTests(BookingAPITestCase):
+    def create(self, year, week):
+        return self.post('booking-list', {'region': self.region.pk, 'year': year, 'week': week})
+
+    def test_week_53_is_bookable_in_a_53_week_year(self):
+        self.assertEqual(self.create(2026, 53).status_code, 201)
+
+    def test_week_53_is_rejected_in_a_52_week_year(self):
+        response = self.create(2027, 53)
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('week', response.json())
+        self.assertFalse(Booking.objects.exists())
+
+    def test_grids_follow_the_year_week_count(self):
+        self.assertEqual(self.get('all-slots-availability', {'year': 2027}).json()['total_weeks'], 52)
+        weeks = self.get('weeks-availability', {'region_id': self.region.pk, 'year': 2026}).json()['weeks']
+        self.assertEqual(len(weeks), 53)
+
+
+class CoverageCounterTests(BookingAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.other_region = Region.objects.create(name='Autre axe')
+
+    def counters(self):
+        return set(UserRegionCount.objects.values_list('user_id', 'region_id', 'year', 'count'))
+
+    def coverage(self):
+        return self.get('my-coverage').json()['distinct_regions_count']
+
+    def test_counters_follow_create_move_and_delete(self):
+        self.assertEqual(self.coverage(), 0)
+        self.book(1)
+        self.book(2)
+        self.assertEqual(self.counters(), {(self.dg.pk, self.region.pk, 2026, 2)})
+        self.assertEqual(self.coverage(), 1)
+
+        booking = Booking.objects.get(week=2)
+        booking.region = self.other_region
+        booking.year = 2027
+        with self.captureOnCommitCallbacks(execute=True):
+            booking.save()
+        self.assertEqual(self.counters(), {
+            (self.dg.pk, self.region.pk, 2026, 1),
+            (self.dg.pk, self.other_region.pk, 2027, 1),
+        })
+        self.assertEqual(self.coverage(), 2)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            booking.delete()
+        self.assertEqual(self.counters(), {(self.dg.pk, self.region.pk, 2026, 1)})
+        self.assertEqual(UserRegionCount.regions_count(self.dg.pk), 1)
+        self.assertEqual(self.coverage(), 1)
+
+    def test_reassigned_booking_moves_the_counter(self):
+        other = User.objects.create_user('other@example.com', 'password123')
+        booking = self.book(1)
+        booking.user = other
+        with self.captureOnCommitCallbacks(execute=True):
+            booking.save()
+        self.assertEqual(self.counters(), {(other.pk, self.region.pk, 2026, 1)})
+        self.assertEqual(self.coverage(), 0)
+
+    def test_rebuild_command_repairs_drift(self):
+        self.book(1)
+        UserRegionCount.objects.update(count=5)
+        UserRegionTotal.objects.all().delete()
+        with self.assertRaises(SystemExit):
+            call_command('rebuild_coverage_counters', '--verify', stdout=StringIO(), stderr=StringIO())
+        call_command('rebuild_coverage_counters', stdout=StringIO())
+        self.assertEqual(self.counters(), {(self.dg.pk, self.region.pk, 2026, 1)})
+        self.assertEqual(UserRegionCount.regions_count(self.dg.pk), 1)
+        call_command('rebuild_coverage_counters', '--verify', stdout=StringIO())
+
+
+class SlotMatrixTests(BookingAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.book(1)
+        self.book(53)
+
+    def matrix_row(self, data):
+        row = [region['id'] for region in data['regions']].index(self.region.pk)
+        return data['booked'][row]
+
+    def test_matrix_has_one_bitstring_per_region(self):
+        data = self.get('all-slots-availability', {'year': 2026, 'layout': 'matrix'}).json()
+        self.assertEqual(data['layout'], 'matrix')
+        self.assertEqual(data['weeks'], list(range(1, 54)))
+        self.assertEqual(len(data['booked']), len(data['regions']))
+        self.assertEqual(self.matrix_row(data), '1' + '0' * 51 + '1')
+        self.assertIsNone(data['booked_by'])
+
+    def test_matrix_gives_owners_to_admins(self):
+        admin = User.objects.create_user('admin@example.com', 'password123', is_admin=True)
+        self.client.force_authenticate(admin)
+        data = self.get('all-slots-availability', {'year': 2026, 'layout': 'matrix'}).json()
+        self.assertEqual(
+            data['booked_by'][str(self.region.pk)], {'1': 'dg@example.com', '53': 'dg@example.com'}
+        )
+
+    def test_matrix_matches_the_slot_list(self):
+        slots = self.get('all-slots-availability', {'year': 2026}).json()
+        data = self.get('all-slots-availability', {'year': 2026, 'layout': 'matrix'}).json()
+        self.assertEqual(slots['total_weeks'], 53)
+        booked = {(slot['region_id'], slot['week']) for slot in slots['slots'] if not slot['is_available']}
+        from_matrix = {
+            (region['id'], week)
+            for region, bits in zip(data['regions'], data['booked'])
+            for week, bit in zip(data['weeks'], bits) if bit == '1'
+        }
+        self.assertEqual(from_matrix, booked)
+
+
+class ConditionalRequestTests(BookingAPITestCase):
+    def revalidate(self, name, params, etag):
+        return self.get(name, params, HTTP_IF_NONE_MATCH=etag)
+
+    def test_unchanged_year_answers_304_without_reading_bookings(self):
+        params = {'year': 2026}
+        etag = self.get('all-slots-availability', params)['ETag']
+        with self.assertNumQueries(1):
+            response = self.revalidate('all-slots-availability', params, etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], etag)
+
+    def test_booking_changes_the_etag_of_its_year_only(self):
+        etag_2026 = self.get('all-slots-availability', {'year': 2026})['ETag']
+        etag_2027 = self.get('all-slots-availability', {'year': 2027})['ETag']
+        self.book(10, year=2026)
+        response = self.revalidate('all-slots-availability', {'year': 2026}, etag_2026)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag_2026)
+        self.assertEqual(self.revalidate('all-slots-availability', {'year': 2027}, etag_2027).status_code, 304)
+
+    def test_version_is_bumped_after_commit(self):
+        scope = bookings_year_scope(2026)
+        before = get_versions(scope)[scope]
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            Booking.objects.create(user=self.dg, region=self.region, year=2026, week=12)
+            self.assertEqual(get_versions(scope)[scope], before)
+        for callback in callbacks:
+            callback()
+        self.assertGreater(get_versions(scope)[scope], before)
+
+    def test_etag_depends_on_role(self):
+        params = {'region_id': self.region.pk, 'year': 2026}
+        etag = self.get('weeks-availability', params)['ETag']
+        admin = User.objects.create_user('admin@example.com', 'password123', is_admin=True)
+        self.client.force_authenticate(admin)
+        self.assertEqual(self.revalidate('weeks-availability', params, etag).status_code, 200)
+
+    def test_region_change_invalidates_region_list(self):
+        etag = self.get('region-list')['ETag']
+        self.assertEqual(self.revalidate('region-list', None, etag).status_code, 304)
+        with self.captureOnCommitCallbacks(execute=True):
+            Region.objects.create(name='Nouvel axe')
+        response = self.revalidate('region-list', None, etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('Nouvel axe', str(response.content, 'utf-8'))
+
+
+class BulkBookingTests(BookingAPITestCase):
+    def bulk(self, mode, *slots):
+        bookings = [{'region': region, 'year': year, 'week': week} for region, year, week in slots]
+        return self.post('booking-bulk', {'mode': mode, 'bookings': bookings})
+
+    def statuses(self, response):
+        return [result['status'] for result in response.json()['results']]
+
+    def test_all_or_nothing_creates_every_slot(self):
+        response = self.bulk('all_or_nothing', (self.region.pk, 2026, 1), (self.region.pk, 2026, 2))
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(self.statuses(response), ['created', 'created'])
+        self.assertEqual(Booking.objects.filter(user=self.dg).count(), 2)
+        self.assertEqual(UserRegionCount.regions_count(self.dg.pk), 1)
+
+    def test_all_or_nothing_rejects_the_whole_batch_on_conflict(self):
+        self.book(2)
+        response = self.bulk('all_or_nothing', (self.region.pk, 2026, 1), (self.region.pk, 2026, 2))
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(self.statuses(response), ['skipped', 'conflict'])
+        self.assertEqual(Booking.objects.count(), 1)
+
+    def test_best_effort_reports_each_slot(self):
+        self.book(2)
+        response = self.bulk(
+            'best_effort',
+            (self.region.pk, 2026, 1),
+            (self.region.pk, 2026, 2),
+            (self.region.pk, 2026, 1),
+            (self.region.pk, 2027, 53),
+            (0, 2026, 3),
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.statuses(response), ['created', 'conflict', 'conflict', 'invalid', 'invalid'])
+        self.assertEqual(response.json()['created'], 1)
+        self.assertEqual(response.json()['failed'], 4)
+        self.assertTrue(Booking.objects.filter(region=self.region, year=2026, week=1).exists())
+
+    def test_created_slots_reach_the_availability_index(self):
+        self.get('all-slots-availability', {'year': 2026})
+        with self.captureOnCommitCallbacks(execute=True):
+            self.bulk('best_effort', (self.region.pk, 2026, 4))
+        data = self.get('all-slots-availability', {'year': 2026, 'layout': 'matrix'}).json()
+        row = [region['id'] for region in data['regions']].index(self.region.pk)
+        self.assertEqual(data['booked'][row][3], '1')
+
+
+class CursorPaginationTests(BookingAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.admin = User.objects.create_user('admin@example.com', 'password123', is_admin=True)
+        for week in range(1, 8):
+            self.book(week)
+        # Ex æquo sur created_at : le curseur doit les départager sans doublon ni oubli
+        Booking.objects.filter(week__in=[3, 4, 5]).update(
+            created_at=Booking.objects.get(week=3).created_at
+        )
+
+    def walk(self, response):
+        ids = []
+        while True:
+            self.assertEqual(response.status_code, 200)
+            data = response.json()
+            self.assertNotIn('count', data)
+            ids.extend(row['id'] for row in data['results'])
+            if not data['next']:
+                return ids
+            response = self.client.get(data['next'], secure=True)
+
+    def expected_ids(self):
+        return list(Booking.objects.order_by('-created_at', '-id').values_list('id', flat=True))
+
+    def test_admin_pages_cover_every_booking_once(self):
+        self.client.force_authenticate(self.admin)
+        ids = self.walk(self.get('admin-bookings', {'page_size': 2}))
+        self.assertEqual(ids, self.expected_ids())
+
+    @override_settings(BOOKING_FAST_LISTS=True)
+    def test_values_rows_paginate_the_same_way(self):
+        self.client.force_authenticate(self.admin)
+        ids = self.walk(self.get('admin-bookings', {'page_size': 3}))
+        self.assertEqual(ids, self.expected_ids())
+
+    def test_page_reads_no_count(self):
+        self.client.force_authenticate(self.admin)
+        with CaptureQueriesContext(connection) as queries:
+            self.get('admin-bookings', {'page_size': 2})
+        self.assertFalse(any('COUNT(' in query['sql'].upper() for query in queries))
+
+    def test_dg_list_is_paginated_by_cursor(self):
+        other = User.objects.create_user('other@example.com', 'password123')
+        self.book(10, user=other)
+        ids = self.walk(self.get('booking-list', {'page_size': 4}))
+        self.assertEqual(ids, list(
+            Booking.objects.filter(user=self.dg).order_by('-created_at', '-id').values_list('id', flat=True)
+        ))
+
+    def test_invalid_cursor_is_rejected(self):
+        self.client.force_authenticate(self.admin)
+        self.assertEqual(self.get('admin-bookings', {'cursor': 'invalide'}).status_code, 404)
+
+
+class OccupancyReportTests(BookingAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.admin = User.objects.create_user('admin@example.com', 'password123', is_admin=True)
+        self.client.force_authenticate(self.admin)
+        self.book(1, year=2025)
+        self.book(1, year=2026)
+        self.book(53, year=2026)
+
+    def report(self, **params):
+        return self.get('admin-occupancy', {'year_from': 2025, 'year_to': 2026, **params}).json()
+
+    def test_matrix_counts_booked_years_per_slot(self):
+        data = self.report()
+        row = data['matrix'][[region['id'] for region in data['regions']].index(self.region.pk)]
+        self.assertEqual(row[0], 2)
+        self.assertEqual(row[52], 1)
+        self.assertEqual(sum(row), 3)
+        self.assertEqual(
+            [(entry['year'], entry['booked']) for entry in data['occupancy']], [(2025, 1), (2026, 2)]
+        )
+        self.assertEqual(data['top_dgs'][str(self.region.pk)], [{'user_email': 'dg@example.com', 'bookings': 3}])
+
+    def test_cached_years_are_reused_until_a_booking_changes(self):
+        self.report()
+        with CaptureQueriesContext(connection) as queries:
+            self.report()
+        self.assertFalse(any('bookings_booking' in query['sql'] for query in queries))
+        self.book(2, year=2026)
+        data = self.report()
+        self.assertEqual(data['occupancy'][1]['booked'], 3)
+
+
+class BookingEventsTests(TestCase):
+    def setUp(self):
+        self.dg = User.objects.create_user('dg@example.com', 'password123')
+        self.region = Region.objects.create(name='Axe de test')
+        self.factory = AsyncRequestFactory()
+
+    def ticket_for(self, user):
+        request = APIRequestFactory().post('/api/bookings/events/ticket/')
+        force_authenticate(request, user=user)
+        response = events_ticket(request)
+        self.assertEqual(response.status_code, 200)
+        return response.data['ticket']
+
+    async def open_stream(self, **params):
+        response = await booking_events(self.factory.get('/api/bookings/events/', {'year': 2026, **params}))
+        return response
+
+    def book(self, week):
+        with self.captureOnCommitCallbacks(execute=True):
+            return Booking.objects.create(user=self.dg, region=self.region, year=2026, week=week)
+
+    async def test_ticket_opens_the_stream(self):
+        ticket = await sync_to_async(self.ticket_for)(self.dg)
+        response = await self.open_stream(ticket=ticket)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        stream = aiter(response.streaming_content)
+        self.assertEqual(await anext(stream), b'retry: 5000\n\n')
+        await stream.aclose()
+
+    async def test_invalid_or_expired_ticket_is_rejected(self):
+        ticket = await sync_to_async(self.ticket_for)(self.dg)
+        response = await self.open_stream(ticket='invalid')
+        self.assertEqual(response.status_code, 401)
+        with mock.patch('django.core.signing.time.time', return_value=time.time() + 120):
+            response = await self.open_stream(ticket=ticket)
+        self.assertEqual(response.status_code, 401)
+
+    async def test_jwt_in_header_opens_the_stream(self):
+        token = await sync_to_async(AccessToken.for_user)(self.dg)
+        response = await booking_events(self.factory.get(
+            '/api/bookings/events/', {'year': 2026}, headers={'Authorization': f'Bearer {token}'}
+        ))
+        self.assertEqual(response.status_code, 200)
+
+    async def test_missing_year_is_rejected(self):
+        ticket = await sync_to_async(self.ticket_for)(self.dg)
+        response = await booking_events(self.factory.get('/api/bookings/events/', {'ticket': ticket}))
+        self.assertEqual(response.status_code, 400)
+
+    async def test_unstarted_stream_does_not_subscribe(self):
+        ticket = await sync_to_async(self.ticket_for)(self.dg)
+        before = event_hub.subscriber_count
+        await self.open_stream(ticket=ticket)
+        self.assertEqual(event_hub.subscriber_count, before)
+
+    async def test_booking_is_delivered_without_owner_to_dg(self):
+        ticket = await sync_to_async(self.ticket_for)(self.dg)
+        before = event_hub.subscriber_count
+        response = await self.open_stream(ticket=ticket)
+        stream = aiter(response.streaming_content)
+        await anext(stream)
+        self.assertEqual(event_hub.subscriber_count, before + 1)
+
+        booking = await sync_to_async(self.book)(10)
+        chunk = (await asyncio.wait_for(anext(stream), 1)).decode()
+        self.assertTrue(chunk.startswith('event: booking.created\n'))
+        self.assertIn(f'"id": {booking.pk}', chunk)
+        self.assertIn('"booked_by": null', chunk)
+
+        # Comme le gestionnaire ASGI en fin de requête : le générateur interne est finalisé par la boucle
+        await stream.aclose()
+        del stream, response
+        for _ in range(3):
+            await asyncio.sleep(0)
+        self.assertEqual(event_hub.subscriber_count, before)
@@ -1,6 +1,7 @@
+from django.conf import settings
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from . import views
+from . import async_views, views, events, feeds
 
 app_name = 'bookings'
 
@@ -8,13 +9,31 @@ router = DefaultRouter()
 router.register(r'regions', views.RegionViewSet, basename='region')
 router.register(r'bookings', views.BookingViewSet, basename='booking')
 
+# Vues de lecture asynchrones sous ASGI, vues DRF synchrones sous WSGI
+reads = async_views if settings.ASYNC_READ_VIEWS else views
+
 urlpatterns = [
-    path('', include(router.urls)),
-    path('coverage/my/', views.my_coverage, name='my-coverage'),
-    path('weeks/availability/', views.weeks_availability, name='weeks-availability'),
-    path('bookings/all-slots/', views.all_slots_availability, name='all-slots-availability'),
+    path('coverage/my/', reads.my_coverage, name='my-coverage'),
+    path('weeks/availability/', reads.weeks_availability, name='weeks-availability'),
+    path('bookings/all-slots/', reads.all_slots_availability, name='all-slots-availability'),
+    path('bookings/slots/range/', views.slots_range, name='slots-range'),
+    path('calendar/feeds/', feeds.calendar_feeds, name='calendar-feeds'),
+    path('calendar/feeds/rotate/', feeds.rotate_calendar_feeds, name='calendar-feeds-rotate'),
+    path('calendar/<str:token>.ics', feeds.calendar_feed, name='calendar-feed'),
     path('admin/bookings/', views.admin_bookings, name='admin-bookings'),
+    path('admin/bookings/export/', views.admin_bookings_export, name='admin-bookings-export'),
     path('admin/coverage/', views.admin_coverage, name='admin-coverage'),
+    path('admin/coverage/report/', views.admin_coverage_report, name='admin-coverage-report'),
+    path('admin/analytics/occupancy/', views.admin_occupancy, name='admin-occupancy'),
     path('admin/regions/availability/', views.admin_regions_availability, name='admin-regions-availability'),
+    # Le routeur en dernier : sa route de détail bookings/<pk>/ masquerait bookings/all-slots/
+    path('', include(router.urls)),
 ]
 
+# Flux SSE servi uniquement sous ASGI : sous WSGI, chaque connexion ouverte bloquerait un worker
+if settings.SERVER_PROFILE == 'asgi':
+    urlpatterns[:0] = [
+        path('bookings/events/', events.booking_events, name='booking-events'),
+        path('bookings/events/ticket/', events.events_ticket, name='booking-events-ticket'),
+    ]
+
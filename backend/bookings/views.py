@@ -2,20 +2,41 @@ from rest_framework import viewsets, status
 from rest_framework.decorators import action, api_view, permission_classes
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
-from django.core.mail import EmailMessage
+from asgiref.sync import sync_to_async
 from django.conf import settings
-from django.http import HttpResponse
+from django.core.exceptions import ValidationError
+from django.core.handlers.asgi import ASGIRequest
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from django.db.models.signals import post_save
+from django.http import HttpResponse, StreamingHttpResponse
+import csv
+import io
+import json
 
-from .models import Region, Booking
+from .models import Region, Booking, UserRegionCount
 from .serializers import (
     RegionSerializer,
     BookingSerializer,
     BookingListSerializer,
+    BookingBulkCreateSerializer,
+    BookingBulkItemSerializer,
     CoverageSerializer,
-    AvailabilitySerializer
+    AvailabilitySerializer,
+    booking_conflict_message,
+    booking_list_data,
+    booking_list_values
 )
 from core.permissions import IsAdmin, IsDG
-from core.utils import calculate_coverage_rate, generate_ics_file
+from core.throttles import BurstRateThrottle, SharedUserRateThrottle, SustainedRateThrottle
+from core.iso_calendar import is_supported_year, next_week, year_weeks
+from core.utils import coverage_rate, generate_ics_file, parse_iso_week
+from core.availability import availability_index
+from core.caching import tiered_cache
+from core.regions import region_catalog
+from core.pagination import BookingCursorPagination
+from core.etag import compute_etag, etag_matches, not_modified, with_etag
+from core.versioning import REGIONS_SCOPE, bookings_year_scope, get_versions
 from accounts.models import User
 
 
@@ -24,12 +45,29 @@ class RegionViewSet(viewsets.ReadOnlyModelViewSet):
     queryset = Region.objects.all()
     serializer_class = RegionSerializer
     permission_classes = [IsAuthenticated]
+    
+    def list(self, request, *args, **kwargs):
+        """Liste des régions avec ETag (304 si le catalogue n'a pas changé)."""
+        versions = get_versions(REGIONS_SCOPE)
+        self._regions_version = versions[REGIONS_SCOPE]
+        etag = compute_etag(request, versions)
+        if etag_matches(request, etag):
+            return not_modified(etag)
+        # Lue depuis le catalogue des régions en mémoire, même pagination
+        regions = region_catalog.snapshot(self._regions_version).as_list()
+        page = self.paginate_queryset(regions)
+        if page is not None:
+            return with_etag(self.get_paginated_response(page), etag)
+        return with_etag(Response(regions), etag)
 
 
 class BookingViewSet(viewsets.ModelViewSet):
     """ViewSet pour les réservations."""
     serializer_class = BookingSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = BookingCursorPagination
+    # Limites propres aux réservations, en plus de la limite 'user' par défaut
+    throttle_classes = [SharedUserRateThrottle, BurstRateThrottle, SustainedRateThrottle]
     
     def get_queryset(self):
         """Filtre les réservations selon le rôle de l'utilisateur."""
@@ -48,6 +86,14 @@ class BookingViewSet(viewsets.ModelViewSet):
             return BookingListSerializer
         return BookingSerializer
     
+    def list(self, request, *args, **kwargs):
+        """Liste paginée ; lignes values() sérialisées directement si BOOKING_FAST_LISTS."""
+        if not getattr(settings, 'BOOKING_FAST_LISTS', False):
+            return super().list(request, *args, **kwargs)
+        
+        page = self.paginate_queryset(booking_list_values(self.filter_queryset(self.get_queryset())))
+        return self.get_paginated_response(booking_list_data(page))
+    
     def perform_create(self, serializer):
         """Override pour définir l'utilisateur automatiquement."""
         user = self.request.user
@@ -82,6 +128,128 @@ class BookingViewSet(viewsets.ModelViewSet):
 
 
     
+    @action(detail=False, methods=['post'], permission_classes=[IsDG])
+    def bulk(self, request):
+        """
+        Création groupée de réservations en une seule transaction.
+        POST /api/bookings/bulk/
+        Body: {"mode": "all_or_nothing" | "best_effort",
+               "bookings": [{"region": 1, "year": 2026, "week": 10}, ...]}
+        
+        Les conflits sont vérifiés en une seule requête, les créneaux libres insérés
+        avec bulk_create. Chaque élément reçoit un statut : created, conflict,
+        invalid ou skipped (mode all_or_nothing, lot refusé).
+        """
+        serializer = BookingBulkCreateSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        mode = serializer.validated_data['mode']
+        items = serializer.validated_data['bookings']
+        
+        results = [None] * len(items)
+        candidates = []
+        for index, raw_item in enumerate(items):
+            item = BookingBulkItemSerializer(data=raw_item)
+            if item.is_valid():
+                data = item.validated_data
+                candidates.append((index, (data['region'], data['year'], data['week'])))
+            else:
+                results[index] = {'index': index, 'status': 'invalid', 'errors': item.errors}
+        
+        regions = region_catalog.snapshot()
+        
+        # Une seule requête pour tous les conflits (sur-ensemble filtré en mémoire)
+        existing = set(
+            Booking.objects.filter(
+                region_id__in={slot[0] for _, slot in candidates},
+                year__in={slot[1] for _, slot in candidates},
+                week__in={slot[2] for _, slot in candidates},
+            ).values_list('region_id', 'year', 'week')
+        ) if candidates else set()
+        
+        winners = []
+        requested = set()
+        for index, (region_id, year, week) in candidates:
+            region = regions.get(region_id)
+            if region is None:
+                results[index] = {'index': index, 'status': 'invalid', 'errors': {'region': ['Axe introuvable.']}}
+            elif (region_id, year, week) in existing or (region_id, year, week) in requested:
+                results[index] = {
+                    'index': index, 'status': 'conflict',
+                    'error': booking_conflict_message(region, year, week),
+                }
+            else:
+                requested.add((region_id, year, week))
+                winners.append((index, Booking(user=request.user, region_id=region_id, year=year, week=week)))
+        
+        if mode == BookingBulkCreateSerializer.ALL_OR_NOTHING:
+            if any(result is not None for result in results):
+                return self._bulk_rejected(mode, results, winners)
+            try:
+                with transaction.atomic():
+                    self._bulk_insert([booking for _, booking in winners])
+            except IntegrityError:
+                # Créneau pris par une écriture concurrente entre la vérification et l'insertion
+                return self._bulk_rejected(
+                    mode, results, winners,
+                    error="Un des créneaux vient d'être réservé. Aucune réservation créée."
+                )
+        else:
+            try:
+                with transaction.atomic():
+                    self._bulk_insert([booking for _, booking in winners])
+            except IntegrityError:
+                # Course avec une écriture concurrente : insertion élément par élément
+                for index, booking in list(winners):
+                    try:
+                        with transaction.atomic():
+                            booking.pk = None
+                            booking.save()
+                    except (IntegrityError, ValidationError):
+                        winners.remove((index, booking))
+                        results[index] = {
+                            'index': index, 'status': 'conflict',
+                            'error': booking_conflict_message(
+                                regions.get(booking.region_id), booking.year, booking.week
+                            ),
+                        }
+        
+        # Axes des réservations créées en une requête (région du catalogue pour le nom seulement)
+        created_regions = Region.objects.in_bulk({booking.region_id for _, booking in winners})
+        for index, booking in winners:
+            booking.region = created_regions[booking.region_id]
+            results[index] = {'index': index, 'status': 'created', 'booking': BookingSerializer(booking).data}
+        
+        response_status = status.HTTP_201_CREATED if len(winners) == len(items) else status.HTTP_200_OK
+        return Response(self._bulk_payload(mode, results), status=response_status)
+    
+    @staticmethod
+    def _bulk_insert(bookings):
+        """Insère les réservations et émet post_save (ignoré par bulk_create)."""
+        Booking.objects.bulk_create(bookings)
+        for booking in bookings:
+            post_save.send(
+                sender=Booking, instance=booking, created=True,
+                raw=False, using=booking._state.db, update_fields=None
+            )
+    
+    @staticmethod
+    def _bulk_payload(mode, results):
+        return {
+            'mode': mode,
+            'created': sum(1 for result in results if result['status'] == 'created'),
+            'failed': sum(1 for result in results if result['status'] in ('conflict', 'invalid')),
+            'results': results,
+        }
+    
+    def _bulk_rejected(self, mode, results, winners, error=None):
+        """Lot refusé (all_or_nothing) : les créneaux libres sont marqués skipped."""
+        for index, booking in winners:
+            results[index] = {'index': index, 'status': 'skipped'}
+        payload = self._bulk_payload(mode, results)
+        if error:
+            payload['error'] = error
+        return Response(payload, status=status.HTTP_409_CONFLICT)
+    
     @action(detail=False, methods=['get'], permission_classes=[IsDG])
     def my(self, request):
         """
@@ -109,24 +277,27 @@ class BookingViewSet(viewsets.ModelViewSet):
             )
         
         try:
-            region = Region.objects.get(pk=region_id)
+            region = region_catalog.snapshot().get(int(region_id))
             year = int(year)
             week = int(week)
-        except (Region.DoesNotExist, ValueError):
+        except ValueError:
+            region = None
+        if region is None:
             return Response(
                 {'error': 'Paramètres invalides.'},
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        # Vérifier si la région est déjà réservée
-        # Utilise l'index composé (region, year, week) pour une requête optimale
-        booking = Booking.objects.filter(
-            region=region,
-            year=year,
-            week=week
-        ).select_related('user').only('user__email').first()
+        if not is_supported_year(year):
+            return Response(
+                {'error': 'L\'année doit être entre 2000 et 2100.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
         
-        is_available = booking is None
+        # Vérifier si la région est déjà réservée (index de disponibilité en mémoire)
+        scope = bookings_year_scope(year)
+        booked_by = availability_index.year(year, get_versions(scope)[scope]).booked_by(region.id, week)
+        is_available = booked_by is None
         
         data = {
             'region_id': region.id,
@@ -137,8 +308,8 @@ class BookingViewSet(viewsets.ModelViewSet):
         }
         
         # Si admin, montrer qui a réservé
-        if request.user.is_admin and booking:
-            data['booked_by'] = booking.user.email
+        if request.user.is_admin and not is_available:
+            data['booked_by'] = booked_by
         elif not is_available:
             # Pour les DG, juste indiquer que c'est réservé
             data['booked_by'] = None
@@ -163,19 +334,24 @@ def my_coverage(request):
             status=status.HTTP_403_FORBIDDEN
         )
     
-    distinct_regions_count = Booking.objects.filter(user=user).values_list('region', flat=True).distinct().count()
-    total_regions = getattr(settings, 'TOTAL_REGIONS',7)
-    coverage_rate = calculate_coverage_rate(user)
+    def compute():
+        # Une seule lecture des compteurs de couverture tenus à jour par les signaux
+        return _coverage_payload(user, UserRegionCount.regions_count(user.pk), region_catalog.snapshot().count)
     
+    # En cache par utilisateur (version incrémentée par les signaux de Booking et User,
+    # espace invalidé par ceux de Region)
+    return Response(tiered_cache.get_or_set('coverage', UserRegionCount.coverage_cache_key(user.pk), compute))
+
+
+def _coverage_payload(user, distinct_regions_count, total_regions):
+    """Corps de réponse de my_coverage (vue synchrone et vue asynchrone)."""
     data = {
         'user_email': user.email,
         'distinct_regions_count': distinct_regions_count,
         'total_regions': total_regions,
-        'coverage_rate': coverage_rate
+        'coverage_rate': coverage_rate(distinct_regions_count, total_regions)
     }
-    
-    serializer = CoverageSerializer(data)
-    return Response(serializer.data)
+    return CoverageSerializer(data).data
 
 
 @api_view(['GET'])
@@ -185,53 +361,70 @@ def weeks_availability(request):
     Endpoint pour voir les semaines disponibles pour une région et une année.
     GET /api/weeks/availability/?region_id=1&year=2024
     
-    Retourne toutes les semaines (1-53) avec leur statut :
+    Retourne toutes les semaines de l'année (52 ou 53) avec leur statut :
     - is_available: true (vert) si disponible, false (rouge) si réservé
     - booked_by: null pour les DG, email pour les admins
+    
+    Supporte If-None-Match : 304 tant que les réservations de l'année et le
+    catalogue des axes n'ont pas changé.
     """
-    region_id = request.query_params.get('region_id')
-    year = request.query_params.get('year')
+    region_id, year, error = _weeks_params(request.query_params)
+    if error:
+        return Response({'error': error}, status=status.HTTP_400_BAD_REQUEST)
     
-    if not all([region_id, year]):
-        return Response(
-            {'error': 'Les paramètres region_id et year sont requis.'},
-            status=status.HTTP_400_BAD_REQUEST
-        )
+    # Requête conditionnelle : 304 avant toute lecture des régions et réservations
+    versions = get_versions(bookings_year_scope(year), REGIONS_SCOPE)
+    etag = compute_etag(request, versions)
+    if etag_matches(request, etag):
+        return not_modified(etag)
     
-    try:
-        region = Region.objects.get(pk=region_id)
-        year = int(year)
-    except (Region.DoesNotExist, ValueError):
+    region = region_catalog.snapshot(versions[REGIONS_SCOPE]).get(region_id)
+    if region is None:
         return Response(
             {'error': 'Paramètres invalides.'},
             status=status.HTTP_400_BAD_REQUEST
         )
     
-    # Récupérer toutes les semaines réservées pour cette région et cette année
-    # Utilise l'index sur (region, year, week) pour une requête optimale
-    booked_weeks = set(
-        Booking.objects.filter(region=region, year=year)
-        .values_list('week', flat=True)
-        .order_by('week')  # Utilise l'index
-    )
+    # Semaines réservées et auteurs, lus depuis l'index de disponibilité en mémoire
+    year_availability = availability_index.year(year, versions[bookings_year_scope(year)])
     
-    # Si admin, récupérer les emails des réservations en une seule requête
-    bookings_dict = {}
-    if request.user.is_admin:
-        bookings_dict = {
-            booking.week: booking.user.email
-            for booking in Booking.objects.filter(
-                region=region, year=year
-            ).select_related('user').only('week', 'user__email')
-        }
+    return with_etag(Response(_weeks_payload(region, year, year_availability, request.user.is_admin)), etag)
+
+
+def _weeks_params(params):
+    """
+    Valide les paramètres region_id et year de weeks_availability.
     
-    # Générer toutes les semaines ISO possibles (1-53)
-    all_weeks = list(range(1, 54))
+    Returns:
+        tuple: (region_id, year, message d'erreur ou None)
+    """
+    region_id = params.get('region_id')
+    year = params.get('year')
+    
+    if not all([region_id, year]):
+        return None, None, 'Les paramètres region_id et year sont requis.'
+    
+    try:
+        region_id = int(region_id)
+        year = int(year)
+    except ValueError:
+        return None, None, 'Paramètres invalides.'
+    
+    if not is_supported_year(year):
+        return None, None, 'L\'année doit être entre 2000 et 2100.'
+    
+    return region_id, year, None
+
+
+def _weeks_payload(region, year, year_availability, is_admin):
+    """Corps de réponse de weeks_availability (vue synchrone et vue asynchrone)."""
+    # Semaines ISO réelles de l'année (52 ou 53), depuis la table précalculée
+    all_weeks = year_weeks(year)
     
     # Créer la liste de disponibilité
     availability = []
     for week in all_weeks:
-        is_available = week not in booked_weeks
+        is_available = not year_availability.is_booked(region.id, week)
         
         week_data = {
             'week': week,
@@ -239,20 +432,20 @@ def weeks_availability(request):
         }
         
         # Si admin, montrer qui a réservé
-        if request.user.is_admin and not is_available:
-            week_data['booked_by'] = bookings_dict.get(week)
+        if is_admin and not is_available:
+            week_data['booked_by'] = year_availability.booked_by(region.id, week)
         else:
             # Pour les DG, booked_by est null (confidentialité préservée)
             week_data['booked_by'] = None
         
         availability.append(week_data)
     
-    return Response({
+    return {
         'region_id': region.id,
         'region_name': region.name,
         'year': year,
         'weeks': availability
-    })
+    }
 
 
 @api_view(['GET'])
@@ -269,51 +462,72 @@ def all_slots_availability(request):
     - year, week
     - is_available: true (vert) si disponible, false (rouge) si réservé
     - booked_by: null pour les DG, email pour les admins
+    
+    GET /api/bookings/all-slots/?year=2024&layout=matrix
+    
+    Retourne une matrice compacte (voir _slot_matrix).
+    
+    Supporte If-None-Match : 304 tant que les réservations de l'année et le
+    catalogue des axes n'ont pas changé.
     """
-    year = request.query_params.get('year')
+    year, error = _slots_year(request.query_params)
+    if error:
+        return Response({'error': error}, status=status.HTTP_400_BAD_REQUEST)
+    
+    # Requête conditionnelle : 304 avant toute lecture des régions et réservations
+    versions = get_versions(bookings_year_scope(year), REGIONS_SCOPE)
+    etag = compute_etag(request, versions)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    
+    # Toutes les régions, triées par nom, depuis le catalogue en mémoire
+    regions = region_catalog.snapshot(versions[REGIONS_SCOPE])
+    
+    # Créneaux réservés de l'année, lus depuis l'index de disponibilité en mémoire
+    year_availability = availability_index.year(year, versions[bookings_year_scope(year)])
+    
+    return with_etag(Response(_slots_payload(
+        year, regions, year_availability, request.user.is_admin, request.query_params.get('layout')
+    )), etag)
+
+
+def _slots_year(params):
+    """
+    Valide le paramètre year de all_slots_availability.
+    
+    Returns:
+        tuple: (year, message d'erreur ou None)
+    """
+    year = params.get('year')
     
     if not year:
-        return Response(
-            {'error': 'Le paramètre year est requis.'},
-            status=status.HTTP_400_BAD_REQUEST
-        )
+        return None, 'Le paramètre year est requis.'
     
     try:
         year = int(year)
     except ValueError:
-        return Response(
-            {'error': 'L\'année doit être un nombre valide.'},
-            status=status.HTTP_400_BAD_REQUEST
-        )
+        return None, 'L\'année doit être un nombre valide.'
     
-    # Récupérer toutes les régions
-    regions = Region.objects.all().only('id', 'name').order_by('name')
-    
-    # Récupérer toutes les réservations pour cette année en une seule requête optimisée
-    # Créer un dictionnaire: (region_id, week) -> user_email
-    bookings_dict = {}
-    if request.user.is_admin:
-        # Pour les admins, récupérer les emails
-        for booking in Booking.objects.filter(year=year).select_related('user', 'region').only(
-            'region_id', 'week', 'user__email'
-        ):
-            bookings_dict[(booking.region_id, booking.week)] = booking.user.email
-    else:
-        # Pour les DG, juste vérifier si réservé (sans email)
-        booked_slots = set(
-            Booking.objects.filter(year=year).values_list('region_id', 'week')
-        )
-        bookings_dict = {slot: None for slot in booked_slots}
+    if not is_supported_year(year):
+        return None, 'L\'année doit être entre 2000 et 2100.'
+    
+    return year, None
+
+
+def _slots_payload(year, regions, year_availability, is_admin, layout=None):
+    """Corps de réponse de all_slots_availability (vue synchrone et vue asynchrone)."""
+    # Semaines ISO réelles de l'année (52 ou 53), depuis la table précalculée
+    all_weeks = list(year_weeks(year))
     
-    # Générer toutes les semaines ISO (1-53)
-    all_weeks = list(range(1, 54))
+    # Représentation compacte sur demande, sans passer par le serializer
+    if layout == 'matrix':
+        return _slot_matrix(year, regions, all_weeks, year_availability, is_admin)
     
     # Créer la liste complète de tous les créneaux
     all_slots = []
     for region in regions:
         for week in all_weeks:
-            slot_key = (region.id, week)
-            is_available = slot_key not in bookings_dict
+            is_available = not year_availability.is_booked(region.id, week)
             
             slot_data = {
                 'region_id': region.id,
@@ -323,9 +537,9 @@ def all_slots_availability(request):
                 'is_available': is_available,  # false = rouge (réservé), true = vert (disponible)
             }
             
-            if request.user.is_admin and not is_available:
+            if is_admin and not is_available:
                 # Admin voit qui a réservé
-                slot_data['booked_by'] = bookings_dict.get(slot_key)
+                slot_data['booked_by'] = year_availability.booked_by(region.id, week)
             else:
                 # DG ne voit pas qui a réservé (confidentialité)
                 slot_data['booked_by'] = None
@@ -333,13 +547,171 @@ def all_slots_availability(request):
             all_slots.append(slot_data)
     
     serializer = AvailabilitySerializer(all_slots, many=True)
-    return Response({
+    return {
         'year': year,
         'total_regions': len(regions),
         'total_weeks': len(all_weeks),
         'total_slots': len(all_slots),
         'slots': serializer.data
-    })
+    }
+
+
+def _slot_matrix(year, regions, weeks, year_availability, include_owners):
+    """
+    Construit la représentation matricielle de la grille des créneaux.
+    
+    - regions: en-têtes des lignes [{id, name}]
+    - weeks: axe des colonnes
+    - booked: une chaîne par région, '1' = réservé (rouge), '0' = disponible (vert)
+    - booked_by: {region_id: {week: email}} pour les admins uniquement, sinon null
+    """
+    matrix = {
+        'year': year,
+        'layout': 'matrix',
+        'regions': [{'id': region.id, 'name': region.name} for region in regions],
+        'weeks': weeks,
+        'booked': [year_availability.bitstring(region.id, weeks) for region in regions],
+        'booked_by': None,
+    }
+    
+    if include_owners:
+        booked_by = {}
+        # Copie sur écriture (core/availability.py) : parcours sans verrou
+        for (region_id, week), email in year_availability.owners.items():
+            booked_by.setdefault(str(region_id), {})[str(week)] = email
+        matrix['booked_by'] = booked_by
+    
+    return matrix
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def slots_range(request):
+    """
+    Endpoint pour voir tous les créneaux sur une plage de semaines ISO, éventuellement
+    sur plusieurs années.
+    
+    GET /api/bookings/slots/range/?from=2026-W40&to=2027-W20
+    
+    La réponse (même format de créneau que all-slots) est produite au fil de l'eau :
+    une seule requête ordonnée sur l'index (year, week) est parcourue par blocs et
+    fusionnée avec l'axe des semaines, la mémoire reste constante quelle que soit
+    la largeur de la plage.
+    """
+    try:
+        start = parse_iso_week(request.query_params.get('from'))
+        end = parse_iso_week(request.query_params.get('to'))
+    except ValueError:
+        return Response(
+            {'error': 'Les paramètres from et to sont requis au format AAAA-Www (ex: 2026-W40).'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    
+    if start > end:
+        return Response(
+            {'error': 'Le paramètre from doit précéder le paramètre to.'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    
+    regions = list(region_catalog.snapshot())
+    
+    # Une seule requête sur l'index (year, week), bornée aux deux extrémités
+    (start_year, start_week), (end_year, end_week) = start, end
+    if start_year == end_year:
+        slot_filter = Q(year=start_year, week__gte=start_week, week__lte=end_week)
+    else:
+        slot_filter = (
+            Q(year=start_year, week__gte=start_week)
+            | Q(year__gt=start_year, year__lt=end_year)
+            | Q(year=end_year, week__lte=end_week)
+        )
+    bookings = (
+        Booking.objects.filter(slot_filter)
+        .order_by('year', 'week')
+        .values_list('year', 'week', 'region_id', 'user__email')
+        .iterator(chunk_size=2000)
+    )
+    
+    response = _streaming_response(
+        request, _stream_slots_range(start, end, regions, bookings, request.user.is_admin),
+        content_type='application/json'
+    )
+    response['Cache-Control'] = 'private, no-cache'
+    return response
+
+
+def _streaming_response(request, chunks, content_type):
+    """
+    Réponse produite au fil de l'eau à partir d'un générateur synchrone.
+    
+    Sous ASGI, StreamingHttpResponse chargerait un itérateur synchrone en
+    entier (liste) avant d'envoyer le premier octet : il est alors parcouru
+    morceau par morceau depuis la boucle asyncio (_aiter_chunks).
+    """
+    if isinstance(request._request, ASGIRequest):
+        chunks = _aiter_chunks(chunks)
+    return StreamingHttpResponse(chunks, content_type=content_type)
+
+
+async def _aiter_chunks(chunks):
+    """
+    Itérateur asynchrone sur un générateur synchrone qui lit la base par blocs.
+    
+    Chaque morceau est produit par sync_to_async (thread_sensitive) : même
+    thread, donc même connexion et même curseur, que la vue synchrone.
+    """
+    next_chunk = sync_to_async(next)
+    try:
+        while (chunk := await next_chunk(chunks, None)) is not None:
+            yield chunk
+    finally:
+        # Client déconnecté : le curseur serveur est fermé avec le générateur
+        await sync_to_async(chunks.close)()
+
+
+def _stream_slots_range(start, end, regions, bookings, include_owners):
+    """
+    Génère le document JSON de la plage, une semaine (toutes régions) par morceau.
+    
+    Les réservations arrivent triées par (year, week) : seules celles de la semaine
+    en cours sont conservées en mémoire.
+    """
+    yield json.dumps({
+        'from': '%d-W%02d' % start,
+        'to': '%d-W%02d' % end,
+        'total_regions': len(regions),
+    })[:-1] + ', "slots": ['
+    
+    pending = next(bookings, None)
+    first = True
+    year, week = start
+    while (year, week) <= end:
+        # Réservations de la semaine courante : {region_id: email}
+        week_owners = {}
+        while pending is not None and pending[:2] < (year, week):
+            pending = next(bookings, None)
+        while pending is not None and pending[:2] == (year, week):
+            week_owners[pending[2]] = pending[3]
+            pending = next(bookings, None)
+        
+        chunk = []
+        for region_id, region_name in regions:
+            is_available = region_id not in week_owners
+            chunk.append(json.dumps({
+                'region_id': region_id,
+                'region_name': region_name,
+                'year': year,
+                'week': week,
+                'is_available': is_available,
+                'booked_by': week_owners[region_id] if include_owners and not is_available else None,
+            }))
+        if chunk:
+            yield ('' if first else ',') + ','.join(chunk)
+            first = False
+        
+        year, week = next_week(year, week)
+    
+    yield ']}'
 
 
 # ============ ENDPOINTS ADMIN ============
@@ -348,18 +720,113 @@ def all_slots_availability(request):
 @permission_classes([IsAdmin])
 def admin_bookings(request):
     """
-    Endpoint admin pour voir toutes les réservations.
-    GET /api/admin/bookings/
+    Endpoint admin pour voir toutes les réservations, paginées par curseur.
+    GET /api/admin/bookings/?page_size=100&cursor=<curseur>
+    
+    Retourne {next, previous, results} ; suivre le lien next pour la page suivante.
     """
+    # Le tri (-created_at, -id) est imposé par la pagination (index sur created_at)
+    paginator = BookingCursorPagination()
+    
+    if getattr(settings, 'BOOKING_FAST_LISTS', False):
+        # Lignes values() avec email et région joints en SQL, sans instances
+        page = paginator.paginate_queryset(booking_list_values(Booking.objects.all()), request)
+        return paginator.get_paginated_response(booking_list_data(page))
+    
     # Optimisation : select_related pour éviter N+1 queries
-    # Utilise l'index sur created_at pour le tri
     bookings = Booking.objects.select_related('user', 'region').only(
         'id', 'year', 'week', 'created_at',
         'user__email',
         'region__name'
-    ).order_by('-created_at')
-    serializer = BookingListSerializer(bookings, many=True)
-    return Response(serializer.data)
+    )
+    page = paginator.paginate_queryset(bookings, request)
+    serializer = BookingListSerializer(page, many=True)
+    return paginator.get_paginated_response(serializer.data)
+
+
+# Nombre de lignes lues par aller-retour et écrites par morceau de l'export
+EXPORT_CHUNK_SIZE = 2000
+
+
+@api_view(['GET'])
+@permission_classes([IsAdmin])
+def admin_bookings_export(request):
+    """
+    Endpoint admin d'export des réservations, produit au fil de l'eau.
+    GET /api/admin/bookings/export/?fmt=csv|ndjson&year=2026&region_id=1&user=email@example.com
+    
+    Les lignes sont lues par blocs (values_list + iterator) et écrites morceau
+    par morceau : la mémoire reste constante quelle que soit la taille de l'historique.
+    """
+    export_format = request.query_params.get('fmt', 'csv')
+    if export_format not in ('csv', 'ndjson'):
+        return Response(
+            {'error': 'Le paramètre fmt doit valoir csv ou ndjson.'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    
+    bookings = Booking.objects.all()
+    try:
+        if request.query_params.get('year'):
+            bookings = bookings.filter(year=int(request.query_params['year']))
+        if request.query_params.get('region_id'):
+            bookings = bookings.filter(region_id=int(request.query_params['region_id']))
+    except ValueError:
+        return Response(
+            {'error': 'Paramètres invalides.'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    if request.query_params.get('user'):
+        bookings = bookings.filter(user__email__iexact=request.query_params['user'])
+    
+    rows = bookings.order_by('-created_at', '-id').values_list(
+        'id', 'user__email', 'region__name', 'year', 'week', 'created_at'
+    ).iterator(chunk_size=EXPORT_CHUNK_SIZE)
+    
+    # Sous ASGI, parcouru morceau par morceau depuis la boucle asyncio (voir _streaming_response)
+    if export_format == 'csv':
+        response = _streaming_response(request, _export_csv(rows), content_type='text/csv')
+        response['Content-Disposition'] = 'attachment; filename="reservations.csv"'
+    else:
+        response = _streaming_response(request, _export_ndjson(rows), content_type='application/x-ndjson')
+        response['Content-Disposition'] = 'attachment; filename="reservations.ndjson"'
+    return response
+
+
+def _export_csv(rows):
+    """Génère le CSV (mêmes colonnes que l'export de l'admin Django) par morceaux."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(['Email', 'Région', 'Année', 'Semaine ISO', 'Date de création'])
+    
+    for count, (_, email, region_name, year, week, created_at) in enumerate(rows, start=1):
+        writer.writerow([email, region_name, year, week, created_at.strftime('%Y-%m-%d %H:%M:%S')])
+        if count % EXPORT_CHUNK_SIZE == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    
+    yield buffer.getvalue()
+
+
+def _export_ndjson(rows):
+    """Génère une réservation JSON par ligne, par morceaux."""
+    lines = []
+    for booking_id, email, region_name, year, week, created_at in rows:
+        lines.append(json.dumps({
+            'id': booking_id,
+            'user_email': email,
+            'region_name': region_name,
+            'year': year,
+            'week': week,
+            'created_at': created_at.isoformat(),
+        }, ensure_ascii=False))
+        if len(lines) == EXPORT_CHUNK_SIZE:
+            yield '\n'.join(lines) + '\n'
+            lines = []
+    
+    if lines:
+        yield '\n'.join(lines) + '\n'
 
 
 @api_view(['GET'])
@@ -369,7 +836,8 @@ def admin_coverage(request):
     Endpoint admin pour voir le taux de couverture de tous les utilisateurs.
     GET /api/admin/coverage/
     """
-    # Optimisation : utiliser une seule requête avec annotation pour éviter N+1
+    # Optimisation : une seule requête sur les totaux de couverture (une ligne par
+    # utilisateur et par région couverte) au lieu d'un COUNT(DISTINCT) sur les réservations
     from django.db.models import Count
     
     # Récupérer tous les utilisateurs non-admin avec le nombre de régions distinctes
@@ -377,26 +845,174 @@ def admin_coverage(request):
         is_admin=False, 
         is_active=True
     ).annotate(
-        distinct_regions_count=Count('bookings__region', distinct=True)
+        distinct_regions_count=Count('region_totals')
     ).only('email')
     
-    total_regions = getattr(settings, 'TOTAL_REGIONS', 7)
+    total_regions = region_catalog.snapshot().count
     
     coverage_data = []
     for user in users:
-        coverage_rate = round((user.distinct_regions_count / total_regions) * 100, 2) if total_regions > 0 else 0.0
-        
         coverage_data.append({
             'user_email': user.email,
             'distinct_regions_count': user.distinct_regions_count,
             'total_regions': total_regions,
-            'coverage_rate': coverage_rate
+            'coverage_rate': coverage_rate(user.distinct_regions_count, total_regions)
         })
     
     serializer = CoverageSerializer(coverage_data, many=True)
     return Response(serializer.data)
 
 
+def _year_range(params):
+    """
+    Lit la période ?year= ou ?year_from=&year_to= (bornes facultatives).
+    
+    Returns:
+        tuple: (year_from, year_to, réponse 400 ou None)
+    """
+    def bad_request(message):
+        return None, None, Response({'error': message}, status=status.HTTP_400_BAD_REQUEST)
+    
+    try:
+        year = int(params['year']) if params.get('year') else None
+        year_from = int(params['year_from']) if params.get('year_from') else year
+        year_to = int(params['year_to']) if params.get('year_to') else year
+    except ValueError:
+        return bad_request('Les paramètres year, year_from et year_to doivent être des entiers.')
+    
+    for value in (year_from, year_to):
+        if value is not None and not is_supported_year(value):
+            return bad_request("L'année doit être entre 2000 et 2100.")
+    if year_from is not None and year_to is not None and year_from > year_to:
+        return bad_request('year_from doit être inférieur ou égal à year_to.')
+    return year_from, year_to, None
+
+
+# Tris proposés par le rapport de couverture : paramètre -> (champ, décroissant)
+COVERAGE_REPORT_ORDERINGS = {
+    '-coverage': ('distinct_regions_count', True),
+    'coverage': ('distinct_regions_count', False),
+    'email': ('email', False),
+    '-email': ('email', True),
+}
+
+
+@api_view(['GET'])
+@permission_classes([IsAdmin])
+def admin_coverage_report(request):
+    """
+    Endpoint admin : rapport de couverture paginé, triable et limité à une période.
+    GET /api/admin/coverage/report/?year=2026
+    GET /api/admin/coverage/report/?year_from=2024&year_to=2026&ordering=-coverage&page_size=100
+    
+    - ordering : -coverage (défaut), coverage, email, -email
+    - pagination par curseur (lien « next »), sans COUNT(*) ni OFFSET
+    - total_regions : nombre réel d'axes (catalogue des régions en mémoire)
+    """
+    from django.db.models import Count, F, FloatField, Value
+    from django.db.models.functions import Cast, Round
+    from core.pagination import KeysetPagination
+    
+    params = request.query_params
+    year_from, year_to, error = _year_range(params)
+    if error:
+        return error
+    
+    ordering = params.get('ordering', '-coverage')
+    if ordering not in COVERAGE_REPORT_ORDERINGS:
+        return Response(
+            {'error': f"Tri invalide. Valeurs possibles : {', '.join(COVERAGE_REPORT_ORDERINGS)}."},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    field, descending = COVERAGE_REPORT_ORDERINGS[ordering]
+    
+    # Compteurs de la période uniquement (index count_year_user_idx) ; sans
+    # période, les totaux toutes années (une ligne par région, sans DISTINCT)
+    period = Q()
+    if year_from is not None:
+        period &= Q(region_counts__year__gte=year_from)
+    if year_to is not None:
+        period &= Q(region_counts__year__lte=year_to)
+    if period:
+        regions_covered = Count('region_counts__region', distinct=True, filter=period)
+    else:
+        regions_covered = Count('region_totals')
+    
+    total_regions = region_catalog.snapshot().count
+    if total_regions:
+        rate = Round(Cast(F('distinct_regions_count'), FloatField()) * 100.0 / total_regions, 2)
+    else:
+        rate = Value(0.0, output_field=FloatField())
+    
+    # Agrégation, calcul du taux et tri faits par la base
+    rows = User.objects.filter(
+        is_admin=False,
+        is_active=True
+    ).values('id', 'email').annotate(
+        distinct_regions_count=regions_covered,
+        coverage_rate=rate,
+    )
+    
+    paginator = KeysetPagination()
+    page = paginator.paginate_queryset(rows, request, field=field, descending=descending)
+    results = [
+        {
+            'user_email': row['email'],
+            'distinct_regions_count': row['distinct_regions_count'],
+            'total_regions': total_regions,
+            'coverage_rate': row['coverage_rate'],
+        }
+        for row in page
+    ]
+    return paginator.get_paginated_response(
+        CoverageSerializer(results, many=True).data,
+        year_from=year_from,
+        year_to=year_to,
+        total_regions=total_regions,
+    )
+
+
+@api_view(['GET'])
+@permission_classes([IsAdmin])
+def admin_occupancy(request):
+    """
+    Endpoint admin : occupation des créneaux axe × semaine sur une période.
+    GET /api/admin/analytics/occupancy/?year=2026
+    GET /api/admin/analytics/occupancy/?year_from=2024&year_to=2026&top=5
+    
+    Retourne la matrice région × semaine (nombre d'années où le créneau est
+    réservé), l'occupation par année et les DG les plus actifs par région.
+    Sans période, l'année ISO en cours est utilisée.
+    """
+    from datetime import date
+    from .analytics import occupancy_report
+    
+    year_from, year_to, error = _year_range(request.query_params)
+    if error:
+        return error
+    current_year = date.today().isocalendar()[0]
+    year_from = year_from or year_to or current_year
+    year_to = year_to or year_from
+    
+    max_years = getattr(settings, 'OCCUPANCY_MAX_YEARS', 30)
+    if year_to - year_from + 1 > max_years:
+        return Response(
+            {'error': f'La période est limitée à {max_years} années.'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    
+    try:
+        top = min(max(int(request.query_params.get('top', 3)), 0), 20)
+    except ValueError:
+        return Response(
+            {'error': 'Le paramètre top doit être un entier.'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    
+    regions = list(region_catalog.snapshot())
+    return Response(occupancy_report(regions, list(range(year_from, year_to + 1)), top=top))
+
+
 @api_view(['GET'])
 @permission_classes([IsAdmin])
 def admin_regions_availability(request):
@@ -422,17 +1038,18 @@ def admin_regions_availability(request):
             status=status.HTTP_400_BAD_REQUEST
         )
     
-    # Récupérer toutes les régions
-    regions = Region.objects.all().only('id', 'name')
+    if not is_supported_year(year):
+        return Response(
+            {'error': 'L\'année doit être entre 2000 et 2100.'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
     
-    # Optimisation : récupérer toutes les réservations en une seule requête
-    bookings_dict = {
-        booking.region_id: booking.user.email
-        for booking in Booking.objects.filter(
-            year=year,
-            week=week
-        ).select_related('user').only('region_id', 'user__email')
-    }
+    # Toutes les régions, depuis le catalogue en mémoire
+    regions = region_catalog.snapshot()
+    
+    # Réservations de la semaine, lues depuis l'index de disponibilité en mémoire
+    scope = bookings_year_scope(year)
+    bookings_dict = availability_index.year(year, get_versions(scope)[scope]).week_owners(week)
     
     availability_data = []
     for region in regions:
@@ -5,6 +5,16 @@ It exposes the ASGI callable as a module-level variable named ``application``.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/6.0/howto/deployment/asgi/
+
+The server-push endpoint /api/bookings/events/ (Server-Sent Events) needs
+this ASGI application: under WSGI each open stream would hold a worker, so
+it is only routed when SERVER_PROFILE=asgi.
+
+Under this application the availability and coverage reads are served by the
+async views of bookings/async_views.py (SERVER_PROFILE=asgi, see
+config/settings.py). Deployment profile: SERVER_PROFILE=asgi gunicorn
+(gunicorn.conf.py, a single uvicorn worker: the event hub behind the stream
+is per process, see core/events.py).
 """
 
 import os
@@ -12,5 +22,6 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+os.environ.setdefault('SERVER_PROFILE', 'asgi')
 
 application = get_asgi_application()
@@ -1,7 +1,9 @@
+import importlib.util
 import os
 from pathlib import Path
 from datetime import timedelta
 from dotenv import load_dotenv
+from django.core.exceptions import ImproperlyConfigured
 
 # Build paths inside the project
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -92,6 +94,14 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = 'config.wsgi.application'
+ASGI_APPLICATION = 'config.asgi.application'
+
+# Profil de déploiement (gunicorn.conf.py) : wsgi (workers synchrones) ou asgi
+# (workers uvicorn ; config/asgi.py le positionne). Sous ASGI, les vues de
+# lecture asynchrones (bookings/async_views.py) remplacent par défaut les vues
+# DRF de disponibilité et de couverture
+SERVER_PROFILE = os.environ.get('SERVER_PROFILE', 'wsgi')
+ASYNC_READ_VIEWS = os.environ.get('ASYNC_READ_VIEWS', str(SERVER_PROFILE == 'asgi')) == 'True'
 
 # ======================
 # Database
@@ -122,6 +132,80 @@ else:
         }
     }
 
+# Connexions à la base (DB_CONN_MODE). Mesure : manage.py bench_db_connections
+# - persistent (défaut) : une connexion par worker, réutilisée d'une requête à
+#   l'autre pendant DB_CONN_MAX_AGE secondes ;
+# - pool : pool psycopg 3 par worker (PostgreSQL uniquement ; psycopg[pool]
+#   figure dans requirements.txt) ; taille, durée de vie et attente via DB_POOL_* ;
+# - none : une connexion par requête (comportement par défaut de Django).
+# DB_CONN_HEALTH_CHECKS vérifie une connexion réutilisée avant la requête
+# suivante (redémarrage de PostgreSQL, coupure réseau). Avec SQLite, le mode
+# pool se replie sur des connexions persistantes. Sous ASGI, les connexions
+# persistantes ne sont pas réutilisées d'une requête à l'autre (un thread par
+# requête) : défaut none, pool recommandé.
+DB_CONN_MODES = ('persistent', 'pool', 'none')
+DB_CONN_MODE = os.environ.get('DB_CONN_MODE', 'none' if SERVER_PROFILE == 'asgi' else 'persistent')
+if DB_CONN_MODE not in DB_CONN_MODES:
+    raise ImproperlyConfigured(
+        f"DB_CONN_MODE doit valoir {', '.join(DB_CONN_MODES)} (reçu : {DB_CONN_MODE!r})."
+    )
+DB_CONN_MAX_AGE = int(os.environ.get('DB_CONN_MAX_AGE', '60'))
+DB_CONN_HEALTH_CHECKS = os.environ.get('DB_CONN_HEALTH_CHECKS', 'True') == 'True'
+DB_POOL_MIN_SIZE = int(os.environ.get('DB_POOL_MIN_SIZE', '1'))
+DB_POOL_MAX_SIZE = int(os.environ.get('DB_POOL_MAX_SIZE', '4'))
+DB_POOL_MAX_LIFETIME = float(os.environ.get('DB_POOL_MAX_LIFETIME', '1800'))
+DB_POOL_TIMEOUT = float(os.environ.get('DB_POOL_TIMEOUT', '10'))
+
+_db_default = DATABASES['default']
+_db_default['CONN_HEALTH_CHECKS'] = DB_CONN_HEALTH_CHECKS
+if DB_CONN_MODE == 'pool' and _db_default['ENGINE'] == 'django.db.backends.postgresql':
+    if importlib.util.find_spec('psycopg_pool') is None:
+        raise ImproperlyConfigured("DB_CONN_MODE=pool demande psycopg 3 et son pool : pip install 'psycopg[binary,pool]'.")
+    # Le pool remplace les connexions persistantes (CONN_MAX_AGE doit valoir 0)
+    _db_default['CONN_MAX_AGE'] = 0
+    _db_default['OPTIONS'] = {
+        'pool': {
+            'min_size': DB_POOL_MIN_SIZE,
+            'max_size': DB_POOL_MAX_SIZE,
+            'max_lifetime': DB_POOL_MAX_LIFETIME,
+            'timeout': DB_POOL_TIMEOUT,
+        },
+    }
+else:
+    _db_default['CONN_MAX_AGE'] = 0 if DB_CONN_MODE == 'none' else DB_CONN_MAX_AGE
+
+# ======================
+# Cache
+# ======================
+
+# Cache partagé entre les workers (second niveau de core/caching.py, throttling
+# DRF de repli) : db (défaut, table créée par migrate), file, locmem, ou le
+# chemin complet d'un backend Django avec CACHE_LOCATION. Le verrou anti-meute
+# entre workers exige un add atomique : db, memcached ou redis, pas file.
+CACHE_BACKEND = os.environ.get('CACHE_BACKEND', 'db')
+CACHE_BACKENDS = {
+    'file': ('django.core.cache.backends.filebased.FileBasedCache', str(BASE_DIR / '.cache')),
+    'db': ('django.core.cache.backends.db.DatabaseCache', 'booking_cache'),
+    'locmem': ('django.core.cache.backends.locmem.LocMemCache', 'booking'),
+}
+_cache_backend, _cache_location = CACHE_BACKENDS.get(CACHE_BACKEND, (CACHE_BACKEND, ''))
+CACHES = {
+    'default': {
+        'BACKEND': _cache_backend,
+        'LOCATION': os.environ.get('CACHE_LOCATION') or _cache_location,
+        'TIMEOUT': 300,
+        'KEY_PREFIX': 'booking',
+    }
+}
+
+# Premier niveau (LRU par processus) : taille, durée de vie maximale (borne le
+# retard d'invalidation entre workers), durée par défaut et verrou anti-meute
+TIERED_CACHE_LOCAL_SIZE = int(os.environ.get('TIERED_CACHE_LOCAL_SIZE', '2048'))
+TIERED_CACHE_LOCAL_TTL = float(os.environ.get('TIERED_CACHE_LOCAL_TTL', '5'))
+TIERED_CACHE_DEFAULT_TTL = int(os.environ.get('TIERED_CACHE_DEFAULT_TTL', '300'))
+TIERED_CACHE_LOCK_TIMEOUT = int(os.environ.get('TIERED_CACHE_LOCK_TIMEOUT', '10'))
+TIERED_CACHE_LOCK_WAIT = float(os.environ.get('TIERED_CACHE_LOCK_WAIT', '2'))
+
 # ======================
 # Auth
 # ======================
@@ -134,6 +218,29 @@ AUTHENTICATION_BACKENDS = [
 
 AUTH_PASSWORD_VALIDATORS = []
 
+# Politique de hachage des mots de passe (PASSWORD_HASHER : pbkdf2, scrypt,
+# argon2 ou bcrypt). Le premier hasher sert aux nouveaux mots de passe ; les
+# autres permettent de vérifier les anciens, re-hachés à la connexion suivante.
+# argon2 et bcrypt demandent argon2-cffi / bcrypt. Mesure : manage.py bench_logins
+PASSWORD_HASHER_CHOICES = {
+    'pbkdf2': 'accounts.hashers.PBKDF2PasswordHasher',
+    'scrypt': 'accounts.hashers.ScryptPasswordHasher',
+    'argon2': 'django.contrib.auth.hashers.Argon2PasswordHasher',
+    'bcrypt': 'django.contrib.auth.hashers.BCryptSHA256PasswordHasher',
+}
+PASSWORD_HASHER = os.environ.get('PASSWORD_HASHER', 'pbkdf2')
+if PASSWORD_HASHER not in PASSWORD_HASHER_CHOICES:
+    raise ImproperlyConfigured(
+        f"PASSWORD_HASHER doit valoir {', '.join(PASSWORD_HASHER_CHOICES)} (reçu : {PASSWORD_HASHER!r})."
+    )
+PASSWORD_HASHERS = [PASSWORD_HASHER_CHOICES[PASSWORD_HASHER]] + [
+    path for name, path in PASSWORD_HASHER_CHOICES.items() if name != PASSWORD_HASHER
+] + ['django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher']
+
+# Coût des hashers (vide = valeur par défaut de Django)
+PASSWORD_PBKDF2_ITERATIONS = int(os.environ.get('PASSWORD_PBKDF2_ITERATIONS') or 0) or None
+PASSWORD_SCRYPT_WORK_FACTOR = int(os.environ.get('PASSWORD_SCRYPT_WORK_FACTOR') or 0) or None
+
 # ======================
 # Internationalization
 # ======================
@@ -162,7 +269,7 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'accounts.authentication.CachedJWTAuthentication',
     ),
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticated',
@@ -172,14 +279,19 @@ REST_FRAMEWORK = {
     'DEFAULT_RENDERER_CLASSES': (
         'rest_framework.renderers.JSONRenderer',
     ),
+    # Compteurs partagés entre les workers de l'hôte (core/throttles.py)
     'DEFAULT_THROTTLE_CLASSES': [
-        'rest_framework.throttling.AnonRateThrottle',
-        'rest_framework.throttling.UserRateThrottle',
+        'core.throttles.SharedAnonRateThrottle',
+        'core.throttles.SharedUserRateThrottle',
     ],
     'DEFAULT_THROTTLE_RATES': {
         'anon': '20/minute',
         'user': '100/minute',
         'login': '5/minute',
+        'burst': os.environ.get('THROTTLE_BURST_RATE', '60/minute'),
+        # Seau de 1000 jetons rechargé en une heure : le rafraîchissement régulier
+        # de la grille par un DG reste sous la limite
+        'sustained': os.environ.get('THROTTLE_SUSTAINED_RATE', '1000/hour'),
     },
 }
 
@@ -195,6 +307,8 @@ SIMPLE_JWT = {
     'ALGORITHM': 'HS256',
     'SIGNING_KEY': SECRET_KEY,
     'AUTH_HEADER_TYPES': ('Bearer',),
+    # Révocation sans token_blacklist : voir accounts/revocation.py
+    'TOKEN_REFRESH_SERIALIZER': 'accounts.serializers.RevocableTokenRefreshSerializer',
 }
 
 # ======================
@@ -227,4 +341,48 @@ CORS_ALLOW_CREDENTIALS = True
 # ======================
 
 LOGIN_TOKEN_EXPIRY_MINUTES = 15
-TOTAL_REGIONS = 7
+
+# Durée de vie (secondes) d'une année dans l'index de disponibilité en mémoire
+AVAILABILITY_INDEX_TTL = int(os.environ.get('AVAILABILITY_INDEX_TTL', '5'))
+# Nombre maximal d'années chargées dans l'index (les moins récemment lues sont oubliées)
+AVAILABILITY_INDEX_YEARS = int(os.environ.get('AVAILABILITY_INDEX_YEARS', '8'))
+
+# Écriture rapide des réservations : l'unicité du créneau est garantie par la
+# contrainte de base de données plutôt que par des SELECT préalables
+BOOKING_FAST_WRITES = os.environ.get('BOOKING_FAST_WRITES', 'True') == 'True'
+
+# Lecture rapide des listes de réservations : lignes values() (jointures en SQL)
+# au lieu d'instances passées à BookingListSerializer, même JSON.
+# Mesure : manage.py bench_booking_lists
+BOOKING_FAST_LISTS = os.environ.get('BOOKING_FAST_LISTS', 'True') == 'True'
+
+# Taille de page par défaut des listes de réservations (pagination par curseur)
+BOOKINGS_PAGE_SIZE = int(os.environ.get('BOOKINGS_PAGE_SIZE', '50'))
+
+# Durée de vie (secondes) du catalogue des régions en mémoire (core/regions.py),
+# pour les lectures qui ne fournissent pas la version 'regions'
+REGION_CATALOG_TTL = int(os.environ.get('REGION_CATALOG_TTL', '60'))
+
+# Agrégats d'occupation (tableau de bord admin) : durée de vie du cache et période maximale
+OCCUPANCY_CACHE_TTL = int(os.environ.get('OCCUPANCY_CACHE_TTL', '3600'))
+OCCUPANCY_MAX_YEARS = int(os.environ.get('OCCUPANCY_MAX_YEARS', '30'))
+
+# Cache des utilisateurs authentifiés par JWT (par processus) : taille et durée de vie (secondes)
+USER_CACHE_SIZE = int(os.environ.get('USER_CACHE_SIZE', '1024'))
+USER_CACHE_TTL = int(os.environ.get('USER_CACHE_TTL', '30'))
+
+# Révocation des jetons de rafraîchissement (accounts/revocation.py) :
+# filtre de Bloom, écriture par lots des rotations, synchronisation et purge (secondes)
+REVOCATION_BLOOM_CAPACITY = int(os.environ.get('REVOCATION_BLOOM_CAPACITY', '100000'))
+REVOCATION_BLOOM_ERROR_RATE = float(os.environ.get('REVOCATION_BLOOM_ERROR_RATE', '0.01'))
+REVOCATION_BATCH_SIZE = int(os.environ.get('REVOCATION_BATCH_SIZE', '100'))
+REVOCATION_FLUSH_INTERVAL = float(os.environ.get('REVOCATION_FLUSH_INTERVAL', '1'))
+REVOCATION_SYNC_INTERVAL = float(os.environ.get('REVOCATION_SYNC_INTERVAL', '2'))
+REVOCATION_PRUNE_INTERVAL = int(os.environ.get('REVOCATION_PRUNE_INTERVAL', '3600'))
+
+# Limitation de débit partagée entre workers (core/ratelimit.py) : préfixe du
+# fichier projeté en mémoire (défaut : /dev/shm, suffixé par format et taille)
+# et nombre de seaux
+THROTTLE_SHARED_MEMORY = os.environ.get('THROTTLE_SHARED_MEMORY', 'True') == 'True'
+THROTTLE_SHM_PATH = os.environ.get('THROTTLE_SHM_PATH', '')
+THROTTLE_SLOTS = int(os.environ.get('THROTTLE_SLOTS', '65536'))
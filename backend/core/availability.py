@@ -0,0 +1,194 @@
+"""
+Index en mémoire de la disponibilité des créneaux (axe × semaine ISO).
+
+Pour chaque année chargée, l'index conserve :
+- un bitmap de 53 bits par région (bit n-1 à 1 = semaine n réservée) ;
+- une table (region_id, week) -> email pour les administrateurs.
+
+Une année est chargée en une seule requête au premier accès, puis tenue à
+jour par les signaux de Booking (voir bookings/signals.py). Les autres
+workers convergent en passant la version de l'année (core.versioning) ou,
+à défaut, grâce à une durée de vie (AVAILABILITY_INDEX_TTL). Au plus
+AVAILABILITY_INDEX_YEARS années restent chargées (les moins récemment lues
+sont oubliées).
+
+Les écritures (add, remove) remplacent les dictionnaires d'une année au lieu
+de les modifier (copie sur écriture) : une lecture qui parcourt bitmaps ou
+owners sans verrou travaille sur un état cohérent et jamais modifié.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+
+
+WEEK_BITS = 53
+
+
+class YearAvailability:
+    """Disponibilité de toutes les régions pour une année donnée."""
+    __slots__ = ('year', 'bitmaps', 'owners', 'loaded_at', 'version')
+
+    def __init__(self, year, bitmaps=None, owners=None, version=None):
+        self.year = year
+        self.bitmaps = bitmaps or {}
+        self.owners = owners or {}
+        self.loaded_at = time.monotonic()
+        self.version = version
+
+    def is_booked(self, region_id, week):
+        """Retourne True si la semaine est réservée pour la région."""
+        if not 1 <= week <= WEEK_BITS:
+            return False
+        return bool((self.bitmaps.get(region_id, 0) >> (week - 1)) & 1)
+
+    def booked_weeks(self, region_id):
+        """Retourne les semaines réservées d'une région, triées."""
+        bitmap = self.bitmaps.get(region_id, 0)
+        return [week for week in range(1, WEEK_BITS + 1) if (bitmap >> (week - 1)) & 1]
+
+    def bitstring(self, region_id, weeks):
+        """Retourne '0'/'1' pour chaque semaine de `weeks` ('1' = réservée)."""
+        bitmap = self.bitmaps.get(region_id, 0)
+        return ''.join('1' if (bitmap >> (week - 1)) & 1 else '0' for week in weeks)
+
+    def booked_by(self, region_id, week):
+        """Retourne l'email de l'auteur de la réservation (ou None)."""
+        return self.owners.get((region_id, week))
+
+    def week_owners(self, week):
+        """Retourne {region_id: email} des réservations d'une semaine."""
+        # owners n'est jamais modifié en place : ce parcours n'a pas besoin du verrou
+        return {
+            region_id: email
+            for (region_id, booked_week), email in self.owners.items()
+            if booked_week == week
+        }
+
+
+class AvailabilityIndex:
+    """Index partagé par toutes les vues de disponibilité du processus."""
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._years = OrderedDict()
+
+    @property
+    def ttl(self):
+        return getattr(settings, 'AVAILABILITY_INDEX_TTL', 5)
+
+    @property
+    def max_years(self):
+        return getattr(settings, 'AVAILABILITY_INDEX_YEARS', 8)
+
+    @staticmethod
+    def _rows(year):
+        from bookings.models import Booking
+
+        return Booking.objects.filter(year=year).values_list('region_id', 'week', 'user__email')
+
+    @staticmethod
+    def _add_row(entry, region_id, week, email):
+        entry.bitmaps[region_id] = entry.bitmaps.get(region_id, 0) | (1 << (week - 1))
+        entry.owners[(region_id, week)] = email
+
+    def _load(self, year, version=None):
+        """Charge une année depuis la base en une seule requête."""
+        entry = YearAvailability(year, version=version)
+        for region_id, week, email in self._rows(year):
+            self._add_row(entry, region_id, week, email)
+        return entry
+
+    def _is_stale(self, entry, version):
+        if entry is None:
+            return True
+        if version is not None:
+            return entry.version != version
+        return time.monotonic() - entry.loaded_at > self.ttl
+
+    def _cached(self, year, version):
+        """Retourne (entrée courante, True si elle est à jour)."""
+        with self._lock:
+            entry = self._years.get(year)
+            if self._is_stale(entry, version):
+                return entry, False
+            self._years.move_to_end(year)
+            return entry, True
+
+    def _swap(self, year, previous, loaded, version):
+        """Installe une année chargée hors du verrou, sauf si une autre requête l'a déjà rechargée."""
+        with self._lock:
+            current = self._years.get(year)
+            if current is not previous and not self._is_stale(current, version):
+                return current
+            self._years[year] = loaded
+            self._years.move_to_end(year)
+            while len(self._years) > self.max_years:
+                self._years.popitem(last=False)
+            return loaded
+
+    def year(self, year, version=None):
+        """
+        Retourne la disponibilité d'une année, chargée si absente ou périmée.
+
+        La requête de chargement s'exécute hors du verrou : les lectures des
+        autres années (et des autres threads) ne l'attendent pas.
+
+        Args:
+            year: Année
+            version: Version courante de l'année (core.versioning). Si fournie,
+                l'année est rechargée quand elle diffère, sinon la TTL s'applique.
+
+        Returns:
+            YearAvailability
+        """
+        entry, fresh = self._cached(year, version)
+        if fresh:
+            return entry
+        return self._swap(year, entry, self._load(year, version), version)
+
+    async def ayear(self, year, version=None):
+        """
+        Variante asynchrone de year() : l'année est chargée par l'ORM
+        asynchrone, sans tenir le verrou pendant la requête.
+        """
+        entry, fresh = self._cached(year, version)
+        if fresh:
+            return entry
+
+        loaded = YearAvailability(year, version=version)
+        async for region_id, week, email in self._rows(year):
+            self._add_row(loaded, region_id, week, email)
+        return self._swap(year, entry, loaded, version)
+
+    def add(self, region_id, year, week, email):
+        """Marque un créneau comme réservé (si l'année est chargée)."""
+        with self._lock:
+            entry = self._years.get(year)
+            if entry is None:
+                return
+            entry.bitmaps = {**entry.bitmaps, region_id: entry.bitmaps.get(region_id, 0) | (1 << (week - 1))}
+            entry.owners = {**entry.owners, (region_id, week): email}
+
+    def remove(self, region_id, year, week):
+        """Libère un créneau (si l'année est chargée)."""
+        with self._lock:
+            entry = self._years.get(year)
+            if entry is None:
+                return
+            owners = dict(entry.owners)
+            owners.pop((region_id, week), None)
+            entry.bitmaps = {**entry.bitmaps, region_id: entry.bitmaps.get(region_id, 0) & ~(1 << (week - 1))}
+            entry.owners = owners
+
+    def invalidate(self, year=None):
+        """Oublie une année (ou tout l'index) ; rechargée au prochain accès."""
+        with self._lock:
+            if year is None:
+                self._years.clear()
+            else:
+                self._years.pop(year, None)
+
+
+availability_index = AvailabilityIndex()
@@ -0,0 +1,243 @@
+"""
+Cache à deux niveaux : LRU borné en mémoire du processus devant un cache
+partagé entre les workers (CACHES['default'] : base de données par défaut,
+fichiers ou tout autre backend Django, voir config/settings.py).
+
+- Clés par espace de noms ; `bump(namespace)` invalide tout l'espace en
+  changeant sa version (les anciennes entrées expirent d'elles-mêmes).
+- Durée de vie par clé ; le niveau local la plafonne à TIERED_CACHE_LOCAL_TTL,
+  ce qui borne le délai de prise en compte d'une invalidation faite par un
+  autre worker.
+- Protection contre l'effet de meute : un seul calcul par clé à la fois dans
+  le processus (verrou) et entre processus (verrou `add` dans le cache
+  partagé, les autres attendent le résultat). Le verrou entre processus
+  suppose un `add` atomique (base de données, memcached, redis) : le cache
+  par fichiers ne l'est pas et ne protège que dans le processus.
+- Compteurs de succès local / partagé et d'échecs par espace de noms.
+
+Usage :
+    tiered_cache.get_or_set('users', 'list', build_user_list, ttl=300)
+
+    @cached('coverage', key=lambda user: user.pk)
+    def coverage_for(user): ...
+"""
+import functools
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+
+
+_MISSING = object()
+
+
+class TieredCache:
+    """LRU local + cache partagé, avec espaces de noms versionnés."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._local = OrderedDict()
+        self._versions = {}
+        self._key_locks = [threading.Lock() for _ in range(64)]
+        self._stats = {}
+
+    @staticmethod
+    def _setting(name, default):
+        return getattr(settings, name, default)
+
+    @property
+    def shared(self):
+        return caches[self._setting('TIERED_CACHE_ALIAS', 'default')]
+
+    # Versions des espaces de noms
+
+    def version(self, namespace):
+        """Version courante de l'espace (relue dans le cache partagé après TIERED_CACHE_LOCAL_TTL)."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._versions.get(namespace)
+            if entry and entry[0] > now:
+                return entry[1]
+        version = self.shared.get(f'ns:{namespace}', 1)
+        with self._lock:
+            self._versions[namespace] = (now + self._setting('TIERED_CACHE_LOCAL_TTL', 5), version)
+        return version
+
+    def bump(self, namespace):
+        """Invalide toutes les clés d'un espace de noms (tous les workers)."""
+        key = f'ns:{namespace}'
+        try:
+            version = self.shared.incr(key)
+        except ValueError:
+            # Espace jamais invalidé : version implicite 1
+            version = 2
+            if not self.shared.add(key, version, None):
+                version = self.shared.incr(key)
+        with self._lock:
+            self._versions[namespace] = (time.monotonic() + self._setting('TIERED_CACHE_LOCAL_TTL', 5), version)
+            prefix = f'{namespace}:'
+            for full_key in [k for k in self._local if k.startswith(prefix)]:
+                del self._local[full_key]
+
+    def _full_key(self, namespace, key):
+        key = str(key)
+        if len(key) > 100 or not key.isprintable() or ' ' in key:
+            # Clé sûre pour tous les backends (memcached refuse espaces et clés longues)
+            key = hashlib.blake2b(key.encode(), digest_size=16).hexdigest()
+        return f'{namespace}:v{self.version(namespace)}:{key}'
+
+    # Niveau local
+
+    def _local_get(self, full_key):
+        with self._lock:
+            entry = self._local.get(full_key)
+            if entry is None:
+                return _MISSING
+            if entry[0] <= time.monotonic():
+                del self._local[full_key]
+                return _MISSING
+            self._local.move_to_end(full_key)
+            return entry[1]
+
+    def _local_set(self, full_key, value, ttl):
+        local_ttl = self._setting('TIERED_CACHE_LOCAL_TTL', 5)
+        if ttl is not None:
+            local_ttl = min(ttl, local_ttl)
+        with self._lock:
+            self._local[full_key] = (time.monotonic() + local_ttl, value)
+            self._local.move_to_end(full_key)
+            while len(self._local) > self._setting('TIERED_CACHE_LOCAL_SIZE', 2048):
+                self._local.popitem(last=False)
+
+    # Compteurs
+
+    def _count(self, namespace, name):
+        with self._lock:
+            counters = self._stats.setdefault(namespace, {'local_hits': 0, 'shared_hits': 0, 'misses': 0})
+            counters[name] += 1
+
+    def stats(self):
+        """Compteurs du processus : {espace: {'local_hits', 'shared_hits', 'misses'}}."""
+        with self._lock:
+            return {namespace: dict(counters) for namespace, counters in self._stats.items()}
+
+    # API
+
+    def get(self, namespace, key, default=None):
+        full_key = self._full_key(namespace, key)
+        value = self._lookup(namespace, full_key)
+        return default if value is _MISSING else value
+
+    def _lookup(self, namespace, full_key, count=True):
+        value = self._local_get(full_key)
+        if value is not _MISSING:
+            if count:
+                self._count(namespace, 'local_hits')
+            return value[0]
+        # Les valeurs sont stockées dans un tuple : None est une valeur valide
+        wrapped = self.shared.get(full_key, _MISSING)
+        if wrapped is not _MISSING:
+            self._local_set(full_key, wrapped, None)
+            if count:
+                self._count(namespace, 'shared_hits')
+            return wrapped[0]
+        return _MISSING
+
+    def set(self, namespace, key, value, ttl=None):
+        self._store(self._full_key(namespace, key), value, ttl)
+
+    def _store(self, full_key, value, ttl):
+        ttl = self._setting('TIERED_CACHE_DEFAULT_TTL', 300) if ttl is None else ttl
+        self.shared.set(full_key, (value,), ttl)
+        self._local_set(full_key, (value,), ttl)
+
+    def delete(self, namespace, key):
+        full_key = self._full_key(namespace, key)
+        self.shared.delete(full_key)
+        with self._lock:
+            self._local.pop(full_key, None)
+
+    def get_or_set(self, namespace, key, producer, ttl=None):
+        """
+        Retourne la valeur en cache ou la calcule avec producer() (une seule fois
+        à la fois par clé, y compris entre workers).
+        """
+        full_key = self._full_key(namespace, key)
+        value = self._lookup(namespace, full_key)
+        if value is not _MISSING:
+            return value
+
+        with self._key_locks[hash(full_key) % len(self._key_locks)]:
+            # Calculée par un autre thread pendant l'attente du verrou
+            value = self._lookup(namespace, full_key, count=False)
+            if value is not _MISSING:
+                self._count(namespace, 'local_hits')
+                return value
+
+            self._count(namespace, 'misses')
+            lock_key = f'{full_key}:lock'
+            if not self.shared.add(lock_key, 1, self._setting('TIERED_CACHE_LOCK_TIMEOUT', 10)):
+                # Un autre worker calcule la valeur : on attend son résultat
+                deadline = time.monotonic() + self._setting('TIERED_CACHE_LOCK_WAIT', 2)
+                while time.monotonic() < deadline:
+                    time.sleep(0.05)
+                    value = self._lookup(namespace, full_key, count=False)
+                    if value is not _MISSING:
+                        return value
+                lock_key = None
+
+            try:
+                value = producer()
+                # Clé calculée avant producer() : une invalidation pendant le
+                # calcul rend la valeur inaccessible au lieu de la publier
+                self._store(full_key, value, ttl)
+            finally:
+                if lock_key:
+                    self.shared.delete(lock_key)
+            return value
+
+    async def aget_or_set(self, namespace, key, producer, ttl=None):
+        """
+        Variante asynchrone de get_or_set pour les vues ASGI : producer est une
+        fonction asynchrone. Les accès au cache partagé (synchrone) passent par
+        sync_to_async ; pas de verrou de calcul entre requêtes concurrentes.
+        """
+        full_key = await sync_to_async(self._full_key)(namespace, key)
+        value = await sync_to_async(self._lookup)(namespace, full_key)
+        if value is not _MISSING:
+            return value
+
+        self._count(namespace, 'misses')
+        value = await producer()
+        await sync_to_async(self._store)(full_key, value, ttl)
+        return value
+
+    def clear_local(self):
+        with self._lock:
+            self._local.clear()
+            self._versions.clear()
+
+
+tiered_cache = TieredCache()
+
+
+def cached(namespace, key=None, ttl=None):
+    """
+    Décorateur : met en cache le résultat d'une fonction dans `namespace`.
+
+    Args:
+        namespace: Espace de noms (invalidé par tiered_cache.bump(namespace))
+        key: Fonction (mêmes arguments) retournant la clé ; par défaut repr des arguments
+        ttl: Durée de vie en secondes (défaut TIERED_CACHE_DEFAULT_TTL)
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            cache_key = key(*args, **kwargs) if key else repr((args, sorted(kwargs.items())))
+            return tiered_cache.get_or_set(namespace, cache_key, lambda: func(*args, **kwargs), ttl)
+        return wrapper
+    return decorator
@@ -0,0 +1,53 @@
+"""
+ETag forts et requêtes conditionnelles (If-None-Match) pour les vues DRF.
+"""
+import hashlib
+
+from django.utils.cache import patch_vary_headers
+from django.utils.http import parse_etags
+from rest_framework import status
+from rest_framework.response import Response
+
+
+def compute_etag(request, versions):
+    """
+    Calcule un ETag fort pour la requête et les versions de données fournies.
+    
+    L'ETag varie selon l'URL complète, le rôle (admin ou DG, car booked_by
+    diffère) et les versions des périmètres lus par la vue.
+    
+    Args:
+        request: Requête DRF
+        versions: dict {périmètre: version}
+    
+    Returns:
+        str: ETag entre guillemets
+    """
+    role = 'admin' if request.user.is_admin else 'dg'
+    parts = [request.get_full_path(), role]
+    parts.extend(f'{scope}={version}' for scope, version in sorted(versions.items()))
+    digest = hashlib.sha256('|'.join(parts).encode()).hexdigest()[:32]
+    return f'"{digest}"'
+
+
+def etag_matches(request, etag):
+    """Retourne True si l'en-tête If-None-Match du client correspond à l'ETag."""
+    header = request.headers.get('If-None-Match')
+    if not header:
+        return False
+    # Comparaison faible autorisée pour GET/HEAD (RFC 9110)
+    client_etags = [tag.removeprefix('W/') for tag in parse_etags(header)]
+    return '*' in client_etags or etag in client_etags
+
+
+def with_etag(response, etag):
+    """Ajoute l'ETag et les en-têtes de revalidation à une réponse."""
+    response['ETag'] = etag
+    response['Cache-Control'] = 'private, no-cache'
+    patch_vary_headers(response, ['Authorization'])
+    return response
+
+
+def not_modified(etag):
+    """Réponse 304 sans corps."""
+    return with_etag(Response(status=status.HTTP_304_NOT_MODIFIED), etag)
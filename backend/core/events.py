@@ -0,0 +1,91 @@
+"""
+Hub de diffusion en mémoire des événements de réservation (server push).
+
+Les signaux de Booking publient depuis n'importe quel thread ; chaque
+abonné (connexion SSE servie par l'application ASGI) reçoit les événements
+de son année dans une file asyncio attachée à sa boucle d'événements.
+
+Le hub est local au processus, comme une couche de canaux en mémoire :
+chaque worker ASGI diffuse les écritures qu'il a lui-même traitées. Le profil
+asgi impose donc un seul worker (gunicorn.conf.py) ; les écritures faites par
+un autre processus (workers WSGI, commandes de gestion) ne sont pas diffusées.
+"""
+import asyncio
+import threading
+
+
+# Taille maximale de la file d'un abonné ; au-delà, il doit resynchroniser
+SUBSCRIBER_QUEUE_SIZE = 100
+
+
+class Subscription:
+    """Abonnement d'un client aux événements d'une année."""
+
+    def __init__(self, year, is_admin):
+        self.year = year
+        self.is_admin = is_admin
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+
+    def wants(self, event):
+        """Retourne True si l'événement concerne l'année de l'abonné."""
+        return self.year in event['years']
+
+    def render(self, event):
+        """Adapte l'événement au rôle : les DG ne reçoivent jamais d'email."""
+        payload = {key: value for key, value in event.items() if key != 'years'}
+        if not self.is_admin:
+            payload['booking'] = dict(payload['booking'], booked_by=None)
+        return payload
+
+    def deliver(self, payload):
+        """Dépose un événement dans la file (exécuté dans la boucle de l'abonné)."""
+        try:
+            self.queue.put_nowait(payload)
+        except asyncio.QueueFull:
+            # Client trop lent : on vide la file et on demande un rechargement complet
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait({'type': 'resync'})
+
+
+class EventHub:
+    """Diffusion des événements de réservation aux abonnés du processus."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscriptions = set()
+
+    def subscribe(self, year, is_admin):
+        """Crée un abonnement (à appeler depuis la boucle asyncio du client)."""
+        subscription = Subscription(year, is_admin)
+        with self._lock:
+            self._subscriptions.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            self._subscriptions.discard(subscription)
+
+    def publish(self, event):
+        """
+        Diffuse un événement à tous les abonnés concernés (thread-safe).
+
+        Args:
+            event: dict avec 'type', 'booking' et 'years' (années concernées)
+        """
+        with self._lock:
+            subscriptions = [sub for sub in self._subscriptions if sub.wants(event)]
+        for subscription in subscriptions:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.deliver, subscription.render(event))
+            except RuntimeError:
+                # Boucle fermée : la connexion est terminée
+                self.unsubscribe(subscription)
+
+    @property
+    def subscriber_count(self):
+        return len(self._subscriptions)
+
+
+event_hub = EventHub()
@@ -0,0 +1,74 @@
+"""
+Table précalculée des semaines ISO pour les années autorisées (2000-2100).
+
+Calculée une seule fois à l'import et stockée dans des tableaux compacts :
+- le lundi de la semaine 1 de chaque année (ordinal de date) ;
+- le nombre réel de semaines de chaque année (52 ou 53).
+"""
+from array import array
+from datetime import date
+
+
+MIN_YEAR = 2000
+MAX_YEAR = 2100
+
+# Lundi de la semaine ISO 1 de MIN_YEAR..MAX_YEAR + 1 (l'année suivante borne la dernière)
+_FIRST_MONDAYS = array('I', (
+    date.fromisocalendar(year, 1, 1).toordinal() for year in range(MIN_YEAR, MAX_YEAR + 2)
+))
+
+_WEEK_COUNTS = array('B', (
+    (_FIRST_MONDAYS[index + 1] - _FIRST_MONDAYS[index]) // 7
+    for index in range(MAX_YEAR - MIN_YEAR + 1)
+))
+
+
+def is_supported_year(year):
+    """Retourne True si l'année est couverte par la table."""
+    return MIN_YEAR <= year <= MAX_YEAR
+
+
+def weeks_in_year(year):
+    """
+    Retourne le nombre de semaines ISO de l'année (52 ou 53).
+    
+    Raises:
+        ValueError: si l'année est hors de 2000-2100
+    """
+    if not is_supported_year(year):
+        raise ValueError(f"Année hors limites : {year}")
+    return _WEEK_COUNTS[year - MIN_YEAR]
+
+
+def week_monday_ordinal(year, week):
+    """Retourne l'ordinal (date.toordinal) du lundi de la semaine ISO."""
+    if not is_supported_year(year):
+        raise ValueError(f"Année hors limites : {year}")
+    return _FIRST_MONDAYS[year - MIN_YEAR] + 7 * (week - 1)
+
+
+def week_date_range(year, week):
+    """
+    Retourne les dates (lundi, dimanche) d'une semaine ISO.
+    
+    Args:
+        year: Année (2000-2100)
+        week: Semaine ISO
+    
+    Returns:
+        tuple: (date, date)
+    """
+    monday = week_monday_ordinal(year, week)
+    return date.fromordinal(monday), date.fromordinal(monday + 6)
+
+
+def year_weeks(year):
+    """Retourne l'axe des semaines de l'année : range(1, n + 1)."""
+    return range(1, weeks_in_year(year) + 1)
+
+
+def next_week(year, week):
+    """Retourne la semaine ISO suivante (year, week)."""
+    if week < weeks_in_year(year):
+        return year, week + 1
+    return year + 1, 1
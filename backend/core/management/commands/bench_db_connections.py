@@ -0,0 +1,99 @@
+import copy
+import statistics
+import time
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.utils import load_backend
+
+
+class Command(BaseCommand):
+    help = (
+        "Mesure la latence par requête selon le mode de connexion à la base "
+        "(none, persistent, pool) : cycle complet début de requête -> petite requête "
+        "SQL -> fin de requête, comme dans un worker gunicorn. "
+        "À lancer sur la base PostgreSQL visée (avec SQLite l'ouverture est quasi gratuite)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=500, help="Requêtes simulées par mode")
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS, help="Alias de la base mesurée")
+        parser.add_argument(
+            '--modes', nargs='*', choices=settings.DB_CONN_MODES,
+            help="Modes à mesurer (défaut : tous ceux de DB_CONN_MODES)",
+        )
+
+    def handle(self, *args, **options):
+        base = connections[options['database']].settings_dict
+        self.stdout.write(
+            f"Base : {base['ENGINE']} ({base['NAME']}), mode configuré : {settings.DB_CONN_MODE}, "
+            f"vérification de santé : {base['CONN_HEALTH_CHECKS']}"
+        )
+
+        # Référence : une connexion par requête
+        modes = sorted(options['modes'] or settings.DB_CONN_MODES, key=lambda mode: mode != 'none')
+        reference = None
+        for mode in modes:
+            try:
+                wrapper = self._wrapper(base, options['database'], mode)
+            except ImproperlyConfigured as e:
+                self.stdout.write(f"{mode:10} : ignoré ({e})")
+                continue
+
+            try:
+                timings = self._measure(wrapper, options['requests'])
+            except ImproperlyConfigured as e:
+                # psycopg 2 : Django refuse le pool à la première connexion
+                self.stdout.write(f"{mode:10} : ignoré ({e})")
+                continue
+            finally:
+                wrapper.close()
+                if mode == 'pool':
+                    wrapper.close_pool()
+
+            mean = statistics.fmean(timings)
+            p95 = statistics.quantiles(timings, n=20)[-1]
+            if reference is None:
+                reference = mean
+            self.stdout.write(
+                f"{mode:10} : {mean * 1000:7.3f} ms/requête en moyenne, p95 {p95 * 1000:7.3f} ms, "
+                f"{1 / mean:8.0f} requêtes/s/worker (x{reference / mean:.1f} vs {modes[0]})"
+            )
+
+    def _wrapper(self, base, alias, mode):
+        """Connexion indépendante de celle de Django, réglée pour `mode`."""
+        settings_dict = copy.deepcopy(base)
+        options = settings_dict.setdefault('OPTIONS', {})
+        options.pop('pool', None)
+
+        if mode == 'pool':
+            if settings_dict['ENGINE'] != 'django.db.backends.postgresql':
+                raise ImproperlyConfigured("pool réservé à PostgreSQL")
+            settings_dict['CONN_MAX_AGE'] = 0
+            options['pool'] = {
+                'min_size': settings.DB_POOL_MIN_SIZE,
+                'max_size': settings.DB_POOL_MAX_SIZE,
+                'max_lifetime': settings.DB_POOL_MAX_LIFETIME,
+                'timeout': settings.DB_POOL_TIMEOUT,
+            }
+        elif mode == 'persistent':
+            settings_dict['CONN_MAX_AGE'] = settings.DB_CONN_MAX_AGE or 60
+        else:
+            settings_dict['CONN_MAX_AGE'] = 0
+
+        return load_backend(settings_dict['ENGINE']).DatabaseWrapper(settings_dict, alias)
+
+    def _measure(self, wrapper, count):
+        timings = []
+        for _ in range(count):
+            start = time.perf_counter()
+            # django.db.close_old_connections, branché sur request_started / request_finished
+            wrapper.close_if_unusable_or_obsolete()
+            with wrapper.cursor() as cursor:
+                cursor.execute('SELECT 1')
+                cursor.fetchone()
+            wrapper.close_if_unusable_or_obsolete()
+            timings.append(time.perf_counter() - start)
+        return timings
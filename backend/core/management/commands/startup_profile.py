@@ -0,0 +1,99 @@
+import json
+import os
+import subprocess
+import sys
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+
+# Exécuté dans un processus neuf (imports à froid, comme un worker gunicorn)
+CHILD = '''
+import json, sys, time
+start = time.perf_counter()
+import django
+django.setup()
+phases = {'django.setup': time.perf_counter() - start}
+
+step = time.perf_counter()
+from django.urls import get_resolver
+get_resolver().url_patterns
+phases['urlconf'] = time.perf_counter() - step
+
+warmup = None
+if sys.argv[1] == '1':
+    from core.warmup import warm_up
+    warmup = warm_up()
+
+print(json.dumps({'phases': phases, 'warmup': warmup, 'modules': sorted(sys.modules)}))
+'''
+
+# Dépendances chargées à la demande : ne doivent pas apparaître au démarrage
+# (django.core.mail est importé par django.utils.log dès django.setup())
+LAZY_MODULES = ('icalendar', 'dateutil.relativedelta')
+
+
+class Command(BaseCommand):
+    help = (
+        "Profile le démarrage à froid d'un worker dans un processus neuf (python -X importtime) : "
+        "durée de django.setup(), du chargement des URL (vues, serializers) et du préchauffage, "
+        "modules les plus coûteux et temps d'import par paquet."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--top', type=int, default=20, help="Nombre de modules les plus coûteux affichés")
+        parser.add_argument('--no-warmup', action='store_true', help="Ne pas mesurer le préchauffage (core/warmup.py)")
+
+    def handle(self, *args, **options):
+        env = dict(os.environ, DJANGO_SETTINGS_MODULE=settings.SETTINGS_MODULE)
+        result = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', CHILD, '0' if options['no_warmup'] else '1'],
+            cwd=settings.BASE_DIR, env=env, capture_output=True, text=True,
+        )
+        if result.returncode != 0:
+            raise CommandError(f"Échec du processus de mesure :\n{result.stderr[-2000:]}")
+
+        report = json.loads(result.stdout.strip().splitlines()[-1])
+        imports = self._parse_importtime(result.stderr)
+
+        self.stdout.write("Phases du démarrage :")
+        for phase, duration in report['phases'].items():
+            self.stdout.write(f"  {phase:20} {duration * 1000:8.1f} ms")
+        if report['warmup'] is not None:
+            for step, duration in report['warmup'].items():
+                self.stdout.write(f"  {'warmup.' + step:20} {duration:8.1f} ms")
+
+        self.stdout.write(f"\nModules les plus coûteux (cumulé, {len(imports)} modules importés) :")
+        ranked = sorted(imports.items(), key=lambda item: item[1][1], reverse=True)
+        for module, (own, cumulative) in ranked[:options['top']]:
+            self.stdout.write(f"  {cumulative / 1000:8.1f} ms  (propre {own / 1000:6.1f} ms)  {module}")
+
+        self.stdout.write("\nTemps d'import propre par paquet :")
+        packages = defaultdict(int)
+        for module, (own, _) in imports.items():
+            packages[module.split('.', 1)[0]] += own
+        for package, own in sorted(packages.items(), key=lambda item: item[1], reverse=True)[:options['top']]:
+            self.stdout.write(f"  {own / 1000:8.1f} ms  {package}")
+
+        self.stdout.write("\nDépendances chargées à la demande :")
+        loaded = set(report['modules'])
+        for module in LAZY_MODULES:
+            if module in loaded:
+                self.stdout.write(self.style.WARNING(f"  {module:25} importé au démarrage"))
+            else:
+                self.stdout.write(self.style.SUCCESS(f"  {module:25} différé"))
+
+    @staticmethod
+    def _parse_importtime(output):
+        """Analyse la sortie de -X importtime : {module: (propre µs, cumulé µs)}."""
+        imports = {}
+        for line in output.splitlines():
+            if not line.startswith('import time:'):
+                continue
+            parts = line[len('import time:'):].split('|')
+            if len(parts) != 3 or not parts[0].strip().isdigit():
+                # En-tête « self [us] | cumulative | imported package »
+                continue
+            imports[parts[2].strip()] = (int(parts[0]), int(parts[1]))
+        return imports
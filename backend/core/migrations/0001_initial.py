@@ -0,0 +1,25 @@
+# Generated by Django 6.0 on 2026-10-18 08:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DataVersion',
+            fields=[
+                ('scope', models.CharField(max_length=32, primary_key=True, serialize=False, verbose_name='Périmètre')),
+                ('version', models.PositiveBigIntegerField(default=0, verbose_name='Version')),
+            ],
+            options={
+                'verbose_name': 'Version de données',
+                'verbose_name_plural': 'Versions de données',
+            },
+        ),
+    ]
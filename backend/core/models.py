@@ -1,3 +1,21 @@
 from django.db import models
 
-# Create your models here.
+
+class DataVersion(models.Model):
+    """
+    Compteur de version monotone par périmètre de données.
+    
+    Périmètres utilisés :
+    - 'bookings:<année>' : réservations d'une année
+    - 'regions' : catalogue des axes
+    - 'calendar-feeds:<id>' : URL de flux ICS émises par un utilisateur
+    """
+    scope = models.CharField(max_length=32, primary_key=True, verbose_name="Périmètre")
+    version = models.PositiveBigIntegerField(default=0, verbose_name="Version")
+    
+    class Meta:
+        verbose_name = "Version de données"
+        verbose_name_plural = "Versions de données"
+    
+    def __str__(self):
+        return f"{self.scope} v{self.version}"
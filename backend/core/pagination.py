@@ -0,0 +1,111 @@
+"""
+Pagination par curseur (keyset) pour les listes volumineuses.
+"""
+import json
+from base64 import b64decode, b64encode
+
+from django.conf import settings
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, CursorPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class BookingCursorPagination(CursorPagination):
+    """
+    Pagination des réservations par curseur, du plus récent au plus ancien
+    (tri created_at, puis id).
+    
+    Le curseur de DRF ne porte que la position sur le premier champ de tri
+    (created_at) et un décalage pour les ex æquo : chaque page est une lecture
+    bornée de l'index booking_created_at_idx (WHERE created_at < curseur
+    ... OFFSET ex æquo LIMIT n), sans COUNT(*). Le décalage reste petit tant
+    que peu de réservations partagent le même created_at ; pour un tri sur des
+    valeurs souvent égales, voir KeysetPagination.
+    """
+    ordering = ('-created_at', '-id')
+    page_size = getattr(settings, 'BOOKINGS_PAGE_SIZE', 50)
+    page_size_query_param = 'page_size'
+    max_page_size = 500
+
+
+class KeysetPagination(BasePagination):
+    """
+    Pagination par curseur sur (champ de tri, id), pour des tris sur des
+    valeurs non uniques (ex. nombre de régions couvertes).
+    
+    Contrairement à CursorPagination, qui départage les ex æquo par un
+    décalage (OFFSET) croissant, le curseur porte le couple (valeur, id) de
+    la dernière ligne : chaque page est un filtre
+    (valeur, id) < (v, i) ... LIMIT n, quel que soit le nombre d'égalités.
+    
+    La vue fixe le champ et le sens via `paginate_queryset(..., field, descending)`.
+    Seul le lien « suivant » est fourni.
+    """
+    page_size = getattr(settings, 'BOOKINGS_PAGE_SIZE', 50)
+    page_size_query_param = 'page_size'
+    max_page_size = 500
+    cursor_query_param = 'cursor'
+    invalid_cursor_message = 'Curseur invalide.'
+
+    def paginate_queryset(self, queryset, request, view=None, field='id', descending=False):
+        self.request = request
+        self.field = field
+        self.descending = descending
+        page_size = self.get_page_size(request)
+        
+        queryset = queryset.order_by(*self._ordering())
+        position = self.decode_cursor(request)
+        if position is not None:
+            value, pk = position
+            lookup = 'lt' if descending else 'gt'
+            queryset = queryset.filter(
+                Q(**{f'{field}__{lookup}': value}) | Q(**{field: value, f'id__{lookup}': pk})
+            )
+        
+        rows = list(queryset[:page_size + 1])
+        self.has_next = len(rows) > page_size
+        self.page = rows[:page_size]
+        return self.page
+
+    def _ordering(self):
+        prefix = '-' if self.descending else ''
+        return (f'{prefix}{self.field}', f'{prefix}id')
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return max(1, min(size, self.max_page_size))
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            field, value, pk = json.loads(b64decode(encoded.encode('ascii')).decode('utf-8'))
+        except (TypeError, ValueError, UnicodeError):
+            raise NotFound(self.invalid_cursor_message)
+        if field != self._ordering()[0] or not isinstance(pk, int):
+            # Curseur émis pour un autre tri
+            raise NotFound(self.invalid_cursor_message)
+        return value, pk
+
+    def encode_cursor(self, row):
+        payload = [self._ordering()[0], self._value(row, self.field), self._value(row, 'id')]
+        encoded = b64encode(json.dumps(payload).encode('utf-8')).decode('ascii')
+        return replace_query_param(self.request.build_absolute_uri(), self.cursor_query_param, encoded)
+
+    @staticmethod
+    def _value(row, name):
+        return row[name] if isinstance(row, dict) else getattr(row, name)
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.page[-1])
+
+    def get_paginated_response(self, data, **extra):
+        return Response({'next': self.get_next_link(), **extra, 'results': data})
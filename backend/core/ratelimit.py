@@ -0,0 +1,165 @@
+"""
+Seaux à jetons (token buckets) partagés entre les workers d'un même hôte.
+
+Sans CACHES partagé, DRF compte les requêtes dans le cache LocMem de chaque
+processus : avec N workers gunicorn, la limite réelle est N fois la limite
+configurée. Ici, les compteurs vivent dans un fichier projeté en mémoire
+(mmap, de préférence sous /dev/shm), ouvert par chaque worker.
+
+Organisation du fichier : une table associative de THROTTLE_SLOTS cases de
+32 octets, groupées par ensembles de 8. Une clé (empreinte blake2b de
+64 bits) est rangée dans l'un des 8 emplacements de son ensemble ; si
+l'ensemble est plein, le seau le moins récemment utilisé est remplacé.
+Chaque vérification lit et écrit un seul ensemble, sous un verrou fcntl
+propre à l'ensemble (verrous répartis) : coût constant, quel que soit le
+nombre de clés.
+
+Le nom du fichier porte la version du format et le nombre d'ensembles : des
+workers de configurations différentes (déploiement progressif, THROTTLE_SLOTS
+modifié) ouvrent des tables distinctes, et une table projetée par un worker
+n'est jamais tronquée par un autre.
+"""
+import hashlib
+import math
+import mmap
+import os
+import struct
+import tempfile
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - hôte sans fcntl (Windows)
+    fcntl = None
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+
+
+MAGIC = b'BKTHRTL1'
+HEADER = struct.Struct('<8sQ')
+HEADER_SIZE = 64
+WAYS = 8
+SLOT = struct.Struct('<Qdd8x')
+SET = struct.Struct('<' + 'Qdd8x' * WAYS)
+LOCK_STRIPES = 256
+
+
+def available():
+    """True si les seaux partagés sont utilisables sur cet hôte."""
+    return fcntl is not None and getattr(settings, 'THROTTLE_SHARED_MEMORY', True)
+
+
+def default_path():
+    """Préfixe du fichier de la table : /dev/shm si disponible, sinon le répertoire temporaire."""
+    directory = '/dev/shm' if os.path.isdir('/dev/shm') else tempfile.gettempdir()
+    project = hashlib.blake2b(str(settings.BASE_DIR).encode(), digest_size=4).hexdigest()
+    return os.path.join(directory, f'booking-throttle-{project}')
+
+
+class SharedTokenBuckets:
+    """Table de seaux à jetons dans un fichier projeté en mémoire."""
+
+    def __init__(self, path, slots):
+        self.sets = max(1, slots // WAYS)
+        # Une table par format et par taille : jamais de troncature d'un fichier en service
+        self.path = f'{path}.{MAGIC.decode().lower()}.{self.sets}'
+        size = HEADER_SIZE + self.sets * SET.size
+
+        self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        self._local = threading.Lock()
+        fcntl.lockf(self._fd, fcntl.LOCK_EX)
+        try:
+            if os.fstat(self._fd).st_size == 0:
+                # Fichier neuf : dimensionné et initialisé par le premier worker
+                os.ftruncate(self._fd, size)
+                os.pwrite(self._fd, HEADER.pack(MAGIC, self.sets), 0)
+            valid = (
+                os.fstat(self._fd).st_size == size
+                and os.pread(self._fd, HEADER.size, 0) == HEADER.pack(MAGIC, self.sets)
+            )
+            if valid:
+                self._map = mmap.mmap(self._fd, size)
+        finally:
+            fcntl.lockf(self._fd, fcntl.LOCK_UN)
+
+        if not valid:
+            os.close(self._fd)
+            raise ImproperlyConfigured(f"{self.path} n'est pas une table de limitation de débit valide : supprimez-le.")
+
+    @staticmethod
+    def fingerprint(key):
+        # Empreinte stable d'un processus à l'autre (hash() ne l'est pas) ; 0 = case vide
+        return int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), 'little') or 1
+
+    def consume(self, key, capacity, period):
+        """
+        Retire un jeton du seau de `key` (capacity jetons, rechargé en `period` secondes).
+
+        Returns:
+            tuple: (autorisé, secondes à attendre avant le prochain jeton)
+        """
+        rate = capacity / period
+        fingerprint = self.fingerprint(key)
+        index = fingerprint % self.sets
+        offset = HEADER_SIZE + index * SET.size
+        stripe = index % LOCK_STRIPES
+
+        with self._local:
+            fcntl.lockf(self._fd, fcntl.LOCK_EX, 1, stripe)
+            try:
+                now = time.time()
+                values = SET.unpack_from(self._map, offset)
+                entries = [values[i:i + 3] for i in range(0, len(values), 3)]
+
+                way = None
+                for position, (owner, _, _) in enumerate(entries):
+                    if owner == fingerprint:
+                        way = position
+                        break
+                if way is None:
+                    # Nouveau seau : case vide, sinon le moins récemment utilisé
+                    way = min(range(WAYS), key=lambda position: (entries[position][0] != 0, entries[position][2]))
+                    tokens, updated = float(capacity), now
+                else:
+                    _, tokens, updated = entries[way]
+
+                tokens = min(float(capacity), tokens + max(0.0, now - updated) * rate)
+                allowed = tokens >= 1.0
+                if allowed:
+                    tokens -= 1.0
+                SLOT.pack_into(self._map, offset + way * SLOT.size, fingerprint, tokens, now)
+            finally:
+                fcntl.lockf(self._fd, fcntl.LOCK_UN, 1, stripe)
+
+        return allowed, 0.0 if allowed else math.ceil((1.0 - tokens) / rate * 1000) / 1000
+
+    def reset(self):
+        """Vide toutes les cases (tests, benchmarks)."""
+        with self._local:
+            fcntl.lockf(self._fd, fcntl.LOCK_EX)
+            try:
+                self._map[HEADER_SIZE:] = bytes(len(self._map) - HEADER_SIZE)
+            finally:
+                fcntl.lockf(self._fd, fcntl.LOCK_UN)
+
+
+_buckets = None
+_buckets_pid = None
+_buckets_lock = threading.Lock()
+
+
+def shared_buckets():
+    """Table du processus courant, ouverte au premier usage (après le fork des workers)."""
+    global _buckets, _buckets_pid
+    pid = os.getpid()
+    if _buckets_pid != pid:
+        with _buckets_lock:
+            if _buckets_pid != pid:
+                _buckets = SharedTokenBuckets(
+                    getattr(settings, 'THROTTLE_SHM_PATH', None) or default_path(),
+                    getattr(settings, 'THROTTLE_SLOTS', 65536),
+                )
+                _buckets_pid = pid
+    return _buckets
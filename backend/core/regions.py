@@ -0,0 +1,122 @@
+"""
+Catalogue des régions (axes) en mémoire, partagé par les vues du processus.
+
+Les régions ne changent que par l'admin ou la commande setup_axes : au lieu
+d'interroger la table à chaque requête, les vues lisent un instantané
+immuable (ordre par nom, id -> nom, nombre). Il est chargé au premier accès
+et remplacé :
+- immédiatement dans le worker qui écrit (signaux de Region, bookings/signals.py) ;
+- dans les autres workers dès que la version 'regions' (core.versioning)
+  fournie par la vue diffère, ou sinon après REGION_CATALOG_TTL secondes.
+"""
+import threading
+import time
+from collections import namedtuple
+from types import MappingProxyType
+
+from django.conf import settings
+
+
+CatalogRegion = namedtuple('CatalogRegion', ['id', 'name'])
+
+
+class RegionSnapshot:
+    """Instantané immuable du catalogue des régions."""
+    __slots__ = ('regions', 'names', 'version', 'loaded_at')
+
+    def __init__(self, regions, version=None):
+        self.regions = tuple(CatalogRegion(region_id, name) for region_id, name in regions)
+        self.names = MappingProxyType({region.id: region.name for region in self.regions})
+        self.version = version
+        self.loaded_at = time.monotonic()
+
+    def __iter__(self):
+        """Régions (id, name) triées par nom."""
+        return iter(self.regions)
+
+    def __len__(self):
+        return len(self.regions)
+
+    def __contains__(self, region_id):
+        return region_id in self.names
+
+    @property
+    def count(self):
+        return len(self.regions)
+
+    def get(self, region_id):
+        """Retourne CatalogRegion(id, name) ou None."""
+        name = self.names.get(region_id)
+        return None if name is None else CatalogRegion(region_id, name)
+
+    def as_list(self):
+        """Sérialisation identique à RegionSerializer : [{'id', 'name'}]."""
+        return [{'id': region.id, 'name': region.name} for region in self.regions]
+
+
+class RegionCatalog:
+    """Fournit l'instantané courant, rechargé si invalidé ou périmé."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._snapshot = None
+
+    @property
+    def ttl(self):
+        return getattr(settings, 'REGION_CATALOG_TTL', 60)
+
+    @staticmethod
+    def _queryset():
+        from bookings.models import Region
+
+        return Region.objects.order_by('name').values_list('id', 'name')
+
+    def _load(self, version):
+        return RegionSnapshot(self._queryset(), version)
+
+    def _is_fresh(self, snapshot, version):
+        if snapshot is None:
+            return False
+        if version is not None:
+            return snapshot.version == version
+        return time.monotonic() - snapshot.loaded_at <= self.ttl
+
+    def snapshot(self, version=None):
+        """
+        Retourne l'instantané du catalogue.
+
+        Args:
+            version: Version 'regions' courante (core.versioning). Si fournie,
+                le catalogue est rechargé quand elle diffère, sinon la TTL s'applique.
+
+        Returns:
+            RegionSnapshot
+        """
+        snapshot = self._snapshot
+        if self._is_fresh(snapshot, version):
+            return snapshot
+
+        with self._lock:
+            if self._snapshot is snapshot:
+                self._snapshot = self._load(version)
+            return self._snapshot
+
+    async def asnapshot(self, version=None):
+        """Variante asynchrone de snapshot() : rechargement par l'ORM asynchrone."""
+        snapshot = self._snapshot
+        if self._is_fresh(snapshot, version):
+            return snapshot
+
+        # Pas de verrou pendant la requête : au pire deux chargements concurrents
+        loaded = RegionSnapshot([region async for region in self._queryset()], version)
+        with self._lock:
+            if self._snapshot is snapshot:
+                self._snapshot = loaded
+        return loaded
+
+    def invalidate(self):
+        """Oublie l'instantané ; rechargé au prochain accès."""
+        self._snapshot = None
+
+
+region_catalog = RegionCatalog()
@@ -1,3 +1,239 @@
-from django.test import TestCase
+import asyncio
+import os
+import tempfile
+from datetime import date, timedelta
+from unittest import mock, skipUnless
 
-# Create your tests here.
+from django.core.exceptions import ImproperlyConfigured
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from accounts.models import User
+from bookings.models import Booking, Region
+from . import ratelimit
+from .availability import AvailabilityIndex
+from .events import SUBSCRIBER_QUEUE_SIZE, EventHub
+from .iso_calendar import MAX_YEAR, MIN_YEAR, next_week, week_date_range, weeks_in_year, year_weeks
+from .throttles import BurstRateThrottle
+from .utils import parse_iso_week
+
+
+def _event(year=2026, event_type='booking.created'):
+    return {
+        'type': event_type,
+        'booking': {'region_id': 1, 'year': year, 'week': 10, 'id': 1, 'booked_by': 'dg@example.com'},
+        'previous': None,
+        'years': [year],
+    }
+
+
+class EventHubTests(SimpleTestCase):
+    def setUp(self):
+        self.hub = EventHub()
+
+    async def test_publish_reaches_subscribers_of_the_year(self):
+        admin = self.hub.subscribe(2026, is_admin=True)
+        other_year = self.hub.subscribe(2027, is_admin=True)
+        self.hub.publish(_event())
+        payload = await asyncio.wait_for(admin.queue.get(), 1)
+        self.assertEqual(payload['type'], 'booking.created')
+        self.assertEqual(payload['booking']['booked_by'], 'dg@example.com')
+        self.assertNotIn('years', payload)
+        await asyncio.sleep(0)
+        self.assertTrue(other_year.queue.empty())
+
+    async def test_dg_never_receives_owner_email(self):
+        dg = self.hub.subscribe(2026, is_admin=False)
+        self.hub.publish(_event())
+        payload = await asyncio.wait_for(dg.queue.get(), 1)
+        self.assertIsNone(payload['booking']['booked_by'])
+
+    async def test_publish_from_another_thread(self):
+        subscription = self.hub.subscribe(2026, is_admin=True)
+        await asyncio.to_thread(self.hub.publish, _event())
+        payload = await asyncio.wait_for(subscription.queue.get(), 1)
+        self.assertEqual(payload['booking']['week'], 10)
+
+    async def test_slow_subscriber_is_asked_to_resync(self):
+        subscription = self.hub.subscribe(2026, is_admin=True)
+        for _ in range(SUBSCRIBER_QUEUE_SIZE + 1):
+            self.hub.publish(_event())
+        await asyncio.sleep(0)
+        self.assertEqual(subscription.queue.qsize(), 1)
+        self.assertEqual(subscription.queue.get_nowait(), {'type': 'resync'})
+
+    async def test_unsubscribe_stops_delivery(self):
+        subscription = self.hub.subscribe(2026, is_admin=True)
+        self.hub.unsubscribe(subscription)
+        self.assertEqual(self.hub.subscriber_count, 0)
+        self.hub.publish(_event())
+        await asyncio.sleep(0)
+        self.assertTrue(subscription.queue.empty())
+
+
+class AvailabilityIndexTests(TestCase):
+    def setUp(self):
+        self.index = AvailabilityIndex()
+        self.dg = User.objects.create_user('dg@example.com', 'password123')
+        self.region = Region.objects.create(name='Axe de test')
+
+    def book(self, year, week):
+        return Booking.objects.create(user=self.dg, region=self.region, year=year, week=week)
+
+    def test_year_is_loaded_in_one_query(self):
+        self.book(2026, 1)
+        self.book(2026, 53)
+        with self.assertNumQueries(1):
+            entry = self.index.year(2026)
+        self.assertTrue(entry.is_booked(self.region.pk, 1))
+        self.assertTrue(entry.is_booked(self.region.pk, 53))
+        self.assertFalse(entry.is_booked(self.region.pk, 2))
+        self.assertEqual(entry.booked_weeks(self.region.pk), [1, 53])
+        self.assertEqual(entry.bitstring(self.region.pk, [1, 2, 53]), '101')
+        self.assertEqual(entry.booked_by(self.region.pk, 1), 'dg@example.com')
+        self.assertEqual(entry.week_owners(53), {self.region.pk: 'dg@example.com'})
+
+    def test_add_and_remove_update_a_loaded_year(self):
+        self.index.year(2026)
+        self.index.add(self.region.pk, 2026, 5, 'dg@example.com')
+        with self.assertNumQueries(0):
+            entry = self.index.year(2026)
+        self.assertTrue(entry.is_booked(self.region.pk, 5))
+        self.index.remove(self.region.pk, 2026, 5)
+        self.assertFalse(self.index.year(2026).is_booked(self.region.pk, 5))
+
+    def test_writes_do_not_mutate_a_snapshot_being_read(self):
+        entry = self.index.year(2026)
+        owners = entry.owners
+        self.index.add(self.region.pk, 2026, 5, 'dg@example.com')
+        self.assertEqual(owners, {})
+        self.assertIn((self.region.pk, 5), entry.owners)
+
+    def test_new_version_reloads_the_year(self):
+        self.index.year(2026, version=1)
+        self.book(2026, 7)
+        with self.assertNumQueries(0):
+            self.assertFalse(self.index.year(2026, version=1).is_booked(self.region.pk, 7))
+        self.assertTrue(self.index.year(2026, version=2).is_booked(self.region.pk, 7))
+
+    @override_settings(AVAILABILITY_INDEX_TTL=0)
+    def test_unversioned_year_expires_after_ttl(self):
+        self.index.year(2026)
+        self.book(2026, 8)
+        self.assertTrue(self.index.year(2026).is_booked(self.region.pk, 8))
+
+    @override_settings(AVAILABILITY_INDEX_YEARS=2)
+    def test_least_recently_read_year_is_evicted(self):
+        for year in (2024, 2025):
+            self.index.year(year)
+        self.index.year(2024)
+        self.index.year(2026)
+        with self.assertNumQueries(0):
+            self.index.year(2024)
+            self.index.year(2026)
+        with self.assertNumQueries(1):
+            self.index.year(2025)
+
+
+
+class IsoCalendarTests(SimpleTestCase):
+    def test_week_counts_match_the_iso_calendar(self):
+        for year in range(MIN_YEAR, MAX_YEAR + 1):
+            # Le 28 décembre est toujours dans la dernière semaine ISO de l'année
+            self.assertEqual(weeks_in_year(year), date(year, 12, 28).isocalendar()[1], year)
+
+    def test_known_53_week_years(self):
+        self.assertEqual(weeks_in_year(2020), 53)
+        self.assertEqual(weeks_in_year(2026), 53)
+        self.assertEqual(weeks_in_year(2027), 52)
+        self.assertEqual(list(year_weeks(2026))[-1], 53)
+
+    def test_out_of_range_year_is_rejected(self):
+        with self.assertRaises(ValueError):
+            weeks_in_year(MIN_YEAR - 1)
+        with self.assertRaises(ValueError):
+            week_date_range(MAX_YEAR + 1, 1)
+
+    def test_week_date_range(self):
+        self.assertEqual(week_date_range(2026, 1), (date(2025, 12, 29), date(2026, 1, 4)))
+        monday, sunday = week_date_range(2026, 53)
+        self.assertEqual(monday.isocalendar()[:2], (2026, 53))
+        self.assertEqual(sunday - monday, timedelta(days=6))
+
+    def test_next_week_crosses_years(self):
+        self.assertEqual(next_week(2026, 52), (2026, 53))
+        self.assertEqual(next_week(2026, 53), (2027, 1))
+        self.assertEqual(next_week(2027, 52), (2028, 1))
+
+    def test_parse_iso_week(self):
+        self.assertEqual(parse_iso_week('2026-W53'), (2026, 53))
+        for value in ('2027-W53', '2026-W00', '1999-W10', '2026-53', ''):
+            with self.assertRaises(ValueError, msg=value):
+                parse_iso_week(value)
+
+
+@skipUnless(ratelimit.fcntl is not None, 'verrous fcntl indisponibles')
+class SharedTokenBucketsTests(SimpleTestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, 'throttle')
+        self.now = 1_000_000.0
+        clock = mock.patch('core.ratelimit.time.time', side_effect=lambda: self.now)
+        clock.start()
+        self.addCleanup(clock.stop)
+
+    def buckets(self, slots=64):
+        return ratelimit.SharedTokenBuckets(self.path, slots)
+
+    def test_capacity_then_refill(self):
+        buckets = self.buckets()
+        self.assertEqual([buckets.consume('user:1', 3, 60)[0] for _ in range(4)], [True, True, True, False])
+        self.assertEqual(buckets.consume('user:1', 3, 60), (False, 20.0))
+        self.assertTrue(buckets.consume('user:2', 3, 60)[0])
+        self.now += 20
+        self.assertTrue(buckets.consume('user:1', 3, 60)[0])
+        self.assertFalse(buckets.consume('user:1', 3, 60)[0])
+
+    def test_workers_share_the_same_buckets(self):
+        first, second = self.buckets(), self.buckets()
+        self.assertTrue(first.consume('user:1', 2, 60)[0])
+        self.assertTrue(second.consume('user:1', 2, 60)[0])
+        self.assertFalse(first.consume('user:1', 2, 60)[0])
+
+    def test_least_recently_used_bucket_is_replaced_when_the_set_is_full(self):
+        buckets = self.buckets(slots=ratelimit.WAYS)
+        for key in range(ratelimit.WAYS):
+            buckets.consume(f'user:{key}', 1, 60)
+            self.now += 1
+        # Ensemble plein : le seau le plus ancien (user:0) est remplacé par un seau neuf
+        self.assertTrue(buckets.consume('user:new', 1, 60)[0])
+        self.assertTrue(buckets.consume('user:0', 1, 60)[0])
+        self.assertFalse(buckets.consume(f'user:{ratelimit.WAYS - 1}', 1, 60)[0])
+
+    def test_table_size_is_part_of_the_file_name(self):
+        self.assertNotEqual(self.buckets(slots=64).path, self.buckets(slots=128).path)
+
+    def test_foreign_file_is_refused(self):
+        path = self.buckets().path
+        with open(path, 'r+b') as table:
+            table.write(b'XXXXXXXX')
+        with self.assertRaises(ImproperlyConfigured):
+            self.buckets()
+
+
+@skipUnless(ratelimit.fcntl is not None, 'verrous fcntl indisponibles')
+class SharedThrottleTests(TestCase):
+    def setUp(self):
+        ratelimit.shared_buckets().reset()
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user('dg@example.com', 'password123'))
+
+    def test_burst_limit_answers_429(self):
+        rates = dict(BurstRateThrottle.THROTTLE_RATES, burst='2/minute')
+        with mock.patch.object(BurstRateThrottle, 'THROTTLE_RATES', rates):
+            codes = [
+                self.client.get(reverse('bookings:booking-my'), secure=True).status_code for _ in range(3)
+            ]
+        self.assertEqual(codes, [200, 200, 429])
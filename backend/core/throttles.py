@@ -1,10 +1,51 @@
 """
 Throttling personnalisé pour la protection anti-DDoS.
+
+Les compteurs sont partagés entre les workers du même hôte (core/ratelimit.py) :
+la limite configurée est la limite réelle, quel que soit le nombre de workers.
+Avec THROTTLE_SHARED_MEMORY=False (ou sans fcntl), retour au cache Django.
 """
 from rest_framework.throttling import AnonRateThrottle, UserRateThrottle
 
+from . import ratelimit
+
+
+class SharedRateThrottleMixin:
+    """
+    Remplace l'historique des requêtes en cache de SimpleRateThrottle par un
+    seau à jetons partagé : même taux moyen (num_requests par duration), coût
+    constant par vérification.
+    """
+
+    def allow_request(self, request, view):
+        if not ratelimit.available():
+            return super().allow_request(request, view)
+
+        if self.rate is None:
+            return True
+
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        allowed, self._wait = ratelimit.shared_buckets().consume(self.key, self.num_requests, self.duration)
+        return allowed
+
+    def wait(self):
+        if not ratelimit.available():
+            return super().wait()
+        return self._wait
+
+
+class SharedAnonRateThrottle(SharedRateThrottleMixin, AnonRateThrottle):
+    """Limite 'anon' des visiteurs anonymes, partagée entre les workers."""
+
+
+class SharedUserRateThrottle(SharedRateThrottleMixin, UserRateThrottle):
+    """Limite 'user' des utilisateurs authentifiés, partagée entre les workers."""
+
 
-class LoginRateThrottle(AnonRateThrottle):
+class LoginRateThrottle(SharedRateThrottleMixin, AnonRateThrottle):
     """
     Limite les tentatives de connexion à 5/minute par IP.
     Protège contre les attaques par force brute sur l'authentification.
@@ -12,15 +53,16 @@ class LoginRateThrottle(AnonRateThrottle):
     scope = 'login'
 
 
-class BurstRateThrottle(AnonRateThrottle):
+class BurstRateThrottle(SharedRateThrottleMixin, UserRateThrottle):
     """
     Protection contre les rafales de requêtes (burst).
     Limite stricte pour détecter les attaques DDoS.
+    Par utilisateur une fois authentifié, par IP sinon.
     """
     scope = 'burst'
 
 
-class SustainedRateThrottle(UserRateThrottle):
+class SustainedRateThrottle(SharedRateThrottleMixin, UserRateThrottle):
     """
     Limite de requêtes soutenues pour les utilisateurs authentifiés.
     """
@@ -1,11 +1,18 @@
 """
 Utilitaires pour la génération de fichiers .ics et calculs métier.
+
+icalendar n'est importé qu'au premier rendu ICS (démarrage des workers plus
+rapide, voir manage.py startup_profile).
 """
-from datetime import datetime, timedelta
-from dateutil.relativedelta import relativedelta
-from icalendar import Calendar, Event
+import re
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from datetime import date, datetime, timedelta
 from django.conf import settings
 
+from .iso_calendar import is_supported_year, week_monday_ordinal, weeks_in_year
+
 
 def get_week_date_range(year, week):
     """
@@ -18,19 +25,12 @@ def get_week_date_range(year, week):
     Returns:
         tuple: (date_debut (lundi), date_fin (dimanche))
     """
-    # Premier jour de l'année
-    jan1 = datetime(year, 1, 1)
-    
-    # Ajuster pour que le lundi soit le premier jour
-    # ISO week: semaine 1 contient le premier jeudi de l'année
-    thursday_offset = (3 - jan1.weekday()) % 7
-    first_thursday = jan1 + timedelta(days=thursday_offset)
-    
-    # Calculer le lundi de la semaine ISO 1
-    first_monday = first_thursday - timedelta(days=3)
-    
-    # Calculer le lundi de la semaine demandée
-    week_start = first_monday + timedelta(weeks=week - 1)
+    # Table précalculée pour 2000-2100, calcul direct (même arithmétique) au-delà
+    if is_supported_year(year):
+        week_start = datetime.fromordinal(week_monday_ordinal(year, week))
+    else:
+        first_monday = datetime.fromordinal(date.fromisocalendar(year, 1, 1).toordinal())
+        week_start = first_monday + timedelta(weeks=week - 1)
     
     # Le dimanche est 6 jours après le lundi
     week_end = week_start + timedelta(days=6)
@@ -38,6 +38,96 @@ def get_week_date_range(year, week):
     return week_start, week_end
 
 
+ISO_WEEK_PATTERN = re.compile(r'^(\d{4})-W(\d{1,2})$')
+
+
+def parse_iso_week(value):
+    """
+    Analyse une semaine ISO au format AAAA-Www (ex: 2026-W40).
+    
+    Args:
+        value: Chaîne à analyser
+    
+    Returns:
+        tuple: (année, semaine)
+    
+    Raises:
+        ValueError: si le format, l'année (2000-2100) ou la semaine (selon l'année) est invalide
+    """
+    match = ISO_WEEK_PATTERN.match(value or '')
+    if not match:
+        raise ValueError(f"Semaine ISO invalide : {value!r}")
+    
+    year, week = int(match.group(1)), int(match.group(2))
+    if not is_supported_year(year) or not 1 <= week <= weeks_in_year(year):
+        raise ValueError(f"Semaine ISO hors limites : {value!r}")
+    
+    return year, week
+
+
+class IcsRenderCache:
+    """
+    Cache LRU borné des événements VEVENT déjà rendus (octets).
+    
+    Clé : (id de réservation, avec/sans organisateur). L'état rendu (axe, année,
+    semaine, organisateur) est conservé avec les octets : une réservation
+    modifiée est re-rendue, et les signaux de Booking invalident l'entrée.
+    """
+    
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def event(self, booking, user_email):
+        """Retourne les octets du VEVENT de la réservation (rendu si nécessaire)."""
+        key = (booking.id, user_email is not None)
+        state = (booking.region_id, booking.region.name, booking.year, booking.week, user_email)
+        
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[0] == state:
+                self._entries.move_to_end(key)
+                return entry[1]
+        
+        content = _build_event(booking, user_email).to_ical()
+        with self._lock:
+            self._entries[key] = (state, content)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return content
+    
+    def invalidate(self, booking_id):
+        """Oublie les rendus d'une réservation (modifiée ou supprimée)."""
+        with self._lock:
+            self._entries.pop((booking_id, True), None)
+            self._entries.pop((booking_id, False), None)
+    
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+ics_cache = IcsRenderCache(getattr(settings, 'ICS_CACHE_SIZE', 4096))
+
+
+@lru_cache(maxsize=64)
+def _calendar_envelope(name=None):
+    """Retourne (en-tête, pied) d'un VCALENDAR, entre lesquels insérer les VEVENT."""
+    from icalendar import Calendar
+    
+    cal = Calendar()
+    cal.add('prodid', '-//Booking System//Senegal Regions//FR')
+    cal.add('version', '2.0')
+    if name:
+        cal.add('x-wr-calname', name)
+    
+    content = cal.to_ical()
+    footer = b'END:VCALENDAR\r\n'
+    return content[:-len(footer)], footer
+
+
 def generate_ics_file(booking, user_email):
     """
     Génère un fichier .ics pour une réservation.
@@ -47,16 +137,49 @@ def generate_ics_file(booking, user_email):
         user_email: Email de l'utilisateur
     
     Returns:
-        str: Contenu du fichier .ics
+        bytes: Contenu du fichier .ics
     """
-    week_start, week_end = get_week_date_range(booking.year, booking.week)
+    return generate_ics_calendar([booking], user_emails={booking.id: user_email})
+
+
+def generate_ics_calendar(bookings, name=None, include_organizer=True, user_emails=None):
+    """
+    Génère en une passe un calendrier regroupant plusieurs réservations.
     
-    # Créer le calendrier
-    cal = Calendar()
-    cal.add('prodid', '-//Booking System//Senegal Regions//FR')
-    cal.add('version', '2.0')
+    Les VEVENT déjà rendus sont repris du cache (ics_cache) : seul l'en-tête
+    du calendrier est construit à chaque appel.
+    
+    Args:
+        bookings: Itérable de Booking (region et user préchargés)
+        name: Nom affiché du calendrier (optionnel)
+        include_organizer: False pour masquer les emails (DG)
+        user_emails: {booking_id: email} pour forcer l'organisateur (optionnel)
+    
+    Returns:
+        bytes: Contenu du fichier .ics
+    """
+    header, footer = _calendar_envelope(name)
+    parts = [header]
+    
+    for booking in bookings:
+        if not include_organizer:
+            user_email = None
+        elif user_emails and booking.id in user_emails:
+            user_email = user_emails[booking.id]
+        else:
+            user_email = booking.user.email
+        parts.append(ics_cache.event(booking, user_email))
+    
+    parts.append(footer)
+    return b''.join(parts)
+
+
+def _build_event(booking, user_email):
+    """Construit l'événement iCalendar d'une réservation."""
+    from icalendar import Event
+    
+    week_start, week_end = get_week_date_range(booking.year, booking.week)
     
-    # Créer l'événement
     event = Event()
     event.add('summary', f'Réservation - {booking.region.name}')
     event.add('description', 
@@ -66,20 +189,20 @@ def generate_ics_file(booking, user_email):
     event.add('dtstamp', datetime.now())
     event.add('uid', f'booking-{booking.id}@booking-system')
     event.add('location', booking.region.name)
-    event.add('organizer', user_email)
+    if user_email:
+        event.add('organizer', user_email)
     
-    cal.add_component(event)
-    
-    return cal.to_ical()
+    return event
 
 
 def calculate_coverage_rate(user):
     """
     Calcule le taux de couverture d'un utilisateur.
     
-    Le taux correspond au nombre de régions distinctes réservées / 14 * 100
+    Le taux correspond au nombre de régions distinctes réservées / nombre de régions * 100
     
-    Optimisé : utilise l'index sur user pour une requête rapide.
+    Optimisé : lit les compteurs de couverture (UserRegionCount) au lieu de
+    parcourir les réservations.
     
     Args:
         user: Instance de User
@@ -87,11 +210,25 @@ def calculate_coverage_rate(user):
     Returns:
         float: Taux de couverture (0-100)
     """
-    from bookings.models import Booking
+    from bookings.models import UserRegionCount
+    
+    return coverage_rate(UserRegionCount.regions_count(user.pk))
+
+
+def coverage_rate(distinct_regions, total_regions=None):
+    """
+    Calcule un taux de couverture à partir d'un nombre de régions déjà connu.
+    
+    Args:
+        distinct_regions: Nombre de régions distinctes réservées
+        total_regions: Dénominateur (défaut : nombre de régions du catalogue)
     
-    # Utilise l'index sur user pour optimiser la requête
-    distinct_regions = Booking.objects.filter(user=user).values_list('region', flat=True).distinct().count()
-    total_regions = getattr(settings, 'TOTAL_REGIONS', 7)
+    Returns:
+        float: Taux de couverture (0-100)
+    """
+    if total_regions is None:
+        from .regions import region_catalog
+        total_regions = region_catalog.snapshot().count
     
     if total_regions == 0:
         return 0.0
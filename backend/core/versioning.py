@@ -0,0 +1,89 @@
+"""
+Compteurs de version des données, incrémentés à chaque écriture.
+
+Partagés par tous les workers via la table DataVersion : une lecture de
+version est une recherche par clé primaire, bien moins coûteuse que les
+requêtes et la sérialisation qu'elle permet d'éviter (ETag, index).
+"""
+from django.db import IntegrityError, transaction
+from django.db.models import F, Sum
+
+from .models import DataVersion
+
+
+# Préfixe des périmètres annuels des réservations (pas de version globale :
+# chaque écriture verrouillerait la même ligne)
+BOOKINGS_SCOPE = 'bookings'
+REGIONS_SCOPE = 'regions'
+
+
+def bookings_year_scope(year):
+    """Retourne le périmètre de version des réservations d'une année."""
+    return f'{BOOKINGS_SCOPE}:{year}'
+
+
+def bump_versions(*scopes):
+    """
+    Incrémente atomiquement la version de chaque périmètre.
+    
+    Args:
+        scopes: Périmètres à incrémenter (doublons ignorés)
+    """
+    scopes = list(dict.fromkeys(scopes))
+    updated = DataVersion.objects.filter(scope__in=scopes).update(version=F('version') + 1)
+    if updated == len(scopes):
+        return
+    
+    # Premier incrément d'un périmètre : création de la ligne
+    existing = set(DataVersion.objects.filter(scope__in=scopes).values_list('scope', flat=True))
+    for scope in scopes:
+        if scope in existing:
+            continue
+        try:
+            with transaction.atomic():
+                DataVersion.objects.create(scope=scope, version=1)
+        except IntegrityError:
+            # Créé entre-temps par une écriture concurrente
+            DataVersion.objects.filter(scope=scope).update(version=F('version') + 1)
+
+
+def bump_booking_versions(*years):
+    """
+    Incrémente la version des réservations de chaque année.
+    
+    À appeler après validation (transaction.on_commit) : la ligne de version
+    n'est pas verrouillée pendant la transaction de l'écriture.
+    """
+    bump_versions(*(bookings_year_scope(year) for year in years))
+
+
+def bookings_version():
+    """
+    Version de l'ensemble des réservations (toutes années) : somme des
+    versions annuelles, qui augmente à chaque écriture.
+    """
+    return DataVersion.objects.filter(
+        scope__startswith=bookings_year_scope('')
+    ).aggregate(total=Sum('version'))['total'] or 0
+
+
+def get_versions(*scopes):
+    """
+    Retourne les versions courantes en une seule requête.
+    
+    Returns:
+        dict: {périmètre: version} (0 si jamais écrit)
+    """
+    versions = dict.fromkeys(scopes, 0)
+    versions.update(
+        DataVersion.objects.filter(scope__in=scopes).values_list('scope', 'version')
+    )
+    return versions
+
+
+async def aget_versions(*scopes):
+    """Variante asynchrone de get_versions (ORM asynchrone, vues ASGI)."""
+    versions = dict.fromkeys(scopes, 0)
+    async for scope, version in DataVersion.objects.filter(scope__in=scopes).values_list('scope', 'version'):
+        versions[scope] = version
+    return versions
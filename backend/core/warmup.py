@@ -0,0 +1,54 @@
+"""
+Préchauffage des caches d'un worker avant qu'il n'accepte du trafic.
+
+Appelé par le hook post_worker_init de gunicorn (gunicorn.conf.py) et mesuré
+par manage.py startup_profile : catalogue des axes, table des semaines ISO et
+index de disponibilité de l'année en cours sont chargés d'avance, au lieu de
+l'être par les premières requêtes après un déploiement ou un recyclage.
+"""
+import time
+from datetime import date
+
+from django.db import connections
+
+
+def warm_up(years=None):
+    """
+    Charge les caches en mémoire du processus.
+
+    Args:
+        years: Années de l'index de disponibilité à charger (défaut : année ISO en cours)
+
+    Returns:
+        dict: {étape: durée en millisecondes}
+    """
+    from core.availability import availability_index
+    # Table des semaines ISO calculée à l'import du module
+    from core.iso_calendar import is_supported_year
+    from core.regions import region_catalog
+    from core.versioning import REGIONS_SCOPE, bookings_year_scope, get_versions
+
+    if years is None:
+        years = [date.today().isocalendar().year]
+    years = [year for year in years if is_supported_year(year)]
+
+    timings = {}
+    start = time.perf_counter()
+    try:
+        versions = get_versions(REGIONS_SCOPE, *(bookings_year_scope(year) for year in years))
+        timings['versions'] = (time.perf_counter() - start) * 1000
+
+        step = time.perf_counter()
+        region_catalog.snapshot(versions[REGIONS_SCOPE])
+        timings['regions'] = (time.perf_counter() - step) * 1000
+
+        step = time.perf_counter()
+        for year in years:
+            availability_index.year(year, versions[bookings_year_scope(year)])
+        timings['availability'] = (time.perf_counter() - step) * 1000
+    finally:
+        # Pas de connexion ouverte hors du cycle des requêtes (thread différent sous ASGI)
+        connections.close_all()
+
+    timings['total'] = (time.perf_counter() - start) * 1000
+    return timings
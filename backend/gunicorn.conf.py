@@ -0,0 +1,68 @@
+"""
+Configuration gunicorn (chargée automatiquement depuis le répertoire courant).
+
+SERVER_PROFILE choisit le profil de déploiement :
+- wsgi (défaut) : workers synchrones, config.wsgi ;
+- asgi : workers uvicorn, config.asgi. Les vues de lecture asynchrones et le
+  flux SSE (/api/bookings/events/) n'occupent plus un worker par client :
+  un processus tient des centaines de connexions de consultation. Un seul
+  worker : le hub d'événements du flux SSE (core/events.py) est local au
+  processus, un client abonné auprès d'un worker ne verrait pas les
+  réservations traitées par les autres.
+
+Démarrage à froid : l'application est importée une fois dans le maître
+(GUNICORN_PRELOAD, partagée par copie à l'écriture entre les workers), puis
+chaque worker préchauffe ses caches (core/warmup.py) avant d'accepter des
+requêtes (GUNICORN_WARMUP). Mesure : manage.py startup_profile
+"""
+import os
+
+
+GUNICORN_WORKERS = int(os.environ.get('GUNICORN_WORKERS', '3'))
+SERVER_PROFILE = os.environ.get('SERVER_PROFILE', 'wsgi')
+
+if SERVER_PROFILE == 'asgi':
+    wsgi_app = 'config.asgi:application'
+    worker_class = 'uvicorn_worker.UvicornWorker'
+    if 'GUNICORN_WORKERS' in os.environ and GUNICORN_WORKERS != 1:
+        raise RuntimeError(
+            "SERVER_PROFILE=asgi demande un seul worker (hub d'événements local au processus) : "
+            f"GUNICORN_WORKERS={GUNICORN_WORKERS} n'est pas pris en charge."
+        )
+    workers = 1
+else:
+    wsgi_app = 'config.wsgi:application'
+    worker_class = 'sync'
+    workers = GUNICORN_WORKERS
+
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:8000')
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', '60'))
+loglevel = 'info'
+accesslog = '-'
+errorlog = '-'
+forwarded_allow_ips = '*'
+max_requests = int(os.environ.get('GUNICORN_MAX_REQUESTS', '0'))
+max_requests_jitter = int(os.environ.get('GUNICORN_MAX_REQUESTS_JITTER', '0'))
+preload_app = os.environ.get('GUNICORN_PRELOAD', 'True') == 'True'
+
+WARMUP = os.environ.get('GUNICORN_WARMUP', 'True') == 'True'
+
+
+def post_worker_init(worker):
+    """Préchauffe les caches du worker (après le fork, avant la première requête)."""
+    if not WARMUP:
+        return
+
+    # Import tardif : Django est configuré par le chargement de l'application
+    from core.warmup import warm_up
+
+    try:
+        timings = warm_up()
+    except Exception:
+        # Base indisponible au démarrage : les caches se rempliront à la demande
+        worker.log.exception("Préchauffage du worker %s impossible", worker.pid)
+        return
+    worker.log.info(
+        "Worker %s préchauffé en %.1f ms (%s)", worker.pid, timings['total'],
+        ', '.join(f'{step} {duration:.1f} ms' for step, duration in timings.items() if step != 'total'),
+    )
@@ -2,13 +2,25 @@ import apiClient from './apiClient';
 
 class AdminService {
   /**
-   * Obtenir toutes les réservations (paginé)
-   * @param {number} page 
+   * Obtenir toutes les réservations (paginé par curseur)
+   * @param {string|null} pageUrl Lien next/previous d'une page précédente, ou null pour la première page
    * @param {number} pageSize 
    */
-  async getAllBookings(page = 1, pageSize = 50) {
-    const response = await apiClient.get('/admin/bookings/', {
-      params: { page, page_size: pageSize },
+  async getAllBookings(pageUrl = null, pageSize = 50) {
+    // Les liens next/previous portent déjà le curseur et page_size
+    const response = pageUrl
+      ? await apiClient.get(pageUrl)
+      : await apiClient.get('/admin/bookings/', { params: { page_size: pageSize } });
+    return response.data;
+  }
+
+  /**
+   * Obtenir l'occupation des créneaux (nombre de réservations par année)
+   * @param {number} year 
+   */
+  async getOccupancy(year) {
+    const response = await apiClient.get('/admin/analytics/occupancy/', {
+      params: { year, top: 0 },
     });
     return response.data;
   }
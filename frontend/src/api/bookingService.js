@@ -91,6 +91,17 @@ class BookingService {
     });
     return response.data;
   }
+
+  /**
+   * Obtenir tous les créneaux (régions × semaines) d'une année
+   * @param {number} year 
+   */
+  async getAllSlots(year) {
+    const response = await apiClient.get('/bookings/all-slots/', {
+      params: { year },
+    });
+    return response.data;
+  }
 }
 
 export default new BookingService();
\ No newline at end of file
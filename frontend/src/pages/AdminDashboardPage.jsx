@@ -19,7 +19,9 @@ const AdminDashboardPage = () => {
   const [regions, setRegions] = useState([]);
   const [users, setUsers] = useState([]);
   const [weekAvailability, setWeekAvailability] = useState({});
-  const [pagination, setPagination] = useState({ count: 0, next: null, previous: null });
+  const [pagination, setPagination] = useState({ next: null, previous: null });
+  const [totalBookings, setTotalBookings] = useState(0);
+  const [bookingsLoading, setBookingsLoading] = useState(false);
 
   const currentYear = getCurrentYear();
 
@@ -32,8 +34,9 @@ const AdminDashboardPage = () => {
       setLoading(true);
       setError('');
 
-      const [bookingsData, coverageData, regionsData, usersData] = await Promise.all([
-        adminService.getAllBookings(1, 100),
+      const [bookingsData, occupancyData, coverageData, regionsData, usersData] = await Promise.all([
+        adminService.getAllBookings(null, 100),
+        adminService.getOccupancy(currentYear),
         adminService.getAllCoverage(),
         bookingService.getRegions(),
         adminService.getAllUsers().catch(() => []),
@@ -41,12 +44,9 @@ const AdminDashboardPage = () => {
 
       const regionsList = regionsData?.results ?? regionsData ?? [];
       
-      setAllBookings(bookingsData.results || bookingsData);
-      setPagination({
-        count: bookingsData.count,
-        next: bookingsData.next,
-        previous: bookingsData.previous,
-      });
+      applyBookingsPage(bookingsData);
+      // Pas de COUNT(*) sur la liste paginée par curseur : total issu des agrégats d'occupation
+      setTotalBookings(occupancyData.occupancy?.[0]?.booked ?? 0);
       setAllCoverage(coverageData);
       setRegions(regionsList);
       setUsers(usersData?.results ?? usersData ?? []);
@@ -61,6 +61,26 @@ const AdminDashboardPage = () => {
     }
   };
 
+  const applyBookingsPage = (bookingsData) => {
+    setAllBookings(bookingsData.results || bookingsData);
+    setPagination({
+      next: bookingsData.next ?? null,
+      previous: bookingsData.previous ?? null,
+    });
+  };
+
+  const loadBookingsPage = async (pageUrl) => {
+    try {
+      setBookingsLoading(true);
+      applyBookingsPage(await adminService.getAllBookings(pageUrl));
+    } catch (err) {
+      setError('Erreur lors du chargement des réservations');
+      console.error(err);
+    } finally {
+      setBookingsLoading(false);
+    }
+  };
+
   const loadWeekAvailability = async (regionsData) => {
     try {
       const availability = {};
@@ -106,7 +126,6 @@ const AdminDashboardPage = () => {
   };
 
   const renderOverviewTab = () => {
-    const totalBookings = allBookings.length;
     const totalUsers = allCoverage.length;
     const avgCoverage = totalUsers > 0
       ? (allCoverage.reduce((sum, c) => sum + c.coverage_rate, 0) / totalUsers).toFixed(1)
@@ -226,7 +245,7 @@ const AdminDashboardPage = () => {
           <>
             <div className="mb-4 flex items-center gap-3 bg-blue-50 border-l-4 border-blue-500 p-4 rounded">
               <svg className="w-5 h-5 text-blue-600" fill="none" stroke="currentColor" viewBox="0 0 24 24"><path strokeLinecap="round" strokeLinejoin="round" strokeWidth={2} d="M13 16h-1v-4h-1m1-4h.01M21 12a9 9 0 11-18 0 9 9 0 0118 0z" /></svg>
-              <p className="text-sm text-blue-800 font-medium">Total : <span className="font-bold">{pagination.count || allBookings.length}</span> réservations</p>
+              <p className="text-sm text-blue-800 font-medium">Total {currentYear} : <span className="font-bold">{totalBookings}</span> réservations</p>
             </div>
             <div className="overflow-x-auto">
               <table className="w-full">
@@ -259,6 +278,24 @@ const AdminDashboardPage = () => {
                 </tbody>
               </table>
             </div>
+            <div className="mt-4 flex items-center justify-between">
+              <button
+                type="button"
+                onClick={() => loadBookingsPage(pagination.previous)}
+                disabled={!pagination.previous || bookingsLoading}
+                className="px-4 py-2 rounded-lg border-2 border-gray-300 text-gray-700 font-medium hover:border-blue-500 hover:bg-blue-50 transition disabled:opacity-50 disabled:cursor-not-allowed"
+              >
+                ← Plus récentes
+              </button>
+              <button
+                type="button"
+                onClick={() => loadBookingsPage(pagination.next)}
+                disabled={!pagination.next || bookingsLoading}
+                className="px-4 py-2 rounded-lg border-2 border-gray-300 text-gray-700 font-medium hover:border-blue-500 hover:bg-blue-50 transition disabled:opacity-50 disabled:cursor-not-allowed"
+              >
+                Plus anciennes →
+              </button>
+            </div>
           </>
         )}
       </Card>
@@ -304,7 +341,7 @@ const AdminDashboardPage = () => {
             <TabButton active={activeTab === 'planning'} onClick={() => setActiveTab('planning')} icon={<svg className="w-5 h-5" fill="none" stroke="currentColor" viewBox="0 0 24 24"><path strokeLinecap="round" strokeLinejoin="round" strokeWidth={2} d="M8 7V3m8 4V3m-9 8h10M5 21h14a2 2 0 002-2V7a2 2 0 00-2-2H5a2 2 0 00-2 2v12a2 2 0 002 2z" /></svg>} label="Planning" />
             <TabButton active={activeTab === 'users'} onClick={() => setActiveTab('users')} icon={<svg className="w-5 h-5" fill="none" stroke="currentColor" viewBox="0 0 24 24"><path strokeLinecap="round" strokeLinejoin="round" strokeWidth={2} d="M12 4.354a4 4 0 110 5.292M15 21H3v-1a6 6 0 0112 0v1zm0 0h6v-1a6 6 0 00-9-5.197M13 7a4 4 0 11-8 0 4 4 0 018 0z" /></svg>} label="Utilisateurs" badge={users.length} />
             <TabButton active={activeTab === 'coverage'} onClick={() => setActiveTab('coverage')} icon={<svg className="w-5 h-5" fill="none" stroke="currentColor" viewBox="0 0 24 24"><path strokeLinecap="round" strokeLinejoin="round" strokeWidth={2} d="M13 7h8m0 0v8m0-8l-8 8-4-4-6 6" /></svg>} label="Couverture" />
-            <TabButton active={activeTab === 'bookings'} onClick={() => setActiveTab('bookings')} icon={<svg className="w-5 h-5" fill="none" stroke="currentColor" viewBox="0 0 24 24"><path strokeLinecap="round" strokeLinejoin="round" strokeWidth={2} d="M9 5H7a2 2 0 00-2 2v12a2 2 0 002 2h10a2 2 0 002-2V7a2 2 0 00-2-2h-2M9 5a2 2 0 002 2h2a2 2 0 002-2M9 5a2 2 0 012-2h2a2 2 0 012 2" /></svg>} label="Réservations" badge={allBookings.length} />
+            <TabButton active={activeTab === 'bookings'} onClick={() => setActiveTab('bookings')} icon={<svg className="w-5 h-5" fill="none" stroke="currentColor" viewBox="0 0 24 24"><path strokeLinecap="round" strokeLinejoin="round" strokeWidth={2} d="M9 5H7a2 2 0 00-2 2v12a2 2 0 002 2h10a2 2 0 002-2V7a2 2 0 00-2-2h-2M9 5a2 2 0 002 2h2a2 2 0 002-2M9 5a2 2 0 012-2h2a2 2 0 012 2" /></svg>} label="Réservations" badge={totalBookings} />
           </div>
         </div>
 
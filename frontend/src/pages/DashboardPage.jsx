@@ -8,7 +8,6 @@ import { useToast } from '../context/ToastContext';
 import bookingService from '../api/bookingService';
 import { getCurrentYear, getWeekText } from '../utils/dateUtils';
 import useAuth from '../hooks/useAuth';
-import adminService from '../api/adminService';
 import Footer from '../components/layout/Footer';
 
 const DashboardPage = () => {
@@ -73,14 +72,16 @@ const DashboardPage = () => {
       const availability = {};
       const userWeeks = new Set(); // NOUVEAU : Tracker les semaines réservées par l'utilisateur
 
-      // Pour l'admin : récupérer toutes les réservations
+      // Pour l'admin : tous les créneaux réservés de l'année en une requête
+      // (la liste des réservations est paginée par curseur)
       if (user?.is_admin) {
-        const allBookings = await adminService.getAllBookings(1, 1000);
-        const bookings = allBookings.results || allBookings;
+        const allSlots = await bookingService.getAllSlots(currentYear);
 
-        bookings.forEach(booking => {
-          const key = `${booking.region}-${booking.week}`;
-          availability[key] = booking.user_email;
+        allSlots.slots.forEach(slot => {
+          if (!slot.is_available) {
+            const key = `${slot.region_id}-${slot.week}`;
+            availability[key] = slot.booked_by;
+          }
         });
       } else {
         // Pour les directeurs : combiner mes réservations + disponibilité